@@ -85,7 +85,8 @@ class LoginAuditFilter(django_filters.FilterSet):
     success = django_filters.BooleanFilter()
     email_entered = django_filters.CharFilter(lookup_expr="iexact")
     ip_address = django_filters.CharFilter(lookup_expr="iexact")
+    country_code = django_filters.CharFilter(lookup_expr="iexact")
 
     class Meta:
         model = LoginAudit
-        fields = ["user", "success", "email_entered", "ip_address"]
+        fields = ["user", "success", "email_entered", "ip_address", "country_code"]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loginaudit',
+            name='city',
+            field=models.CharField(blank=True, max_length=120, null=True),
+        ),
+        migrations.AddField(
+            model_name='loginaudit',
+            name='country_code',
+            field=models.CharField(blank=True, max_length=2, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='loginaudit',
+            index=models.Index(fields=['country_code', 'created_at'], name='login_audit_country_09b5f7_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_loginaudit_city_loginaudit_country_code_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='entitlements_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
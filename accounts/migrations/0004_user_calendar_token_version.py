@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_entitlements_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_token_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
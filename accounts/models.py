@@ -7,6 +7,9 @@ from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
+from core.utils.coreModels import update_fields_without
+from core.utils.geoLookup import apply_geo
+
 
 # ----------------------------- base mixins -----------------------------
 
@@ -89,6 +92,11 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
     # You can keep an image URL (CDN) instead of ImageField to avoid storage pain early
     avatar_url = models.URLField(blank=True, null=True)
 
+    # bumped (UPDATE ... + 1, no signals) on enrollment / override / refund changes, keys the cached entitlement map
+    entitlements_version = models.PositiveBigIntegerField(default=0, editable=False)
+    # signed into the calendar feed URL; +1 (UPDATE) when the learner regenerates it, old URLs stop working
+    calendar_token_version = models.PositiveIntegerField(default=0, editable=False)
+
     objects = UserManager()
 
     USERNAME_FIELD = "email"
@@ -104,6 +112,14 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
     def full_name(self):
         return (f"{self.first_name} {self.last_name}").strip() or self.email
 
+    def save(self, *args, **kwargs):
+        # the version counters are only written by their own UPDATEs (bump_entitlements, rotate_calendar_token)
+        if not kwargs.get("force_insert"):
+            kwargs["update_fields"] = update_fields_without(
+                self, {"entitlements_version", "calendar_token_version"}, kwargs.get("update_fields")
+            )
+        super().save(*args, **kwargs)
+
     def mark_seen(self):
         self.last_seen_at = timezone.now()
         self.save(update_fields=["last_seen_at"])
@@ -320,6 +336,10 @@ class LoginAudit(TimeStampedModel):
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
 
+    # filled from ip_address on save (offline lookup)
+    country_code = models.CharField(max_length=2, blank=True, null=True)
+    city = models.CharField(max_length=120, blank=True, null=True)
+
     success = models.BooleanField(default=False, db_index=True)
     failure_reason = models.CharField(max_length=255, blank=True, null=True)
 
@@ -328,7 +348,12 @@ class LoginAudit(TimeStampedModel):
         indexes = [
             models.Index(fields=["created_at", "success"]),
             models.Index(fields=["ip_address", "created_at"]),
+            models.Index(fields=["country_code", "created_at"]),
         ]
 
     def __str__(self):
         return f"LoginAudit({self.email_entered}, success={self.success})"
+
+    def save(self, *args, **kwargs):
+        apply_geo(self)
+        super().save(*args, **kwargs)
@@ -5,6 +5,9 @@ from analytics.models import (
     AnalyticsSession,
     AnalyticsEvent,
     DailyMetric,
+    DailyPageView,
+    MetricRollup,
+    OrderAttribution,
     RetentionCohort,
 )
 
@@ -27,6 +30,7 @@ class AnalyticsSessionFilter(django_filters.FilterSet):
     status = django_filters.CharFilter(lookup_expr="iexact")
     branch = django_filters.UUIDFilter(field_name="branch_id")
     device_type = django_filters.CharFilter(lookup_expr="iexact")
+    country_code = django_filters.CharFilter(lookup_expr="iexact")
     utm_source = django_filters.CharFilter(lookup_expr="iexact")
     utm_medium = django_filters.CharFilter(lookup_expr="iexact")
     utm_campaign = django_filters.CharFilter(lookup_expr="iexact")
@@ -39,6 +43,7 @@ class AnalyticsSessionFilter(django_filters.FilterSet):
             "status",
             "branch",
             "device_type",
+            "country_code",
             "utm_source",
             "utm_medium",
             "utm_campaign",
@@ -51,13 +56,14 @@ class AnalyticsEventFilter(django_filters.FilterSet):
     user = django_filters.UUIDFilter(field_name="user_id")
     course = django_filters.UUIDFilter(field_name="course_id")
     lesson = django_filters.UUIDFilter(field_name="lesson_id")
+    path_template = django_filters.CharFilter(lookup_expr="iexact")
     enrollment = django_filters.UUIDFilter(field_name="enrollment_id")
     order = django_filters.UUIDFilter(field_name="order_id")
     branch = django_filters.UUIDFilter(field_name="branch_id")
 
     class Meta:
         model = AnalyticsEvent
-        fields = ["session", "event_type", "user", "course", "lesson", "enrollment", "order", "branch"]
+        fields = ["session", "event_type", "user", "course", "lesson", "path_template", "enrollment", "order", "branch"]
 
 
 class DailyMetricFilter(django_filters.FilterSet):
@@ -72,6 +78,44 @@ class DailyMetricFilter(django_filters.FilterSet):
         fields = ["date", "metric", "course", "campaign", "branch"]
 
 
+class DailyPageViewFilter(django_filters.FilterSet):
+    date = django_filters.DateFilter()
+    date_from = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+    path_template = django_filters.CharFilter(lookup_expr="iexact")
+    branch = django_filters.UUIDFilter(field_name="branch_id")
+
+    class Meta:
+        model = DailyPageView
+        fields = ["date", "date_from", "date_to", "path_template", "branch"]
+
+
+class MetricRollupFilter(django_filters.FilterSet):
+    granularity = django_filters.CharFilter(lookup_expr="iexact")
+    period_start = django_filters.DateFilter()
+    metric = django_filters.CharFilter(lookup_expr="iexact")
+    course = django_filters.UUIDFilter(field_name="course_id")
+    campaign = django_filters.UUIDFilter(field_name="campaign_id")
+    branch = django_filters.UUIDFilter(field_name="branch_id")
+
+    class Meta:
+        model = MetricRollup
+        fields = ["granularity", "period_start", "metric", "course", "campaign", "branch"]
+
+
+class OrderAttributionFilter(django_filters.FilterSet):
+    order = django_filters.UUIDFilter(field_name="order_id")
+    campaign = django_filters.UUIDFilter(field_name="campaign_id")
+    model = django_filters.CharFilter(lookup_expr="iexact")
+    branch = django_filters.UUIDFilter(field_name="branch_id")
+    converted_from = django_filters.DateTimeFilter(field_name="converted_at", lookup_expr="gte")
+    converted_to = django_filters.DateTimeFilter(field_name="converted_at", lookup_expr="lte")
+
+    class Meta:
+        model = OrderAttribution
+        fields = ["order", "campaign", "model", "branch", "converted_from", "converted_to"]
+
+
 class RetentionCohortFilter(django_filters.FilterSet):
     branch = django_filters.UUIDFilter(field_name="branch_id")
     cohort_type = django_filters.CharFilter(lookup_expr="iexact")
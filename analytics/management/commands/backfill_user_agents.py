@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from analytics.models import AnalyticsEvent, AnalyticsSession, DeviceType
+from analytics.services.useragents import backfill_sessions, parse_user_agent
+
+
+class Command(BaseCommand):
+    help = "Fill device_type / device_os / browser of analytics sessions from their user agent (bulk)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--force", action="store_true", help="Re-classify sessions that already have device fields.")
+        parser.add_argument("--purge-bot-events", action="store_true", help="Delete events recorded by bot sessions.")
+
+    def handle(self, *args, **options):
+        updated = backfill_sessions(
+            AnalyticsSession.objects.all(),
+            batch_size=options["batch_size"],
+            force=options["force"],
+        )
+        info = parse_user_agent.cache_info()
+        self.stdout.write(self.style.SUCCESS(
+            f"Classified {updated} sessions ({info.currsize} distinct user agents, {info.hits} cache hits)"
+        ))
+
+        if options["purge_bot_events"]:
+            deleted, _ = AnalyticsEvent.objects.filter(session__device_type=DeviceType.BOT).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} bot events"))
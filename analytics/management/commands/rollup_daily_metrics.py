@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.services.rollup import rollup_day
+
+
+class Command(BaseCommand):
+    help = "Roll AnalyticsEvent rows up into DailyMetric (and unique-user sketches). Defaults to yesterday."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Day to roll up (YYYY-MM-DD). Defaults to yesterday.")
+        parser.add_argument("--days", type=int, default=1, help="Number of days ending at --date to (re)build.")
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                last = datetime.date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+        else:
+            last = timezone.localdate() - datetime.timedelta(days=1)
+
+        for offset in reversed(range(max(options["days"], 1))):
+            day = last - datetime.timedelta(days=offset)
+            rows = rollup_day(day)
+            self.stdout.write(self.style.SUCCESS(f"{day}: {rows} metric rows"))
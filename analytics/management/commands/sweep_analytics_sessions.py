@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.services.heartbeats import IDLE_TIMEOUT_MINUTES, close_idle_sessions
+
+
+class Command(BaseCommand):
+    help = "End analytics sessions that have been idle longer than the timeout (one set-based UPDATE)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--idle-minutes", type=int, default=IDLE_TIMEOUT_MINUTES)
+
+    def handle(self, *args, **options):
+        closed = close_idle_sessions(idle_minutes=options["idle_minutes"])
+        self.stdout.write(self.style.SUCCESS(f"Closed {closed} idle sessions"))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.11 on 2026-10-19 04:55
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('courses', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUniqueSketch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('metric', models.CharField(choices=[('active_users', 'Active Users'), ('new_users', 'New Users'), ('sessions', 'Sessions'), ('page_views', 'Page Views'), ('course_views', 'Course Views'), ('checkouts', 'Checkouts Started'), ('orders_paid', 'Orders Paid'), ('revenue', 'Revenue'), ('lesson_starts', 'Lesson Starts'), ('lesson_completions', 'Lesson Completions'), ('watch_time_seconds', 'Watch Time (Seconds)')], db_index=True, default='active_users', max_length=40)),
+                ('registers', models.BinaryField()),
+                ('estimate', models.PositiveIntegerField(default=0)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_unique_sketches', to='courses.course')),
+            ],
+            options={
+                'db_table': 'daily_unique_sketches',
+                'indexes': [models.Index(fields=['metric', 'date'], name='daily_uniqu_metric_da3eff_idx'), models.Index(fields=['branch', 'date'], name='daily_uniqu_branch__a4ac52_idx')],
+                'constraints': [models.UniqueConstraint(fields=('branch', 'date', 'metric', 'course'), name='uniq_daily_sketch_branch_date_metric_course')],
+            },
+        ),
+    ]
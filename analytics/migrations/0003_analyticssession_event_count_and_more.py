@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_dailyuniquesketch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticssession',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='analyticssession',
+            name='page_view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:11
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_analyticssession_event_count_and_more'),
+        ('courses', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], db_index=True, max_length=10)),
+                ('period_start', models.DateField(db_index=True)),
+                ('metric', models.CharField(choices=[('active_users', 'Active Users'), ('new_users', 'New Users'), ('sessions', 'Sessions'), ('page_views', 'Page Views'), ('course_views', 'Course Views'), ('checkouts', 'Checkouts Started'), ('orders_paid', 'Orders Paid'), ('revenue', 'Revenue'), ('lesson_starts', 'Lesson Starts'), ('lesson_completions', 'Lesson Completions'), ('watch_time_seconds', 'Watch Time (Seconds)')], db_index=True, max_length=40)),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('meta', models.JSONField(blank=True, default=dict)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch')),
+                ('campaign', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='metric_rollups', to='analytics.acquisitioncampaign')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='metric_rollups', to='courses.course')),
+            ],
+            options={
+                'db_table': 'metric_rollups',
+                'indexes': [models.Index(fields=['metric', 'granularity', 'period_start'], name='metric_roll_metric_836658_idx'), models.Index(fields=['branch', 'granularity', 'period_start'], name='metric_roll_branch__1223cf_idx'), models.Index(fields=['updated'], name='metric_roll_updated_60cd9c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('branch', 'granularity', 'period_start', 'metric', 'course', 'campaign'), name='uniq_metric_rollup_dims')],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:14
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_metricrollup'),
+        ('billing', '0001_initial'),
+        ('content', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('courses', '0001_initial'),
+        ('enrollments', '0001_initial'),
+        ('settings', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPageView',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(db_index=True)),
+                ('path_template', models.CharField(db_index=True, max_length=255)),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'daily_page_views',
+            },
+        ),
+        migrations.AddField(
+            model_name='analyticsevent',
+            name='path_template',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='analyticsevent',
+            index=models.Index(fields=['path_template', 'occurred_at'], name='analytics_e_path_te_32bc67_idx'),
+        ),
+        migrations.AddField(
+            model_name='dailypageview',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch'),
+        ),
+        migrations.AddIndex(
+            model_name='dailypageview',
+            index=models.Index(fields=['date', 'path_template'], name='daily_page__date_2ea7db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailypageview',
+            index=models.Index(fields=['branch', 'date'], name='daily_page__branch__6c2c0b_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailypageview',
+            constraint=models.UniqueConstraint(fields=('branch', 'date', 'path_template'), name='uniq_daily_page_view_branch_date_path'),
+        ),
+    ]
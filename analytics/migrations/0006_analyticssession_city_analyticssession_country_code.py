@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_path_template_and_dailypageview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticssession',
+            name='city',
+            field=models.CharField(blank=True, max_length=120, null=True),
+        ),
+        migrations.AddField(
+            model_name='analyticssession',
+            name='country_code',
+            field=models.CharField(blank=True, db_index=True, max_length=2, null=True),
+        ),
+    ]
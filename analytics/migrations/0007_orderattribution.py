@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:22
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_analyticssession_city_analyticssession_country_code'),
+        ('billing', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderAttribution',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('model', models.CharField(choices=[('first_touch', 'First Touch'), ('last_touch', 'Last Touch'), ('linear', 'Linear')], db_index=True, max_length=20)),
+                ('credit', models.DecimalField(decimal_places=6, default=1, max_digits=7)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('converted_at', models.DateTimeField(db_index=True)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch')),
+                ('campaign', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attributions', to='analytics.acquisitioncampaign')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributions', to='billing.order')),
+            ],
+            options={
+                'db_table': 'order_attributions',
+                'indexes': [models.Index(fields=['campaign', 'converted_at'], name='order_attri_campaig_73b4cc_idx'), models.Index(fields=['model', 'converted_at'], name='order_attri_model_05df63_idx')],
+                'constraints': [models.UniqueConstraint(fields=('order', 'campaign', 'model'), name='uniq_order_attribution_order_campaign_model')],
+            },
+        ),
+    ]
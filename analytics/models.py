@@ -10,6 +10,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
 from core.utils.coreModels import UUIDPk, StampedOwnedActive
+from core.utils.geoLookup import apply_geo
+from analytics.services.paths import normalize_path
 
 
 # ----------------------------- lean bases (NO history) -----------------------------
@@ -111,6 +113,18 @@ class MetricName(models.TextChoices):
     WATCH_TIME_SECONDS = "watch_time_seconds", "Watch Time (Seconds)"
 
 
+class AttributionModel(models.TextChoices):
+    FIRST_TOUCH = "first_touch", "First Touch"
+    LAST_TOUCH = "last_touch", "Last Touch"
+    LINEAR = "linear", "Linear"
+
+
+class Granularity(models.TextChoices):
+    DAY = "day", "Day"
+    WEEK = "week", "Week"
+    MONTH = "month", "Month"
+
+
 # ----------------------------- acquisition / campaigns -----------------------------
 
 class AcquisitionCampaign(StampedOwnedActive):
@@ -165,9 +179,17 @@ class AnalyticsSession(AnalyticsStamped, BranchBound):
     last_seen_at = models.DateTimeField(default=timezone.now, db_index=True)
     ended_at = models.DateTimeField(blank=True, null=True)
 
+    # bumped in batches by analytics.services.heartbeats (never per event)
+    event_count = models.PositiveIntegerField(default=0)
+    page_view_count = models.PositiveIntegerField(default=0)
+
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
 
+    # filled from ip_address on save (offline lookup, core.utils.geoLookup)
+    country_code = models.CharField(max_length=2, blank=True, null=True, db_index=True)
+    city = models.CharField(max_length=120, blank=True, null=True)
+
     device_type = models.CharField(max_length=10, choices=DeviceType.choices, default=DeviceType.OTHER, db_index=True)
     device_os = models.CharField(max_length=60, blank=True, null=True)
     browser = models.CharField(max_length=60, blank=True, null=True)
@@ -203,6 +225,13 @@ class AnalyticsSession(AnalyticsStamped, BranchBound):
     def __str__(self):
         return f"Session({self.session_key})"
 
+    def save(self, *args, **kwargs):
+        from analytics.services.useragents import apply_user_agent  # services import this module
+
+        apply_user_agent(self)
+        apply_geo(self)
+        super().save(*args, **kwargs)
+
 
 # ----------------------------- events -----------------------------
 
@@ -238,6 +267,7 @@ class AnalyticsEvent(AnalyticsStamped, BranchBound):
 
     # Common navigation fields (good for page views)
     path = models.CharField(max_length=255, blank=True, null=True, db_index=True)
+    path_template = models.CharField(max_length=255, blank=True, null=True)  # normalized route, see services.paths
     page_title = models.CharField(max_length=200, blank=True, null=True)
     referrer = models.URLField(blank=True, null=True)
 
@@ -296,6 +326,7 @@ class AnalyticsEvent(AnalyticsStamped, BranchBound):
             models.Index(fields=["course", "occurred_at"]),
             models.Index(fields=["lesson", "occurred_at"]),
             models.Index(fields=["path", "occurred_at"]),
+            models.Index(fields=["path_template", "occurred_at"]),
         ]
 
     def __str__(self):
@@ -310,9 +341,57 @@ class AnalyticsEvent(AnalyticsStamped, BranchBound):
                 self.branch_id = self.lesson.branch_id
             elif self.session_id and getattr(self.session, "branch_id", None):
                 self.branch_id = self.session.branch_id
+        if self.path and not self.path_template:
+            self.path_template = normalize_path(self.path)
         super().save(*args, **kwargs)
 
 
+# ----------------------------- attribution -----------------------------
+
+class OrderAttribution(AnalyticsStamped, BranchBound):
+    """
+    Share of a paid order credited to a campaign, one row per (order, campaign, model).
+    campaign NULL = no campaign touch in the lookback window (direct).
+    Written by analytics.services.attribution, an order with rows is never re-processed.
+    """
+
+    order = models.ForeignKey(
+        "billing.Order",
+        on_delete=models.CASCADE,
+        related_name="attributions",
+        db_index=True,
+    )
+    campaign = models.ForeignKey(
+        AcquisitionCampaign,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="attributions",
+        db_index=True,
+    )
+    model = models.CharField(max_length=20, choices=AttributionModel.choices, db_index=True)
+
+    credit = models.DecimalField(max_digits=7, decimal_places=6, default=1)  # 0..1
+    revenue = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    converted_at = models.DateTimeField(db_index=True)  # order.paid_at
+
+    class Meta:
+        db_table = "order_attributions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["order", "campaign", "model"],
+                name="uniq_order_attribution_order_campaign_model",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["campaign", "converted_at"]),
+            models.Index(fields=["model", "converted_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id} -> {self.campaign_id} ({self.model}: {self.credit})"
+
+
 # ----------------------------- daily aggregates (fast dashboards) -----------------------------
 
 class DailyMetric(AnalyticsStamped, BranchBound):
@@ -364,6 +443,121 @@ class DailyMetric(AnalyticsStamped, BranchBound):
         return f"{self.date} {self.metric}={self.value}"
 
 
+class MetricRollup(AnalyticsStamped, BranchBound):
+    """
+    Materialized weekly / monthly buckets of DailyMetric (same dimensions).
+    Refreshed per touched bucket whenever daily rows change (analytics.services.timeseries).
+    """
+
+    granularity = models.CharField(max_length=10, choices=Granularity.choices, db_index=True)
+    period_start = models.DateField(db_index=True)
+    metric = models.CharField(max_length=40, choices=MetricName.choices, db_index=True)
+
+    value = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="metric_rollups",
+        db_index=True,
+    )
+    campaign = models.ForeignKey(
+        AcquisitionCampaign,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="metric_rollups",
+        db_index=True,
+    )
+
+    meta = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        db_table = "metric_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["branch", "granularity", "period_start", "metric", "course", "campaign"],
+                name="uniq_metric_rollup_dims",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["metric", "granularity", "period_start"]),
+            models.Index(fields=["branch", "granularity", "period_start"]),
+            models.Index(fields=["updated"]),  # rollup watermark
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.period_start} {self.metric}={self.value}"
+
+
+class DailyPageView(AnalyticsStamped, BranchBound):
+    """
+    Page views per normalized route per day (filled by the daily rollup).
+    "Top pages" reads this instead of grouping raw events.
+    """
+
+    date = models.DateField(db_index=True)
+    path_template = models.CharField(max_length=255, db_index=True)
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "daily_page_views"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["branch", "date", "path_template"],
+                name="uniq_daily_page_view_branch_date_path",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["date", "path_template"]),
+            models.Index(fields=["branch", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.path_template}={self.views}"
+
+
+class DailyUniqueSketch(AnalyticsStamped, BranchBound):
+    """
+    HyperLogLog sketch of distinct users per (branch, course, day).
+    Distinct counts cannot be summed across days; sketches can be merged instead.
+    course NULL = all courses of the branch. Filled by the daily rollup.
+    """
+
+    date = models.DateField(db_index=True)
+    metric = models.CharField(max_length=40, choices=MetricName.choices, default=MetricName.ACTIVE_USERS, db_index=True)
+
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="daily_unique_sketches",
+        db_index=True,
+    )
+
+    registers = models.BinaryField()  # zlib-compressed HLL registers (see analytics.services.hyperloglog)
+    estimate = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "daily_unique_sketches"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["branch", "date", "metric", "course"],
+                name="uniq_daily_sketch_branch_date_metric_course",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["metric", "date"]),
+            models.Index(fields=["branch", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.metric}~{self.estimate}"
+
+
 # ----------------------------- cohorts / retention snapshots -----------------------------
 
 class CohortType(models.TextChoices):
@@ -1,11 +1,21 @@
+from rest_framework import serializers
+
 from core.utils.AdaptedBulkSerializer import BulkModelSerializer
 from analytics.models import (
     AcquisitionCampaign,
     AnalyticsSession,
     AnalyticsEvent,
     DailyMetric,
+    DailyPageView,
+    MetricRollup,
+    OrderAttribution,
     RetentionCohort,
+    EventType,
+    Granularity,
+    MetricName,
 )
+from analytics.services.funnels import FUNNEL_DIMENSIONS
+from analytics.services.realtime import WINDOW_SECONDS
 
 
 class AcquisitionCampaignSerializer(BulkModelSerializer):
@@ -32,7 +42,99 @@ class DailyMetricSerializer(BulkModelSerializer):
         fields = "__all__"
 
 
+class DailyPageViewSerializer(BulkModelSerializer):
+    class Meta(BulkModelSerializer.Meta):
+        model = DailyPageView
+        fields = "__all__"
+
+
+class MetricRollupSerializer(BulkModelSerializer):
+    class Meta(BulkModelSerializer.Meta):
+        model = MetricRollup
+        fields = "__all__"
+
+
+class OrderAttributionSerializer(BulkModelSerializer):
+    class Meta(BulkModelSerializer.Meta):
+        model = OrderAttribution
+        fields = "__all__"
+
+
 class RetentionCohortSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
         model = RetentionCohort
         fields = "__all__"
+
+
+# ----------------------------- query params (non-model) -----------------------------
+
+class FunnelQuerySerializer(serializers.Serializer):
+    steps = serializers.CharField(help_text="Comma separated EventType values in funnel order.")
+    date_from = serializers.DateTimeField()
+    date_to = serializers.DateTimeField()
+    group_by = serializers.ChoiceField(choices=sorted(FUNNEL_DIMENSIONS), required=False)
+    course = serializers.UUIDField(required=False)
+    campaign = serializers.UUIDField(required=False)
+    branch = serializers.UUIDField(required=False)
+
+    def validate_steps(self, value):
+        steps = [s.strip() for s in value.split(",") if s.strip()]
+        invalid = [s for s in steps if s not in EventType.values]
+        if invalid:
+            raise serializers.ValidationError(f"Unknown event types: {', '.join(invalid)}")
+        if len(steps) < 2:
+            raise serializers.ValidationError("A funnel needs at least two steps.")
+        if len(set(steps)) != len(steps):
+            raise serializers.ValidationError("Funnel steps must be unique.")
+        return steps
+
+    def validate(self, attrs):
+        if attrs["date_from"] >= attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must be after date_from."})
+        return attrs
+
+
+class UniqueCountQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    granularity = serializers.ChoiceField(choices=Granularity.choices, default=Granularity.DAY)
+    course = serializers.UUIDField(required=False)
+    branch = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
+
+
+class ActiveNowQuerySerializer(serializers.Serializer):
+    window = serializers.IntegerField(min_value=10, max_value=WINDOW_SECONDS, default=WINDOW_SECONDS, help_text="Seconds.")
+    course = serializers.UUIDField(required=False)
+    branch = serializers.UUIDField(required=False)
+
+
+class TimeSeriesQuerySerializer(serializers.Serializer):
+    metric = serializers.ChoiceField(choices=MetricName.choices)
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    granularity = serializers.ChoiceField(choices=Granularity.choices, default=Granularity.DAY)
+    course = serializers.UUIDField(required=False)
+    campaign = serializers.UUIDField(required=False)
+    branch = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
+
+
+class TopPagesQuerySerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=20)
+    branch = serializers.UUIDField(required=False)
+
+    def validate(self, attrs):
+        if attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
@@ -0,0 +1,192 @@
+# analytics/services/attribution.py
+import datetime
+import logging
+from collections import defaultdict, deque
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from analytics.models import (
+    AcquisitionCampaign,
+    AnalyticsSession,
+    AttributionModel,
+    MetricName,
+    OrderAttribution,
+)
+from analytics.services.periods import day_bounds
+from analytics.services.rollup import upsert_daily_metric
+from analytics.services.timeseries import deferred_rollups
+from billing.models import Order, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+
+LOOKBACK_DAYS = getattr(settings, "ANALYTICS_ATTRIBUTION_LOOKBACK_DAYS", 30)
+# the model whose numbers go into DailyMetric.value (all three land in meta)
+DEFAULT_MODEL = getattr(settings, "ANALYTICS_ATTRIBUTION_MODEL", AttributionModel.LAST_TOUCH)
+BATCH_SIZE = getattr(settings, "ANALYTICS_ATTRIBUTION_BATCH_SIZE", 500)
+
+CREDIT_PLACES = Decimal("0.000001")
+CENTS = Decimal("0.01")
+
+
+def _campaign_lookup():
+    """
+    utm_campaign (lowercased) -> campaign id, for sessions that only carry UTM params.
+    """
+    rows = AcquisitionCampaign.objects.exclude(campaign__isnull=True).exclude(campaign="").values_list("campaign", "id")
+    return {name.lower(): pk for name, pk in rows}
+
+
+def _touches(user_ids, since, until, utm_map):
+    """
+    {user_id: [(started_at, campaign_id), ...]} time ordered, one query for the whole batch.
+    """
+    rows = (
+        AnalyticsSession.objects.filter(user_id__in=user_ids, started_at__gte=since, started_at__lte=until)
+        .exclude(campaign_obj__isnull=True, utm_campaign__isnull=True)
+        .order_by("user_id", "started_at")
+        .values_list("user_id", "started_at", "campaign_obj_id", "utm_campaign")
+    )
+    touches = defaultdict(list)
+    for user_id, started_at, campaign_id, utm_campaign in rows.iterator(chunk_size=5000):
+        campaign_id = campaign_id or utm_map.get((utm_campaign or "").lower())
+        if campaign_id:
+            touches[user_id].append((started_at, campaign_id))
+    return touches
+
+
+def _credits(window):
+    """
+    window: campaign ids of the touches in the lookback window, oldest first.
+    -> {model: {campaign_id: credit}}
+    """
+    if not window:
+        return {model: {None: Decimal(1)} for model in AttributionModel.values}
+
+    linear = defaultdict(Decimal)
+    share = Decimal(1) / len(window)
+    for campaign_id in window:
+        linear[campaign_id] += share
+
+    return {
+        AttributionModel.FIRST_TOUCH: {window[0]: Decimal(1)},
+        AttributionModel.LAST_TOUCH: {window[-1]: Decimal(1)},
+        AttributionModel.LINEAR: dict(linear),
+    }
+
+
+def attribute_orders(orders, touches, lookback):
+    """
+    Sorted merge per user: orders and touches are both time ordered, so one pass with a
+    sliding deque gives every order the touches in [paid_at - lookback, paid_at].
+    """
+    rows = []
+    for user_id, user_orders in orders.items():
+        user_touches = touches.get(user_id, [])
+        window = deque()
+        i = 0
+        for order in user_orders:  # ascending paid_at
+            while i < len(user_touches) and user_touches[i][0] <= order.paid_at:
+                window.append(user_touches[i])
+                i += 1
+            while window and window[0][0] < order.paid_at - lookback:
+                window.popleft()
+
+            total = order.total or Decimal(0)
+            for model, credits in _credits([campaign_id for _, campaign_id in window]).items():
+                for campaign_id, credit in credits.items():
+                    rows.append(OrderAttribution(
+                        branch_id=order.branch_id,
+                        order_id=order.pk,
+                        campaign_id=campaign_id,
+                        model=model,
+                        credit=credit.quantize(CREDIT_PLACES),
+                        revenue=(total * credit).quantize(CENTS),
+                        converted_at=order.paid_at,
+                    ))
+    return rows
+
+
+def pending_orders(since=None):
+    """
+    Paid orders that were never attributed (anti-join on the attribution rows).
+    """
+    qs = Order.objects.filter(status=OrderStatus.PAID, paid_at__isnull=False, attributions__isnull=True)
+    if since:
+        qs = qs.filter(paid_at__gte=since)
+    return qs.order_by("user_id", "paid_at").only("pk", "user_id", "branch_id", "total", "paid_at")
+
+
+def write_campaign_metrics(days):
+    """
+    Rebuilds REVENUE / ORDERS_PAID DailyMetric rows per (day, branch, campaign) from the attribution rows.
+    value = DEFAULT_MODEL, meta = every model.
+    """
+    written = 0
+    with deferred_rollups():
+        for day in sorted(days):
+            start, end = day_bounds(day)
+            rows = (
+                OrderAttribution.objects.filter(converted_at__gte=start, converted_at__lt=end, campaign__isnull=False)
+                .order_by()
+                .values("branch_id", "campaign_id", "model")
+                .annotate(revenue=Sum("revenue"), orders=Sum("credit"), touched=Count("order_id"))
+            )
+            per_campaign = defaultdict(dict)
+            for row in rows:
+                per_campaign[(row["branch_id"], row["campaign_id"])][row["model"]] = row
+
+            for (branch_id, campaign_id), models in per_campaign.items():
+                meta = {
+                    model: {
+                        "revenue": str(Decimal(r["revenue"]).quantize(CENTS)),
+                        "orders": str(Decimal(r["orders"]).quantize(CREDIT_PLACES)),
+                        "touched_orders": r["touched"],
+                    }
+                    for model, r in models.items()
+                }
+                default = models.get(DEFAULT_MODEL) or {"revenue": 0, "orders": 0}
+                upsert_daily_metric(day, MetricName.REVENUE, branch_id, None, default["revenue"], campaign_id, {"models": meta})
+                upsert_daily_metric(day, MetricName.ORDERS_PAID, branch_id, None, default["orders"], campaign_id, {"models": meta})
+                written += 2
+    return written
+
+
+def run_attribution(lookback_days=LOOKBACK_DAYS, batch_size=BATCH_SIZE, since=None):
+    """
+    Attributes every not yet attributed paid order, batch by batch of users.
+    Returns (orders, attribution rows, metric rows).
+    """
+    lookback = datetime.timedelta(days=lookback_days)
+    utm_map = _campaign_lookup()
+
+    batch = defaultdict(list)
+    totals = [0, 0, 0]
+    days = set()
+
+    def flush():
+        if not batch:
+            return
+        paid = [o.paid_at for orders in batch.values() for o in orders]
+        touches = _touches(list(batch), min(paid) - lookback, max(paid), utm_map)
+        rows = attribute_orders(batch, touches, lookback)
+        with transaction.atomic():
+            OrderAttribution.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        totals[0] += sum(len(orders) for orders in batch.values())
+        totals[1] += len(rows)
+        days.update(timezone.localdate(at) for at in paid)
+        batch.clear()
+
+    for order in pending_orders(since).iterator(chunk_size=2000):
+        if order.user_id not in batch and len(batch) >= batch_size:
+            flush()
+        batch[order.user_id].append(order)
+    flush()
+
+    totals[2] = write_campaign_metrics(days)
+    logger.info("attribution: %s orders, %s rows, %s metric rows", *totals)
+    return tuple(totals)
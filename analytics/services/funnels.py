@@ -0,0 +1,135 @@
+# analytics/services/funnels.py
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.lookups import IsNull
+
+
+FUNNEL_CACHE_TIMEOUT = getattr(settings, "ANALYTICS_FUNNEL_CACHE_TIMEOUT", 300)
+
+# group_by value -> lookup on AnalyticsEvent
+FUNNEL_DIMENSIONS = {
+    "course": "course_id",
+    "campaign": "session__campaign_obj_id",
+    "utm_campaign": "session__utm_campaign",
+    "branch": "branch_id",
+}
+
+
+def funnel_cache_key(scope, params):
+    raw = json.dumps({"scope": scope, **params}, sort_keys=True, default=str)
+    return "analytics:funnel:" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _same_actor(dimension=None):
+    """
+    Subquery filter: events of the outer row's actor (user, or session for anonymous
+    traffic) and, when grouping, of its dimension value. Users match on the user index.
+    """
+    q = Q(user_id=OuterRef("user_id")) | (
+        Q(user_id__isnull=True, session_id=OuterRef("session_id")) & Q(IsNull(OuterRef("user_id"), True))
+    )
+    if dimension:
+        q &= Q(**{dimension: OuterRef(dimension)}) | (
+            Q(**{f"{dimension}__isnull": True}) & Q(IsNull(OuterRef(dimension), True))
+        )
+    return q
+
+
+def compute_funnel(queryset, steps, date_from, date_to, group_by=None):
+    """
+    Ordered funnel over AnalyticsEvent in ONE query, matched entirely in SQL.
+
+    Outer rows are each actor's first step-0 event (user, or session for anonymous
+    traffic, per dimension value). Step k is the earliest step-k event at/after the time
+    step k-1 was matched: one correlated subquery per step, each bounded by the previous
+    one and served by the (event_type, occurred_at) / (user, occurred_at) indexes.
+    The database returns the per-group step counts only.
+    """
+    events = queryset.filter(occurred_at__gte=date_from, occurred_at__lt=date_to)
+    dimension = FUNNEL_DIMENSIONS.get(group_by) if group_by else None
+    same_actor = _same_actor(dimension)
+
+    earlier = events.filter(same_actor, event_type=steps[0]).filter(
+        Q(occurred_at__lt=OuterRef("occurred_at")) | Q(occurred_at=OuterRef("occurred_at"), pk__lt=OuterRef("pk"))
+    )
+    rows = (
+        events.filter(event_type=steps[0])
+        .exclude(user_id__isnull=True, session_id__isnull=True)
+        .exclude(Exists(earlier))
+        .annotate(reached_0=F("occurred_at"))
+    )
+    for i in range(1, len(steps)):
+        first = events.filter(same_actor, event_type=steps[i], occurred_at__gte=OuterRef(f"reached_{i - 1}"))
+        rows = rows.annotate(**{f"reached_{i}": Subquery(first.order_by("occurred_at").values("occurred_at")[:1])})
+
+    counts = {f"step_{i}": Count("pk", filter=Q(**{f"reached_{i}__isnull": False})) for i in range(len(steps))}
+    rows = rows.order_by().values(dimension).annotate(**counts) if dimension else [rows.aggregate(**counts)]
+
+    groups = [
+        {
+            "key": str(row[dimension]) if dimension and row[dimension] is not None else None,
+            "steps": _step_stats(steps, [row[f"step_{i}"] for i in range(len(steps))]),
+        }
+        for row in rows
+        if row["step_0"]
+    ]
+    groups.sort(key=lambda g: g["steps"][0]["actors"], reverse=True)
+
+    if not groups and not dimension:
+        groups = [{"key": None, "steps": _step_stats(steps, [0] * len(steps))}]
+
+    return {
+        "steps": list(steps),
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "groups": groups,
+    }
+
+
+def _step_stats(steps, bucket):
+    entered = bucket[0]
+    stats = []
+    for i, step in enumerate(steps):
+        previous = bucket[i - 1] if i else entered
+        stats.append({
+            "event_type": step,
+            "actors": bucket[i],
+            "conversion_rate": round(bucket[i] / entered, 4) if entered else 0,
+            "step_conversion_rate": round(bucket[i] / previous, 4) if previous else 0,
+        })
+    return stats
+
+
+def get_funnel(queryset, scope, steps, date_from, date_to, group_by=None, **filters):
+    """
+    Cached wrapper around compute_funnel().
+    scope: branch visibility token of the caller (part of the cache key).
+    filters: optional course / campaign / branch ids applied before grouping.
+    """
+    params = {
+        "steps": list(steps),
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        **{k: v for k, v in filters.items() if v},
+    }
+    key = funnel_cache_key(scope, params)
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    if filters.get("course"):
+        queryset = queryset.filter(course_id=filters["course"])
+    if filters.get("campaign"):
+        queryset = queryset.filter(session__campaign_obj_id=filters["campaign"])
+    if filters.get("branch"):
+        queryset = queryset.filter(branch_id=filters["branch"])
+
+    result = compute_funnel(queryset, steps, date_from, date_to, group_by=group_by)
+    cache.set(key, result, FUNNEL_CACHE_TIMEOUT)
+    return result
@@ -0,0 +1,125 @@
+# analytics/services/heartbeats.py
+import atexit
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from analytics.models import AnalyticsSession, SessionStatus
+
+logger = logging.getLogger(__name__)
+
+
+FLUSH_SECONDS = getattr(settings, "ANALYTICS_HEARTBEAT_FLUSH_SECONDS", 15)
+MAX_PENDING = getattr(settings, "ANALYTICS_HEARTBEAT_MAX_PENDING", 500)
+IDLE_TIMEOUT_MINUTES = getattr(settings, "ANALYTICS_SESSION_IDLE_MINUTES", 30)
+
+
+class HeartbeatBuffer:
+    """
+    Coalesces session heartbeats in memory:
+    N events of one session between flushes = 1 row in ONE bulk_update.
+    Nothing is held longer than `flush_seconds`: touch() flushes once the oldest entry is
+    that old, and a timer armed with the first entry flushes a worker that went quiet.
+    """
+
+    def __init__(self, flush_seconds=FLUSH_SECONDS, max_pending=MAX_PENDING):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = {}  # session_id -> [last_seen_at, events, page_views]
+        self._lock = threading.Lock()
+        self._oldest_at = None  # monotonic time of the oldest pending entry
+        self._timer = None
+
+    def touch(self, session_id, seen_at=None, page_view=False):
+        if not session_id:
+            return
+        seen_at = seen_at or timezone.now()
+        with self._lock:
+            if not self._pending:
+                self._oldest_at = time.monotonic()
+                self._arm_timer()
+            entry = self._pending.get(session_id)
+            if entry is None:
+                entry = self._pending[session_id] = [seen_at, 0, 0]
+            elif seen_at > entry[0]:
+                entry[0] = seen_at
+            entry[1] += 1
+            entry[2] += 1 if page_view else 0
+            due = len(self._pending) >= self.max_pending or time.monotonic() - self._oldest_at >= self.flush_seconds
+
+        if due:
+            self.flush()
+
+    def _arm_timer(self):
+        if self._timer is None or not self._timer.is_alive():
+            self._timer = threading.Timer(self.flush_seconds, self._flush_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_idle(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"idle heartbeat flush failed: {e}")
+        finally:
+            connection.close()  # the timer thread's own connection
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._oldest_at = None
+        if not pending:
+            return 0
+
+        now = timezone.now()
+        sessions = [
+            AnalyticsSession(
+                pk=session_id,
+                # another worker may already have written a later heartbeat
+                last_seen_at=Greatest(F("last_seen_at"), Value(seen_at)),
+                event_count=F("event_count") + events,
+                page_view_count=F("page_view_count") + page_views,
+                updated=now,
+            )
+            for session_id, (seen_at, events, page_views) in pending.items()
+        ]
+        AnalyticsSession.objects.bulk_update(
+            sessions,
+            ["last_seen_at", "event_count", "page_view_count", "updated"],
+            batch_size=500,
+        )
+        return len(sessions)
+
+
+buffer = HeartbeatBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        buffer.flush()
+    except Exception as e:
+        logger.warning(f"heartbeat flush on exit failed: {e}")
+
+
+def close_idle_sessions(idle_minutes=IDLE_TIMEOUT_MINUTES) -> int:
+    """
+    Ends every active session idle for longer than `idle_minutes` with ONE set-based UPDATE.
+    Web workers may still hold up to FLUSH_SECONDS of heartbeats, so the cutoff allows for that.
+    """
+    cutoff = timezone.now() - datetime.timedelta(minutes=idle_minutes, seconds=FLUSH_SECONDS)
+    return AnalyticsSession.objects.filter(
+        status=SessionStatus.ACTIVE,
+        last_seen_at__lt=cutoff,
+    ).update(
+        status=SessionStatus.ENDED,
+        ended_at=F("last_seen_at"),
+        updated=timezone.now(),
+    )
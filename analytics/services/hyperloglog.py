@@ -0,0 +1,74 @@
+# analytics/services/hyperloglog.py
+import hashlib
+import math
+import zlib
+
+
+DEFAULT_PRECISION = 14  # 16384 registers, ~0.8% standard error
+
+_POW2 = [2.0 ** -i for i in range(66)]
+
+
+class HyperLogLog:
+    """
+    Plain-python HyperLogLog with 64-bit hashes.
+    Sketches with the same precision merge by taking the register-wise max,
+    so counts over any range of days = merge of the daily sketches.
+    """
+
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("register size does not match precision")
+
+    def add(self, value):
+        h = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        idx = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(map(_POW2.__getitem__, self.registers))
+        if estimate <= 2.5 * m:
+            zeros = self.registers.count(0)
+            if zeros:
+                estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    # storage format: 1 byte precision + zlib(registers). Sparse sketches compress to a few hundred bytes.
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data)
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
+
+
+def merge_all(blobs, precision=DEFAULT_PRECISION):
+    merged = HyperLogLog(precision)
+    for blob in blobs:
+        merged.merge(HyperLogLog.from_bytes(blob))
+    return merged
@@ -0,0 +1,23 @@
+# analytics/services/ingestion.py
+from analytics.models import EventType
+from analytics.services import heartbeats
+from analytics.services.realtime import record_activity
+
+
+def on_events_ingested(events):
+    """
+    Post-insert hook for the event ingestion path (API create / bulk create).
+    Keep it cheap: everything here runs inside the request.
+    """
+    for event in events:
+        record_activity(
+            event.user_id or event.session_id,
+            branch_id=event.branch_id,
+            course_id=event.course_id,
+            at=event.occurred_at,
+        )
+        heartbeats.buffer.touch(
+            event.session_id,
+            seen_at=event.occurred_at,
+            page_view=event.event_type == EventType.PAGE_VIEW,
+        )
@@ -0,0 +1,49 @@
+# analytics/services/pageviews.py
+from collections import Counter
+
+from django.db.models import Count, Sum
+
+from analytics.models import DailyPageView, EventType
+from analytics.services.paths import normalize_path
+
+
+def build_daily_page_views(day, events) -> int:
+    """
+    Replaces the day's DailyPageView rows from one grouped query over the page views.
+    Events stored before path_template existed are normalized here from their raw path.
+    """
+    views = Counter()  # (branch_id, path_template) -> n
+
+    page_views = events.filter(event_type=EventType.PAGE_VIEW, path__isnull=False).order_by()
+
+    rows = page_views.exclude(path_template__isnull=True).values_list("branch_id", "path_template").annotate(n=Count("id"))
+    for branch_id, template, n in rows.iterator():
+        views[(branch_id, template)] += n
+
+    legacy = page_views.filter(path_template__isnull=True).values_list("branch_id", "path").annotate(n=Count("id"))
+    for branch_id, path, n in legacy.iterator():
+        template = normalize_path(path)
+        if template:
+            views[(branch_id, template)] += n
+
+    DailyPageView.objects.filter(date=day).delete()
+    DailyPageView.objects.bulk_create(
+        [
+            DailyPageView(branch_id=branch_id, date=day, path_template=template, views=n)
+            for (branch_id, template), n in views.items()
+        ],
+        batch_size=1000,
+    )
+    return len(views)
+
+
+def top_pages(date_from, date_to, branch=None, limit=20):
+    qs = DailyPageView.objects.filter(date__gte=date_from, date__lte=date_to)
+    if branch:
+        qs = qs.filter(branch_id=branch)
+    return list(
+        qs.order_by()
+        .values("path_template")
+        .annotate(views=Sum("views"))
+        .order_by("-views", "path_template")[:limit]
+    )
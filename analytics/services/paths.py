@@ -0,0 +1,104 @@
+# analytics/services/paths.py
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+
+# Frontend routes. A `<name>` segment matches any single segment.
+DEFAULT_PATH_TEMPLATES = [
+    "/",
+    "/courses",
+    "/courses/<slug>",
+    "/courses/<slug>/modules/<id>",
+    "/courses/<slug>/lessons/<id>",
+    "/courses/<slug>/quizzes/<id>",
+    "/courses/<slug>/assignments/<id>",
+    "/courses/<slug>/reviews",
+    "/categories/<slug>",
+    "/instructors/<id>",
+    "/cart",
+    "/checkout",
+    "/checkout/<id>",
+    "/orders/<id>",
+    "/certificates/<id>",
+    "/certificates/verify/<code>",
+    "/my/courses",
+    "/my/courses/<slug>",
+    "/dashboard",
+    "/profile",
+    "/login",
+    "/register",
+]
+
+PATH_TEMPLATES = getattr(settings, "ANALYTICS_PATH_TEMPLATES", DEFAULT_PATH_TEMPLATES)
+
+# fallback for unknown routes: segments that look like ids are collapsed
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+"
+    r"|[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}"
+    r"|[0-9a-f]{16,}"
+    r"|[A-Za-z0-9_-]{20,})$",
+    re.IGNORECASE,
+)
+
+
+def _segments(path):
+    return [s for s in path.split("/") if s]
+
+
+def _is_param(segment):
+    return segment.startswith("<") and segment.endswith(">")
+
+
+class RouteTrie:
+    """
+    Segment trie of route templates. Literal children win over the param child,
+    with backtracking, so `/courses/new` can coexist with `/courses/<slug>`.
+    """
+
+    PARAM = "<>"
+
+    def __init__(self, templates=()):
+        self.root = {}
+        for template in templates:
+            self.add(template)
+
+    def add(self, template):
+        node = self.root
+        for segment in _segments(template):
+            node = node.setdefault(self.PARAM if _is_param(segment) else segment, {})
+        node[None] = "/" + "/".join(_segments(template))
+
+    def match(self, segments, node=None, i=0):
+        node = self.root if node is None else node
+        if i == len(segments):
+            return node.get(None)
+        literal = node.get(segments[i])
+        if literal is not None:
+            found = self.match(segments, literal, i + 1)
+            if found:
+                return found
+        param = node.get(self.PARAM)
+        if param is not None:
+            return self.match(segments, param, i + 1)
+        return None
+
+
+_trie = RouteTrie(PATH_TEMPLATES)
+
+
+@lru_cache(maxsize=8192)
+def normalize_path(path):
+    """
+    '/courses/django-101/lessons/42?utm_source=x' -> '/courses/<slug>/lessons/<id>'
+    Query string, fragment, scheme/host and trailing slashes are dropped.
+    """
+    if not path:
+        return None
+    segments = _segments(urlsplit(path).path)
+    template = _trie.match(segments)
+    if template:
+        return template
+    return ("/" + "/".join("<id>" if _ID_SEGMENT.match(s) else s for s in segments))[:255]
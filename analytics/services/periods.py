@@ -0,0 +1,44 @@
+# analytics/services/periods.py
+import datetime
+
+from django.utils import timezone
+
+from analytics.models import Granularity
+
+
+def period_start(day, granularity):
+    """
+    First day of the bucket `day` falls into (ISO weeks start on Monday).
+    """
+    if granularity == Granularity.WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_end(start, granularity):
+    """
+    Last day (inclusive) of the bucket starting at `start`.
+    """
+    if granularity == Granularity.WEEK:
+        return start + datetime.timedelta(days=6)
+    if granularity == Granularity.MONTH:
+        next_month = (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        return next_month - datetime.timedelta(days=1)
+    return start
+
+
+def iter_periods(date_from, date_to, granularity):
+    start = period_start(date_from, granularity)
+    while start <= date_to:
+        yield start
+        start = period_end(start, granularity) + datetime.timedelta(days=1)
+
+
+def day_bounds(day):
+    """
+    [start, end) datetimes of a calendar day in the current timezone.
+    """
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
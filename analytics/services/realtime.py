@@ -0,0 +1,188 @@
+# analytics/services/realtime.py
+import fcntl
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+REALTIME_CACHE_ALIAS = getattr(settings, "ANALYTICS_REALTIME_CACHE", "realtime")
+BUCKET_SECONDS = getattr(settings, "ANALYTICS_REALTIME_BUCKET_SECONDS", 10)
+WINDOW_SECONDS = getattr(settings, "ANALYTICS_REALTIME_WINDOW_SECONDS", 300)
+FLUSH_SECONDS = getattr(settings, "ANALYTICS_REALTIME_FLUSH_SECONDS", 5)
+
+WORKERS_KEY = "analytics:rt:workers"
+# serializes read-modify-write of WORKERS_KEY across workers: an flock() file next to a
+# file-based cache (whose add() is not atomic), else cache.add() (atomic on redis / memcached)
+WORKERS_LOCK_FILE = "workers.lock"
+WORKERS_LOCK_KEY = "analytics:rt:workers:lock"
+WORKERS_LOCK_SECONDS = 5
+
+
+def _dimension_key(dimension, worker):
+    return f"analytics:rt:{dimension}:{worker}"
+
+
+def dimensions_for(branch_id=None, course_id=None):
+    """
+    Every activity is counted globally, per branch and per course.
+    Courses are also keyed under their branch so branch-scoped readers never need the DB.
+    """
+    dims = ["all"]
+    if branch_id:
+        dims.append(f"branch:{branch_id}")
+    if course_id:
+        dims.append(f"course:{course_id}")
+        if branch_id:
+            dims.append(f"branch:{branch_id}:course:{course_id}")
+    return dims
+
+
+class SlidingWindowCounter:
+    """
+    Time-bucketed ring buffers of actor ids per dimension (in-process).
+
+    Each worker periodically publishes a snapshot of its rings to a shared cache
+    (one key per dimension per worker), readers union the snapshots of all live
+    workers. Nothing here touches the database.
+    """
+
+    def __init__(self, bucket_seconds=BUCKET_SECONDS, window_seconds=WINDOW_SECONDS, flush_seconds=FLUSH_SECONDS, cache_alias=REALTIME_CACHE_ALIAS):
+        self.bucket_seconds = bucket_seconds
+        self.window_seconds = window_seconds
+        self.size = max(1, window_seconds // bucket_seconds)
+        self.flush_seconds = flush_seconds
+        self.cache_alias = cache_alias
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._rings = {}      # dimension -> [(bucket, set), ...] of length self.size
+        self._dirty = set()   # dimensions changed since last flush
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._registered_at = 0.0
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _bucket(self, ts):
+        return int(ts // self.bucket_seconds)
+
+    def record(self, actor, dimensions, at=None):
+        if not actor:
+            return
+        now = time.time()
+        bucket = self._bucket(at if at is not None else now)
+        if bucket <= self._bucket(now) - self.size:
+            return  # too old to matter
+
+        with self._lock:
+            for dim in dimensions:
+                ring = self._rings.get(dim)
+                if ring is None:
+                    ring = self._rings[dim] = [(None, None)] * self.size
+                slot = bucket % self.size
+                slot_bucket, actors = ring[slot]
+                if slot_bucket != bucket:
+                    actors = set()
+                    ring[slot] = (bucket, actors)
+                actors.add(str(actor))
+                self._dirty.add(dim)
+
+        if now - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def _snapshot(self, dim, oldest_bucket):
+        ring = self._rings.get(dim) or ()
+        return {b: set(actors) for b, actors in ring if b is not None and b >= oldest_bucket}
+
+    def flush(self):
+        now = time.time()
+        oldest = self._bucket(now) - self.size + 1
+
+        with self._lock:
+            self._last_flush = now
+            dirty, self._dirty = self._dirty, set()
+            snapshots = {dim: self._snapshot(dim, oldest) for dim in dirty}
+            # forget dimensions that went quiet
+            for dim in [d for d in self._rings if not self._snapshot(d, oldest)]:
+                del self._rings[dim]
+
+        if snapshots:
+            self.cache.set_many(
+                {_dimension_key(dim, self.worker): snap for dim, snap in snapshots.items()},
+                timeout=self.window_seconds,
+            )
+        if now - self._registered_at >= self.window_seconds / 2:
+            self._register(now)
+
+    @contextmanager
+    def _workers_lock(self):
+        directory = getattr(self.cache, "_dir", None)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, WORKERS_LOCK_FILE), "a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)  # blocks for the few ms a registration takes
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+            return
+        if not self.cache.add(WORKERS_LOCK_KEY, self.worker, timeout=WORKERS_LOCK_SECONDS):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self.cache.delete(WORKERS_LOCK_KEY)
+
+    def _register(self, now):
+        with self._workers_lock() as locked:
+            if not locked:
+                return  # another worker is registering: retried on the next flush
+            workers = self.cache.get(WORKERS_KEY) or {}
+            workers = {w: ts for w, ts in workers.items() if now - ts < self.window_seconds}
+            workers[self.worker] = now
+            self.cache.set(WORKERS_KEY, workers, timeout=None)
+        self._registered_at = now
+
+    def count(self, dimension="all", window_seconds=None) -> int:
+        window_seconds = min(window_seconds or self.window_seconds, self.window_seconds)
+        now = time.time()
+        oldest = self._bucket(now - window_seconds) + 1
+
+        workers = set(self.cache.get(WORKERS_KEY) or {}) - {self.worker}
+        snapshots = list(self.cache.get_many([_dimension_key(dimension, w) for w in workers]).values())
+        with self._lock:
+            snapshots.append(self._snapshot(dimension, oldest))
+
+        actors = set()
+        for snap in snapshots:
+            for bucket, ids in snap.items():
+                if bucket >= oldest:
+                    actors |= ids
+        return len(actors)
+
+
+counter = SlidingWindowCounter()
+
+
+def record_activity(actor, branch_id=None, course_id=None, at=None):
+    """
+    Feed from ingestion paths (events, progress pings). `at` is a datetime or None for now.
+    """
+    counter.record(actor, dimensions_for(branch_id, course_id), at=at.timestamp() if at else None)
+
+
+def active_users(branch_id=None, course_id=None, window_seconds=None) -> int:
+    if course_id:
+        dim = f"branch:{branch_id}:course:{course_id}" if branch_id else f"course:{course_id}"
+    elif branch_id:
+        dim = f"branch:{branch_id}"
+    else:
+        dim = "all"
+    return counter.count(dim, window_seconds)
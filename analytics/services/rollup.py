@@ -0,0 +1,90 @@
+# analytics/services/rollup.py
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from analytics.models import AnalyticsEvent, DailyMetric, DeviceType, EventType, MetricName
+from analytics.services.pageviews import build_daily_page_views
+from analytics.services.periods import day_bounds
+from analytics.services.sketches import build_daily_sketches
+from analytics.services.timeseries import daily_metric_key, daily_metrics_changed, deferred_rollups
+
+logger = logging.getLogger(__name__)
+
+
+# event type -> counter metric filled by the rollup
+EVENT_COUNT_METRICS = {
+    EventType.PAGE_VIEW: MetricName.PAGE_VIEWS,
+    EventType.COURSE_VIEW: MetricName.COURSE_VIEWS,
+    EventType.CHECKOUT_STARTED: MetricName.CHECKOUTS,
+    EventType.LESSON_START: MetricName.LESSON_STARTS,
+    EventType.LESSON_COMPLETE: MetricName.LESSON_COMPLETIONS,
+}
+
+ROLLUP_METRICS = [*EVENT_COUNT_METRICS.values(), MetricName.ACTIVE_USERS]
+
+
+def upsert_daily_metric(day, metric, branch_id, course_id, value, campaign_id=None, meta=None):
+    defaults = {"value": value}
+    if meta is not None:
+        defaults["meta"] = meta
+    obj, _ = DailyMetric.objects.update_or_create(
+        branch_id=branch_id,
+        date=day,
+        metric=metric,
+        course_id=course_id,
+        campaign_id=campaign_id,
+        defaults=defaults,
+    )
+    return obj
+
+
+@transaction.atomic
+def rollup_day(day):
+    """
+    Rebuilds the event-derived DailyMetric rows of one day (idempotent).
+    Rows are written per (branch, course) plus a branch total with course NULL.
+    Also refreshes the day's DailyPageView rows.
+    """
+    start, end = day_bounds(day)
+    events = AnalyticsEvent.objects.filter(occurred_at__gte=start, occurred_at__lt=end).exclude(
+        session__device_type=DeviceType.BOT,
+    )
+
+    values = defaultdict(int)  # (metric, branch_id, course_id) -> value
+
+    counts = (
+        events.filter(event_type__in=list(EVENT_COUNT_METRICS))
+        .order_by()
+        .values("branch_id", "course_id", "event_type")
+        .annotate(n=Count("id"))
+    )
+    for row in counts:
+        metric = EVENT_COUNT_METRICS[row["event_type"]]
+        values[(metric, row["branch_id"], None)] += row["n"]
+        if row["course_id"]:
+            values[(metric, row["branch_id"], row["course_id"])] += row["n"]
+
+    for (branch_id, course_id), n in build_daily_sketches(day, events).items():
+        values[(MetricName.ACTIVE_USERS, branch_id, course_id)] = n
+
+    with deferred_rollups():
+        touched = [
+            upsert_daily_metric(day, metric, branch_id, course_id, value).pk
+            for (metric, branch_id, course_id), value in values.items()
+        ]
+
+        # keys that disappeared since the last run go back to zero
+        stale = DailyMetric.objects.filter(
+            date=day, metric__in=ROLLUP_METRICS, campaign__isnull=True,
+        ).exclude(pk__in=touched)
+        # .update() sends no signals, hand the keys to the rollup refresh ourselves
+        daily_metrics_changed({daily_metric_key(obj) for obj in stale.only("metric", "branch_id", "course_id", "campaign_id", "date")})
+        stale.update(value=0)
+
+    pages = build_daily_page_views(day, events)
+
+    logger.info("analytics rollup %s: %s metric rows, %s page templates", day, len(touched), pages)
+    return len(touched)
@@ -0,0 +1,76 @@
+# analytics/services/sketches.py
+from collections import defaultdict
+
+from analytics.models import DailyUniqueSketch, Granularity, MetricName
+from analytics.services.hyperloglog import HyperLogLog, merge_all
+from analytics.services.periods import iter_periods, period_end, period_start
+
+
+def build_daily_sketches(day, events, metric=MetricName.ACTIVE_USERS):
+    """
+    Streams distinct (branch, course, user) triples of one day and replaces the day's
+    sketches: one per (branch, course) plus a branch-wide one (course NULL).
+    Returns {(branch_id, course_id): exact distinct count} for DailyMetric.
+    """
+    sketches = defaultdict(HyperLogLog)
+    users = defaultdict(set)
+
+    triples = (
+        events.exclude(user_id__isnull=True)
+        .order_by()
+        .values_list("branch_id", "course_id", "user_id")
+        .distinct()
+    )
+    for branch_id, course_id, user_id in triples.iterator(chunk_size=5000):
+        keys = [(branch_id, None)] if course_id is None else [(branch_id, None), (branch_id, course_id)]
+        for key in keys:
+            if user_id not in users[key]:
+                users[key].add(user_id)
+                sketches[key].add(user_id)
+
+    DailyUniqueSketch.objects.filter(date=day, metric=metric).delete()
+    DailyUniqueSketch.objects.bulk_create([
+        DailyUniqueSketch(
+            branch_id=branch_id,
+            date=day,
+            metric=metric,
+            course_id=course_id,
+            registers=sketch.to_bytes(),
+            estimate=len(users[(branch_id, course_id)]),
+        )
+        for (branch_id, course_id), sketch in sketches.items()
+    ])
+
+    return {key: len(ids) for key, ids in users.items()}
+
+
+def _sketch_queryset(date_from, date_to, metric, branch=None, course=None):
+    qs = DailyUniqueSketch.objects.filter(metric=metric, date__gte=date_from, date__lte=date_to, course_id=course)
+    if branch:
+        qs = qs.filter(branch_id=branch)
+    return qs
+
+
+def unique_count(date_from, date_to, metric=MetricName.ACTIVE_USERS, branch=None, course=None) -> int:
+    """
+    Approximate distinct users between two dates (inclusive) = merge of daily sketches.
+    """
+    blobs = _sketch_queryset(date_from, date_to, metric, branch, course).values_list("registers", flat=True)
+    return merge_all(blobs.iterator()).count()
+
+
+def unique_series(date_from, date_to, granularity=Granularity.DAY, metric=MetricName.ACTIVE_USERS, branch=None, course=None):
+    """
+    [{"period": date, "value": n}, ...] with one sketch merge per bucket.
+    Loads the sketches of the whole range in one query.
+    """
+    buckets = {start: HyperLogLog() for start in iter_periods(date_from, date_to, granularity)}
+
+    rows = _sketch_queryset(date_from, date_to, metric, branch, course).values_list("date", "registers")
+    for day, blob in rows.iterator():
+        buckets[period_start(day, granularity)].merge(HyperLogLog.from_bytes(blob))
+
+    return [
+        {"period": start, "period_end": min(period_end(start, granularity), date_to), "value": buckets[start].count()}
+        for start in sorted(buckets)
+    ]
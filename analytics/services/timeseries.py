@@ -0,0 +1,187 @@
+# analytics/services/timeseries.py
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Sum
+
+from analytics.models import DailyMetric, DailyUniqueSketch, Granularity, MetricName, MetricRollup
+from analytics.services.hyperloglog import merge_all
+from analytics.services.periods import iter_periods, period_end, period_start
+from analytics.services.sketches import unique_series
+
+
+TIMESERIES_CACHE_TIMEOUT = getattr(settings, "ANALYTICS_TIMESERIES_CACHE_TIMEOUT", 60 * 60 * 24)
+
+ROLLUP_GRANULARITIES = [Granularity.WEEK, Granularity.MONTH]
+
+# distinct counts can't be summed across days, their buckets come from sketch merges
+SKETCH_METRICS = {MetricName.ACTIVE_USERS}
+
+
+# ----------------------------- rollup refresh -----------------------------
+
+_deferred = threading.local()
+
+
+def _bucket_value(metric, branch_id, course_id, campaign_id, start, end):
+    if metric in SKETCH_METRICS and campaign_id is None:
+        blobs = list(
+            DailyUniqueSketch.objects.filter(
+                metric=metric, date__gte=start, date__lte=end, branch_id=branch_id, course_id=course_id,
+            ).values_list("registers", flat=True)
+        )
+        if blobs:
+            return Decimal(merge_all(blobs).count())
+
+    daily = DailyMetric.objects.filter(
+        metric=metric,
+        date__gte=start,
+        date__lte=end,
+        branch_id=branch_id,
+        course_id=course_id,
+        campaign_id=campaign_id,
+    )
+    if metric in SKETCH_METRICS:
+        # no sketches (manual rows): the busiest day is a lower bound, a sum would overcount
+        return daily.aggregate(v=Max("value"))["v"]
+    return daily.aggregate(v=Sum("value"))["v"]
+
+
+def refresh_rollups(keys) -> int:
+    """
+    Re-aggregates only the week/month buckets touched by changed daily rows.
+    `keys` are (metric, branch_id, course_id, campaign_id, date) tuples.
+    """
+    buckets = {
+        (granularity, period_start(day, granularity), metric, branch_id, course_id, campaign_id)
+        for metric, branch_id, course_id, campaign_id, day in keys
+        for granularity in ROLLUP_GRANULARITIES
+    }
+
+    for granularity, start, metric, branch_id, course_id, campaign_id in buckets:
+        dims = {
+            "branch_id": branch_id,
+            "granularity": granularity,
+            "period_start": start,
+            "metric": metric,
+            "course_id": course_id,
+            "campaign_id": campaign_id,
+        }
+        value = _bucket_value(metric, branch_id, course_id, campaign_id, start, period_end(start, granularity))
+        # emptied buckets are zeroed, not deleted: a delete would not move the watermark
+        MetricRollup.objects.update_or_create(**dims, defaults={"value": value or 0})
+
+    return len(buckets)
+
+
+def daily_metric_key(obj):
+    return (obj.metric, obj.branch_id, obj.course_id, obj.campaign_id, obj.date)
+
+
+def daily_metrics_changed(keys):
+    """
+    Entry point for signals / bulk writers. Inside `deferred_rollups()` keys are only collected.
+    """
+    pending = getattr(_deferred, "keys", None)
+    if pending is not None:
+        pending.update(keys)
+    else:
+        refresh_rollups(keys)
+
+
+@contextmanager
+def deferred_rollups():
+    """
+    Batches rollup refreshes of a bulk write (eg. rollup_day) into one pass at the end.
+    """
+    if getattr(_deferred, "keys", None) is not None:
+        yield  # nested: the outer block refreshes
+        return
+
+    _deferred.keys = set()
+    try:
+        yield
+        keys = _deferred.keys
+    finally:
+        _deferred.keys = None
+    refresh_rollups(keys)
+
+
+# ----------------------------- cached series -----------------------------
+
+def rollup_watermark():
+    """
+    Changes whenever a rollup bucket is written (indexed MAX, no scan).
+    Daily rows always refresh their buckets, so this covers daily series too.
+    """
+    latest = MetricRollup.objects.aggregate(latest=Max("updated"))["latest"]
+    return latest.isoformat() if latest else "0"
+
+
+def timeseries_cache_key(scope, watermark, **params):
+    raw = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"analytics:timeseries:{scope}:{watermark}:{digest}"
+
+
+def compute_timeseries(metric, date_from, date_to, granularity=Granularity.DAY, branch=None, course=None, campaign=None):
+    """
+    [{"period", "period_end", "value"}, ...] zero-filled over the range.
+    Days read DailyMetric, weeks / months read the materialized MetricRollup buckets.
+    """
+    if metric in SKETCH_METRICS and campaign is None and branch is None:
+        # across branches the distinct users have to be merged, not summed
+        return unique_series(date_from, date_to, granularity, metric=metric, course=course)
+
+    if granularity == Granularity.DAY:
+        qs = DailyMetric.objects.filter(date__gte=date_from, date__lte=date_to)
+        period_field = "date"
+    else:
+        qs = MetricRollup.objects.filter(
+            granularity=granularity,
+            period_start__gte=period_start(date_from, granularity),
+            period_start__lte=date_to,
+        )
+        period_field = "period_start"
+
+    qs = qs.filter(metric=metric, course_id=course, campaign_id=campaign)
+    if branch:
+        qs = qs.filter(branch_id=branch)
+
+    values = dict(
+        qs.order_by().values(period_field).annotate(total=Sum("value")).values_list(period_field, "total")
+    )
+    return [
+        {
+            "period": start,
+            "period_end": min(period_end(start, granularity), date_to),
+            "value": values.get(start) or 0,
+        }
+        for start in iter_periods(date_from, date_to, granularity)
+    ]
+
+
+def get_timeseries(scope, metric, date_from, date_to, granularity=Granularity.DAY, branch=None, course=None, campaign=None):
+    """
+    Cached by the rollup watermark: a new rollup write changes every key, nothing to invalidate.
+    """
+    params = {
+        "metric": metric,
+        "date_from": date_from,
+        "date_to": date_to,
+        "granularity": granularity,
+        "branch": branch,
+        "course": course,
+        "campaign": campaign,
+    }
+    key = timeseries_cache_key(scope, rollup_watermark(), **params)
+    result = cache.get(key)
+    if result is None:
+        result = {**params, "series": compute_timeseries(**params)}
+        cache.set(key, result, TIMESERIES_CACHE_TIMEOUT)
+    return result
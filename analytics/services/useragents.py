@@ -0,0 +1,133 @@
+# analytics/services/useragents.py
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+from analytics.models import DeviceType
+
+
+UA_CACHE_SIZE = getattr(settings, "ANALYTICS_UA_CACHE_SIZE", 4096)
+DROP_BOT_EVENTS = getattr(settings, "ANALYTICS_DROP_BOT_EVENTS", True)
+
+UserAgentInfo = namedtuple("UserAgentInfo", ["device_type", "device_os", "browser", "is_bot"])
+
+UNKNOWN = UserAgentInfo(DeviceType.OTHER, None, None, False)
+
+# crawlers, link previews, monitors and browser automation: dropped from analytics
+_BOT = re.compile(
+    r"bot\b|crawl|spider|slurp|facebookexternalhit|embedly|preview|headless|lighthouse"
+    r"|pingdom|uptime|monitor|scrapy|phantomjs|selenium|puppeteer|playwright",
+    re.IGNORECASE,
+)
+
+# plain HTTP client libraries: our own mobile apps and SSR frontends send these, so they
+# are real traffic (device_type OTHER), never dropped
+_HTTP_CLIENT = re.compile(
+    r"okhttp|axios/|node-fetch|java/|httpclient|go-http-client|python-requests|python-urllib"
+    r"|curl/|wget/|libwww",
+    re.IGNORECASE,
+)
+
+# first match wins, order matters (eg. Edge/Opera UAs also contain Chrome and Safari)
+_OS = [
+    (re.compile(r"iPad|iPhone|iPod", re.I), "iOS"),
+    (re.compile(r"Android", re.I), "Android"),
+    (re.compile(r"CrOS", re.I), "ChromeOS"),
+    (re.compile(r"Windows", re.I), "Windows"),
+    (re.compile(r"Mac OS X|Macintosh", re.I), "macOS"),
+    (re.compile(r"Linux", re.I), "Linux"),
+]
+
+_BROWSERS = [
+    (re.compile(r"Edg(?:e|A|iOS)?/", re.I), "Edge"),
+    (re.compile(r"OPR/|Opera", re.I), "Opera"),
+    (re.compile(r"SamsungBrowser/", re.I), "Samsung Internet"),
+    (re.compile(r"Firefox/|FxiOS/", re.I), "Firefox"),
+    (re.compile(r"Chrome/|CriOS/", re.I), "Chrome"),
+    (re.compile(r"Safari/", re.I), "Safari"),
+    (re.compile(r"MSIE |Trident/", re.I), "Internet Explorer"),
+]
+
+_TABLET = re.compile(r"iPad|Tablet|Android(?!.*Mobile)|Kindle|Silk/", re.I)
+_MOBILE = re.compile(r"Mobi|iPhone|iPod|Android.*Mobile|Windows Phone", re.I)
+
+
+def _first(patterns, ua):
+    for pattern, name in patterns:
+        if pattern.search(ua):
+            return name
+    return None
+
+
+@lru_cache(maxsize=UA_CACHE_SIZE)
+def parse_user_agent(ua):
+    """
+    Cheap regex classification, memoized per UA string (real traffic has only a few hundred distinct UAs).
+    """
+    if not ua:
+        return UNKNOWN
+    ua = ua[:512]
+
+    if _BOT.search(ua):
+        return UserAgentInfo(DeviceType.BOT, _first(_OS, ua), None, True)
+    if _HTTP_CLIENT.search(ua):
+        return UserAgentInfo(DeviceType.OTHER, _first(_OS, ua), None, False)
+
+    device_os = _first(_OS, ua)
+    if _TABLET.search(ua):
+        device_type = DeviceType.TABLET
+    elif _MOBILE.search(ua):
+        device_type = DeviceType.MOBILE
+    elif device_os in ("Windows", "macOS", "Linux", "ChromeOS"):
+        device_type = DeviceType.DESKTOP
+    else:
+        device_type = DeviceType.OTHER
+
+    return UserAgentInfo(device_type, device_os, _first(_BROWSERS, ua), False)
+
+
+def is_bot(ua) -> bool:
+    return parse_user_agent(ua).is_bot
+
+
+def apply_user_agent(session, force=False) -> bool:
+    """
+    Fills device_type / device_os / browser from session.user_agent.
+    Returns True if anything changed (callers batch the changed ones into a bulk_update).
+    """
+    if not session.user_agent:
+        return False
+    if not force and (session.device_os or session.browser or session.device_type != DeviceType.OTHER):
+        return False
+
+    info = parse_user_agent(session.user_agent)
+    changed = (session.device_type, session.device_os, session.browser) != info[:3]
+    session.device_type, session.device_os, session.browser = info[:3]
+    return changed
+
+
+def backfill_sessions(queryset, batch_size=2000, force=False) -> int:
+    """
+    Classifies stored sessions in chunks, one bulk_update per chunk.
+    """
+    fields = ["device_type", "device_os", "browser"]
+    changed, updated = [], 0
+
+    rows = queryset.exclude(user_agent__isnull=True).exclude(user_agent="")
+    if not force:
+        rows = rows.filter(device_type=DeviceType.OTHER, device_os__isnull=True, browser__isnull=True)
+    rows = rows.only("pk", "user_agent", *fields)
+    for session in rows.iterator(chunk_size=batch_size):
+        if apply_user_agent(session, force=force):
+            changed.append(session)
+        if len(changed) >= batch_size:
+            queryset.model.objects.bulk_update(changed, fields, batch_size=batch_size)
+            updated += len(changed)
+            changed = []
+
+    if changed:
+        queryset.model.objects.bulk_update(changed, fields, batch_size=batch_size)
+        updated += len(changed)
+    return updated
@@ -0,0 +1,12 @@
+# analytics/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from analytics.models import DailyMetric
+from analytics.services.timeseries import daily_metric_key, daily_metrics_changed
+
+
+@receiver(post_save, sender=DailyMetric, dispatch_uid="analytics_daily_metric_saved")
+@receiver(post_delete, sender=DailyMetric, dispatch_uid="analytics_daily_metric_deleted")
+def refresh_metric_rollups(sender, instance, **kwargs):
+    daily_metrics_changed({daily_metric_key(instance)})
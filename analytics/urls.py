@@ -6,6 +6,9 @@ from analytics.views import (
     AnalyticsSessionViewSet,
     AnalyticsEventViewSet,
     DailyMetricViewSet,
+    DailyPageViewViewSet,
+    MetricRollupViewSet,
+    OrderAttributionViewSet,
     RetentionCohortViewSet,
 )
 
@@ -14,6 +17,9 @@ router.register(r"acquisition-campaigns", AcquisitionCampaignViewSet, basename="
 router.register(r"analytics-sessions", AnalyticsSessionViewSet, basename="analytics-session")
 router.register(r"analytics-events", AnalyticsEventViewSet, basename="analytics-event")
 router.register(r"daily-metrics", DailyMetricViewSet, basename="daily-metric")
+router.register(r"daily-page-views", DailyPageViewViewSet, basename="daily-page-view")
+router.register(r"metric-rollups", MetricRollupViewSet, basename="metric-rollup")
+router.register(r"order-attributions", OrderAttributionViewSet, basename="order-attribution")
 router.register(r"retention-cohorts", RetentionCohortViewSet, basename="retention-cohort")
 
 urlpatterns = [
@@ -1,9 +1,17 @@
-from core.utils.BulkModelViewSet import BaseModelViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.utils.BulkModelViewSet import BaseModelViewSet, BaseReadOnlyModelViewSet
+from core.utils.branchScope import get_branch_scope
 from analytics.models import (
     AcquisitionCampaign,
     AnalyticsSession,
     AnalyticsEvent,
     DailyMetric,
+    DailyPageView,
+    MetricRollup,
+    OrderAttribution,
     RetentionCohort,
 )
 from analytics.serializers import (
@@ -11,15 +19,33 @@ from analytics.serializers import (
     AnalyticsSessionSerializer,
     AnalyticsEventSerializer,
     DailyMetricSerializer,
+    DailyPageViewSerializer,
+    MetricRollupSerializer,
+    OrderAttributionSerializer,
     RetentionCohortSerializer,
+    FunnelQuerySerializer,
+    UniqueCountQuerySerializer,
+    ActiveNowQuerySerializer,
+    TimeSeriesQuerySerializer,
+    TopPagesQuerySerializer,
 )
 from analytics.filters import (
     AcquisitionCampaignFilter,
     AnalyticsSessionFilter,
     AnalyticsEventFilter,
     DailyMetricFilter,
+    DailyPageViewFilter,
+    MetricRollupFilter,
+    OrderAttributionFilter,
     RetentionCohortFilter,
 )
+from analytics.services.funnels import get_funnel
+from analytics.services.ingestion import on_events_ingested
+from analytics.services.pageviews import top_pages
+from analytics.services.realtime import active_users
+from analytics.services.sketches import unique_count, unique_series
+from analytics.services.useragents import DROP_BOT_EVENTS, is_bot
+from analytics.services.timeseries import get_timeseries
 
 
 class AcquisitionCampaignViewSet(BaseModelViewSet):
@@ -37,14 +63,62 @@ class AnalyticsSessionViewSet(BaseModelViewSet):
     search_fields = ["session_key", "utm_source", "utm_medium", "utm_campaign", "device_os", "browser"]
     ordering_fields = "__all__"
 
+    def perform_create(self, serializer):
+        # device fields are classified on save, fall back to the caller's UA
+        data = serializer.validated_data
+        if isinstance(data, dict) and not data.get("user_agent"):
+            data["user_agent"] = self.request.META.get("HTTP_USER_AGENT")
+        super().perform_create(serializer)
+
+    @action(detail=False, methods=["get"], url_path="active-now")
+    def active_now(self, request):
+        """
+        Users active in the last `window` seconds, read from the in-memory counters (no DB).
+        """
+        params = ActiveNowQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        scope = get_branch_scope(request.user)
+        branch = data.get("branch") if scope == "all" else scope
+        course = data.get("course")
+
+        return Response({
+            "window_seconds": data["window"],
+            "branch": branch,
+            "course": course,
+            "active_users": active_users(branch_id=branch, course_id=course, window_seconds=data["window"]),
+        })
+
 
 class AnalyticsEventViewSet(BaseModelViewSet):
     queryset = AnalyticsEvent.objects.all()
     serializer_class = AnalyticsEventSerializer
     filterset_class = AnalyticsEventFilter
-    search_fields = ["event_type", "name", "path", "page_title"]
+    search_fields = ["event_type", "name", "path", "path_template", "page_title"]
     ordering_fields = "__all__"
 
+    def create(self, request, *args, **kwargs):
+        # crawlers that execute the tracking script: don't store their events at all
+        if DROP_BOT_EVENTS and is_bot(request.META.get("HTTP_USER_AGENT")):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        instance = serializer.instance
+        on_events_ingested(instance if isinstance(instance, list) else [instance])
+
+    @action(detail=False, methods=["get"])
+    def funnel(self, request):
+        """
+        ?steps=course_view,checkout_started,payment_success&date_from=..&date_to=..[&group_by=campaign]
+        """
+        params = FunnelQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        result = get_funnel(self.get_queryset(), get_branch_scope(request.user), **params.validated_data)
+        return Response(result)
+
 
 class DailyMetricViewSet(BaseModelViewSet):
     queryset = DailyMetric.objects.all()
@@ -53,6 +127,87 @@ class DailyMetricViewSet(BaseModelViewSet):
     search_fields = ["metric"]
     ordering_fields = "__all__"
 
+    @action(detail=False, methods=["get"])
+    def uniques(self, request):
+        """
+        Approximate distinct active users for a date range, merged from daily HLL sketches.
+        ?date_from=..&date_to=..[&granularity=week][&course=..][&branch=..]
+        """
+        params = UniqueCountQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        scope = get_branch_scope(request.user)
+        branch = data.get("branch") if scope == "all" else scope
+        course = data.get("course")
+
+        return Response({
+            "date_from": data["date_from"],
+            "date_to": data["date_to"],
+            "granularity": data["granularity"],
+            "total": unique_count(data["date_from"], data["date_to"], branch=branch, course=course),
+            "series": unique_series(data["date_from"], data["date_to"], data["granularity"], branch=branch, course=course),
+        })
+
+    @action(detail=False, methods=["get"])
+    def timeseries(self, request):
+        """
+        Dashboard series. Days come from DailyMetric, weeks / months from MetricRollup.
+        ?metric=revenue&date_from=..&date_to=..[&granularity=month][&course=..][&campaign=..][&branch=..]
+        """
+        params = TimeSeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        scope = get_branch_scope(request.user)
+        if scope != "all":
+            data["branch"] = scope
+
+        return Response(get_timeseries(scope, **data))
+
+
+class DailyPageViewViewSet(BaseReadOnlyModelViewSet):
+    queryset = DailyPageView.objects.all()
+    serializer_class = DailyPageViewSerializer
+    filterset_class = DailyPageViewFilter
+    search_fields = ["path_template"]
+    ordering_fields = "__all__"
+
+    @action(detail=False, methods=["get"])
+    def top(self, request):
+        """
+        Most viewed routes in a date range, summed from the daily per-template rows.
+        ?date_from=..&date_to=..[&limit=20][&branch=..]
+        """
+        params = TopPagesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        scope = get_branch_scope(request.user)
+        branch = data.get("branch") if scope == "all" else scope
+
+        return Response({
+            "date_from": data["date_from"],
+            "date_to": data["date_to"],
+            "pages": top_pages(data["date_from"], data["date_to"], branch=branch, limit=data["limit"]),
+        })
+
+
+class MetricRollupViewSet(BaseReadOnlyModelViewSet):
+    queryset = MetricRollup.objects.all()
+    serializer_class = MetricRollupSerializer
+    filterset_class = MetricRollupFilter
+    search_fields = ["metric"]
+    ordering_fields = "__all__"
+
+
+class OrderAttributionViewSet(BaseReadOnlyModelViewSet):
+    queryset = OrderAttribution.objects.all()
+    serializer_class = OrderAttributionSerializer
+    filterset_class = OrderAttributionFilter
+    search_fields = ["model"]
+    ordering_fields = "__all__"
+
 
 class RetentionCohortViewSet(BaseModelViewSet):
     queryset = RetentionCohort.objects.all()
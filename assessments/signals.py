@@ -0,0 +1,16 @@
+# assessments/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assessments.models import Assignment, Quiz
+from content.services.tree import bump_content_version
+
+
+@receiver(post_save, sender=Quiz, dispatch_uid="assessments_quiz_saved")
+@receiver(post_delete, sender=Quiz, dispatch_uid="assessments_quiz_deleted")
+@receiver(post_save, sender=Assignment, dispatch_uid="assessments_assignment_saved")
+@receiver(post_delete, sender=Assignment, dispatch_uid="assessments_assignment_deleted")
+def assessments_schedule_changed(sender, instance, raw=False, **kwargs):
+    # quiz windows / due dates are part of the course schedule (calendar feeds key on content_version)
+    if not raw:
+        bump_content_version([instance.course_id])
@@ -0,0 +1,65 @@
+# billing/services/cart.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from billing.models import Cart, CartItem
+from courses.services.pricing import annotate_effective_price
+
+CENTS = Decimal("0.01")
+
+
+def priced_items(cart_ids, at=None):
+    """
+    Cart items with the current price, currency and tax settings of their course,
+    priced by the database in one query (no per-item CoursePricing load).
+    """
+    qs = CartItem.objects.filter(cart_id__in=cart_ids, active=True).annotate(
+        pricing_currency=F("course__pricing__currency_code"),
+        pricing_tax_rate=F("course__pricing__tax_rate"),
+        pricing_tax_included=F("course__pricing__tax_included"),
+    )
+    return annotate_effective_price(qs, prefix="course__pricing__", at=at)
+
+
+def recalculate_carts(carts, at=None):
+    """
+    Re-snapshots every item at its current effective price and refreshes the cart totals.
+    One read for all items, one bulk_update for the items and one for the carts.
+    """
+    carts = {cart.pk: cart for cart in carts}
+    if not carts:
+        return 0
+    at = at or timezone.now()
+
+    totals = {pk: [Decimal(0), Decimal(0)] for pk in carts}  # subtotal, tax
+    items = []
+    for item in priced_items(list(carts), at=at):
+        item.unit_price = item.current_price
+        item.currency_code = item.pricing_currency or item.currency_code
+        item.line_total = (item.unit_price * Decimal(item.qty or 1)).quantize(CENTS)
+        item.updated = at
+        items.append(item)
+
+        totals[item.cart_id][0] += item.line_total
+        if item.pricing_tax_rate and not item.pricing_tax_included:
+            totals[item.cart_id][1] += (item.line_total * item.pricing_tax_rate / 100).quantize(CENTS)
+
+    for pk, cart in carts.items():
+        subtotal, tax = totals[pk]
+        cart.subtotal = subtotal
+        cart.tax_total = tax
+        cart.total = max(subtotal - (cart.discount_total or 0) + tax, Decimal(0))
+        cart.updated = at
+
+    with transaction.atomic():
+        CartItem.objects.bulk_update(items, ["unit_price", "currency_code", "line_total", "updated"], batch_size=500)
+        Cart.objects.bulk_update(list(carts.values()), ["subtotal", "tax_total", "total", "updated"], batch_size=500)
+    return len(items)
+
+
+def recalculate_cart(cart, at=None):
+    recalculate_carts([cart], at=at)
+    return cart
@@ -1,3 +1,6 @@
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
 from core.utils.BulkModelViewSet import BaseModelViewSet
 from billing.models import (
     Cart,
@@ -32,6 +35,7 @@ from billing.filters import (
     InvoiceFilter,
     RefundFilter,
 )
+from billing.services.cart import recalculate_cart
 
 
 class CartViewSet(BaseModelViewSet):
@@ -41,6 +45,14 @@ class CartViewSet(BaseModelViewSet):
     search_fields = ["currency_code", "status"]
     ordering_fields = "__all__"
 
+    @action(detail=True, methods=["post"])
+    def recalculate(self, request, pk=None):
+        """
+        Re-prices every item at the course's current effective price and refreshes the totals.
+        """
+        cart = recalculate_cart(self.get_object())
+        return Response(self.get_serializer(cart).data)
+
 
 class CartItemViewSet(BaseModelViewSet):
     queryset = CartItem.objects.all()
@@ -5,6 +5,7 @@ from content.models import (
     Lesson,
     LessonResource,
     LessonInstructorNote,
+    CourseContentStats,
 )
 
 
@@ -51,3 +52,13 @@ class LessonInstructorNoteFilter(django_filters.FilterSet):
     class Meta:
         model = LessonInstructorNote
         fields = ["lesson"]
+
+
+class CourseContentStatsFilter(django_filters.FilterSet):
+    branch = django_filters.UUIDFilter(field_name="branch_id")
+    course = django_filters.UUIDFilter(field_name="course_id")
+    min_lessons = django_filters.NumberFilter(field_name="lesson_count", lookup_expr="gte")
+
+    class Meta:
+        model = CourseContentStats
+        fields = ["branch", "course", "min_lessons"]
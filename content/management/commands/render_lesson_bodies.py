@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from content.models import Lesson
+from content.services.rendering import RENDER_BATCH_SIZE, prune_rendered, render_pending
+
+
+class Command(BaseCommand):
+    help = "Render every lesson body without a stored rendering (after imports / renderer upgrades), over a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", help="Only lessons of this course id.")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU, 1 = in-process).")
+        parser.add_argument("--batch-size", type=int, default=RENDER_BATCH_SIZE)
+        parser.add_argument("--prune", action="store_true", help="Also drop renderings no lesson uses anymore.")
+
+    def handle(self, *args, **options):
+        queryset = Lesson.objects.all()
+        if options["course"]:
+            queryset = queryset.filter(course_id=options["course"])
+        rendered = render_pending(queryset, workers=options["workers"], batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} lesson bodies"))
+        if options["prune"]:
+            self.stdout.write(self.style.SUCCESS(f"Pruned {prune_rendered()} unused renderings"))
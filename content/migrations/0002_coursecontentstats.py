@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+        ('courses', '0004_coursecategory_path'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseContentStats',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='content_stats', serialize=False, to='courses.course')),
+                ('content_version', models.PositiveBigIntegerField(default=0)),
+                ('module_count', models.PositiveIntegerField(default=0)),
+                ('lesson_count', models.PositiveIntegerField(default=0)),
+                ('preview_count', models.PositiveIntegerField(default=0)),
+                ('total_duration_seconds', models.PositiveBigIntegerField(default=0)),
+                ('lessons_by_type', models.JSONField(blank=True, default=dict)),
+                ('duration_by_type', models.JSONField(blank=True, default=dict)),
+                ('preview_lesson_ids', models.JSONField(blank=True, default=list)),
+                ('modules', models.JSONField(blank=True, default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch')),
+            ],
+            options={
+                'db_table': 'course_content_stats',
+                'ordering': ['-computed_at'],
+            },
+        ),
+    ]
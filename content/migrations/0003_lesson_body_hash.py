@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-19 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0002_coursecontentstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedLessonBody',
+            fields=[
+                ('body_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('html', models.TextField(blank=True, default='')),
+                ('renderer_version', models.PositiveSmallIntegerField(default=1)),
+                ('rendered_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'rendered_lesson_bodies',
+            },
+        ),
+        migrations.AddField(
+            model_name='historicallesson',
+            name='body_hash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='body_hash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64),
+        ),
+    ]
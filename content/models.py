@@ -5,6 +5,7 @@ from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 from core.utils.coreModels import (
+    BranchScoped,
     StampedOwnedActive,
     BranchScopedStampedOwnedActive,
 )
@@ -162,6 +163,8 @@ class Lesson(BranchScopedStampedOwnedActive):
     )
     body = models.TextField(blank=True, null=True)       # html/markdown
     body_blocks = models.JSONField(default=list, blank=True)  # blocks json (if using)
+    # content address of (format, body, blocks), keys RenderedLessonBody; set on save
+    body_hash = models.CharField(max_length=64, blank=True, default="", editable=False, db_index=True)
 
     # ---------- VIDEO content ----------
     video_provider = models.CharField(
@@ -248,6 +251,17 @@ class Lesson(BranchScopedStampedOwnedActive):
         # keep branch consistent with course branch
         if self.course_id and self.branch_id is None:
             self.branch = self.course.branch
+        if self.prerequisite_lesson_id:
+            from content.services.prerequisites import validate_prerequisite
+
+            validate_prerequisite(self)
+
+        from content.services.markup import body_hash
+
+        self.body_hash = body_hash(self.content_format, self.body, self.body_blocks)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"content_format", "body", "body_blocks"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "body_hash"}
         super().save(*args, **kwargs)
 
     def publish(self):
@@ -261,6 +275,7 @@ class Lesson(BranchScopedStampedOwnedActive):
         Pure helper. Your API/service can use this for gating.
         enrolled_at: datetime when the student enrolled.
         completed_lesson_ids: set of lesson ids completed.
+        To gate a whole course use content.services.prerequisites (cached graph, no queries).
         """
         now = timezone.now()
         if self.release_type == ReleaseType.IMMEDIATE:
@@ -278,6 +293,27 @@ class Lesson(BranchScopedStampedOwnedActive):
         return True
 
 
+# ----------------------------- rendered bodies (content addressed) -----------------------------
+
+class RenderedLessonBody(models.Model):
+    """
+    Sanitized HTML of a lesson body, one row per Lesson.body_hash: identical bodies
+    (cloned courses, re-saves) share a row and are rendered once.
+    Written by content.services.rendering, never edited by hand.
+    """
+
+    body_hash = models.CharField(max_length=64, primary_key=True)
+    html = models.TextField(blank=True, default="")
+    renderer_version = models.PositiveSmallIntegerField(default=1)
+    rendered_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "rendered_lesson_bodies"
+
+    def __str__(self):
+        return f"Rendered({self.body_hash[:12]})"
+
+
 # ----------------------------- lesson resources/attachments -----------------------------
 
 class ResourceType(models.TextChoices):
@@ -340,3 +376,35 @@ class LessonInstructorNote(StampedOwnedActive):
 
     def __str__(self):
         return f"Note({self.lesson_id})"
+
+
+# ----------------------------- learner-facing aggregates -----------------------------
+
+class CourseContentStats(BranchScoped):
+    """
+    Per-course content aggregates, written by the publish pipeline (content.services.publish),
+    so learner-facing reads don't recount lessons. Counts cover active + published lessons
+    in active modules, same as the course tree.
+    """
+
+    course = models.OneToOneField("courses.Course", on_delete=models.CASCADE, primary_key=True, related_name="content_stats")
+    content_version = models.PositiveBigIntegerField(default=0)  # Course.content_version the stats were built from
+
+    module_count = models.PositiveIntegerField(default=0)
+    lesson_count = models.PositiveIntegerField(default=0)
+    preview_count = models.PositiveIntegerField(default=0)
+    total_duration_seconds = models.PositiveBigIntegerField(default=0)
+
+    lessons_by_type = models.JSONField(default=dict, blank=True)      # {lesson_type: count}
+    duration_by_type = models.JSONField(default=dict, blank=True)     # {lesson_type: seconds}
+    preview_lesson_ids = models.JSONField(default=list, blank=True)
+    modules = models.JSONField(default=list, blank=True)              # [{id, title, lesson_count, duration_seconds}]
+
+    computed_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        db_table = "course_content_stats"
+        ordering = ["-computed_at"]
+
+    def __str__(self):
+        return f"ContentStats({self.course_id})"
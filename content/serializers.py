@@ -1,10 +1,16 @@
+from rest_framework import serializers
+
 from core.utils.AdaptedBulkSerializer import BulkModelSerializer
 from content.models import (
     CourseModule,
     Lesson,
     LessonResource,
     LessonInstructorNote,
+    CourseContentStats,
 )
+from content.services.prerequisites import get_prerequisite_graph
+from courses.models import Course
+from content.services.rendering import get_body_html
 
 
 class CourseModuleSerializer(BulkModelSerializer):
@@ -14,10 +20,62 @@ class CourseModuleSerializer(BulkModelSerializer):
 
 
 class LessonSerializer(BulkModelSerializer):
+    # depth=2 makes FKs read-only: these are the writable sides of course / module / prerequisite_lesson
+    course_id = serializers.PrimaryKeyRelatedField(
+        source="course",
+        queryset=Course.objects.all(),
+        write_only=True,
+        required=False,
+    )
+    module_id = serializers.PrimaryKeyRelatedField(
+        source="module",
+        queryset=CourseModule.objects.all(),
+        write_only=True,
+        required=False,
+    )
+    prerequisite_lesson_id = serializers.PrimaryKeyRelatedField(
+        source="prerequisite_lesson",
+        queryset=Lesson.objects.all(),
+        write_only=True,
+        required=False,
+        allow_null=True,
+    )
+    body_html = serializers.SerializerMethodField()
+
     class Meta(BulkModelSerializer.Meta):
         model = Lesson
         fields = "__all__"
 
+    def get_body_html(self, obj):
+        # list pages pass {body_hash: html} for the whole page (one query), else one lookup
+        rendered = self.context.get("rendered_bodies")
+        if rendered is not None and obj.body_hash in rendered:
+            return rendered[obj.body_hash]
+        return get_body_html(obj)
+
+    def validate(self, attrs):
+        # same checks as Lesson.save() -> validate_prerequisite(), surfaced as a 400 on create and update
+        if self.instance is None:
+            missing = {name: "This field is required." for name, key in (("course_id", "course"), ("module_id", "module")) if attrs.get(key) is None}
+            if missing:
+                raise serializers.ValidationError(missing)
+        course = attrs.get("course")
+        course_id = course.pk if course is not None else getattr(self.instance, "course_id", None)
+        module = attrs.get("module")
+        if module is not None and module.course_id != course_id:
+            raise serializers.ValidationError({"module_id": "The module must belong to the lesson's course."})
+
+        prerequisite = attrs.get("prerequisite_lesson")
+        if prerequisite is None:
+            return attrs
+        if prerequisite.course_id != course_id:
+            raise serializers.ValidationError({"prerequisite_lesson_id": "The prerequisite must be a lesson of the same course."})
+        if self.instance is not None:
+            graph = get_prerequisite_graph(course_id)
+            if graph is not None and graph.would_cycle(self.instance.pk, prerequisite.pk):
+                raise serializers.ValidationError({"prerequisite_lesson_id": "This prerequisite would create a cycle."})
+        return attrs
+
 
 class LessonResourceSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
@@ -29,3 +87,44 @@ class LessonInstructorNoteSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
         model = LessonInstructorNote
         fields = "__all__"
+
+
+class CourseContentStatsSerializer(BulkModelSerializer):
+    class Meta(BulkModelSerializer.Meta):
+        model = CourseContentStats
+        fields = "__all__"
+
+
+# ----------------------------- query params (non-model) -----------------------------
+
+class CourseTreeQuerySerializer(serializers.Serializer):
+    course = serializers.UUIDField()
+
+
+class NextLessonsQuerySerializer(serializers.Serializer):
+    course = serializers.UUIDField()
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+# ----------------------------- action payloads (non-model) -----------------------------
+
+class ModuleReorderSerializer(serializers.Serializer):
+    course = serializers.UUIDField()
+    modules = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=1000)
+
+
+class LessonReorderSerializer(serializers.Serializer):
+    module = serializers.UUIDField()
+    lessons = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=5000)
+
+
+class MediaSignSerializer(serializers.Serializer):
+    # either every asset of a course, or explicit ids
+    course = serializers.UUIDField(required=False)
+    lessons = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=1000)
+    resources = serializers.ListField(child=serializers.UUIDField(), required=False, max_length=1000)
+
+    def validate(self, attrs):
+        if not (attrs.get("course") or attrs.get("lessons") or attrs.get("resources")):
+            raise serializers.ValidationError("Pass a course or lesson / resource ids.")
+        return attrs
@@ -0,0 +1,118 @@
+# content/services/archive.py
+import logging
+import os
+import zipfile
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from content.models import LessonResource
+from enrollments.services.entitlements import filter_entitled
+
+logger = logging.getLogger(__name__)
+
+
+ARCHIVE_CHUNK_SIZE = getattr(settings, "CONTENT_ARCHIVE_CHUNK_SIZE", 64 * 1024)
+# already-compressed media gains nothing from deflate, it only costs CPU
+STORED_EXTENSIONS = {".zip", ".gz", ".7z", ".rar", ".mp4", ".m4a", ".mp3", ".mov", ".webm", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".pdf", ".docx", ".xlsx", ".pptx"}
+
+
+class _Sink:
+    """
+    Write-only, unseekable file object for ZipFile: collects the bytes written since the
+    last drain(). ZipFile then uses data descriptors, so nothing is ever rewound.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.offset = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        # list of 0 or 1 pieces, for `yield from`
+        data = b"".join(self.parts)
+        self.parts = []
+        return [data] if data else []
+
+
+def stream_zip(entries, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    entries: (arcname, storage name, modified datetime or None).
+    Yields the archive in pieces while the files are read chunk by chunk, so memory stays
+    at about one chunk whatever the file sizes (zip64 is always on). Files missing from
+    storage are skipped.
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for arcname, name, modified in entries:
+            try:
+                source = default_storage.open(name, "rb")
+            except (FileNotFoundError, OSError):
+                logger.warning("archive: %s is missing from storage, skipped", name)
+                continue
+            info = zipfile.ZipInfo(arcname, date_time=timezone.localtime(modified or timezone.now()).timetuple()[:6])
+            stored = os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS
+            info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            with source, archive.open(info, mode="w", force_zip64=True) as target:
+                for chunk in iter(lambda: source.read(chunk_size), b""):
+                    target.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def _safe_name(name, fallback):
+    try:
+        return get_valid_filename(name)
+    except SuspiciousFileOperation:
+        return fallback
+
+
+def _unique(name, taken):
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while name.lower() in taken:
+        n += 1
+        name = f"{stem} ({n}){ext}"
+    taken.add(name.lower())
+    return name
+
+
+def module_resource_entries(module_id, user):
+    """
+    Downloadable, locally stored resources of a module's active lessons, as stream_zip()
+    entries: one folder per lesson, in course order. Learners only get the lessons they
+    may open (published, or unpublished with the override), as in the lesson list.
+    """
+    resources = LessonResource.objects.filter(
+        lesson__module_id=module_id, lesson__active=True, active=True, is_downloadable=True,
+    )
+    rows = (
+        filter_entitled(resources, user, "lesson__course_id", lesson="lesson__")
+        .exclude(storage_key__isnull=True).exclude(storage_key="")
+        .order_by("lesson__sort_order", "lesson__created", "sort_order", "created")
+        .values_list("lesson_id", "lesson__title", "title", "storage_key", "original_name", "updated")
+    )
+    taken, folders = set(), {}
+    for lesson_id, lesson_title, title, storage_key, original_name, updated in rows:
+        if lesson_id not in folders:
+            folders[lesson_id] = _unique(_safe_name(f"{len(folders) + 1:02d} {lesson_title}", "lesson"), taken)
+        folder = folders[lesson_id]
+        filename = original_name or os.path.basename(storage_key) or title
+        ext = os.path.splitext(storage_key)[1]
+        if not os.path.splitext(filename)[1] and ext:
+            filename += ext
+        yield _unique(f"{folder}/{_safe_name(filename, 'file')}", taken), storage_key, updated
@@ -0,0 +1,334 @@
+# content/services/markup.py
+"""
+Lesson body -> sanitized HTML, standard library only.
+
+No Django imports on purpose: `render_body` runs inside ProcessPoolExecutor workers.
+
+- html      sanitized against an allowlist
+- markdown  a pragmatic subset (headings, paragraphs, lists, quotes, fenced code, hr,
+            emphasis, inline code, links, images); raw HTML in markdown is escaped
+- blocks    Editor.js style [{"type": ..., "data": {...}}]
+"""
+import hashlib
+import html
+import json
+import re
+from html.parser import HTMLParser
+
+# bump when the output of render_body changes: every lesson gets a new hash and is re-rendered
+RENDERER_VERSION = 1
+
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "caption", "code", "del", "div", "em", "figcaption", "figure",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "img", "input", "kbd", "li", "mark", "ol", "p", "pre",
+    "s", "small", "span", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "u", "ul",
+}
+VOID_TAGS = {"br", "hr", "img", "input"}
+DROP_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template", "noscript", "svg", "math"}
+ALLOWED_ATTRS = {
+    "*": {"class", "title"},
+    "a": {"href", "target", "rel"},
+    "img": {"src", "alt", "width", "height", "loading"},
+    "code": {"class"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "ol": {"start"},
+    "input": {"type", "checked", "disabled"},
+}
+URL_ATTRS = {"href", "src"}
+SAFE_SCHEMES = ("http:", "https:", "mailto:", "tel:")
+
+
+def _safe_url(value):
+    value = (value or "").strip()
+    compact = re.sub(r"[\x00-\x20]", "", value).lower()
+    if not compact or compact.startswith(("/", "#", "?", "./", "../")) or ":" not in compact.split("/", 1)[0]:
+        return value
+    return value if compact.startswith(SAFE_SCHEMES) else None
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRS.get(tag, set()) | ALLOWED_ATTRS["*"]
+        parts = [tag]
+        for name, value in attrs:
+            if name not in allowed:
+                continue
+            if tag == "input" and name == "type" and value != "checkbox":
+                return
+            if name in URL_ATTRS:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            parts.append(name if value is None else f'{name}="{html.escape(value, quote=True)}"')
+        if tag == "a" and any(p.startswith('target=') for p in parts):
+            parts = [p for p in parts if not p.startswith("rel=")] + ['rel="noopener noreferrer nofollow"']
+        self.out.append(f"<{' '.join(parts)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open and self.open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f"</{current}>")
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return "".join(self.out) + "".join(f"</{tag}>" for tag in reversed(self.open))
+
+
+def sanitize_html(value):
+    if not value:
+        return ""
+    parser = _Sanitizer()
+    parser.feed(value)
+    return parser.result()
+
+
+# ----------------------------- markdown (subset) -----------------------------
+
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)(?:\s+&quot;([^&]*)&quot;)?\)")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)(?:\s+&quot;([^&]*)&quot;)?\)")
+_STRONG = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_EM = re.compile(r"(?<![\w*])(\*|_)(?=\S)(.+?)(?<=\S)\1(?![\w*])")
+_STRIKE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+_AUTOLINK = re.compile(r"&lt;(https?://[^\s&]+)&gt;")
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_HR = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_UL_ITEM = re.compile(r"^\s{0,3}[-*+]\s+(.*)$")
+_OL_ITEM = re.compile(r"^\s{0,3}(\d{1,9})[.)]\s+(.*)$")
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)\s*([\w+-]*)\s*$")
+_QUOTE = re.compile(r"^\s{0,3}>\s?(.*)$")
+
+
+def render_inline(text):
+    """
+    Escaped text with inline markdown applied. Code spans are shielded from the other rules.
+    """
+    codes = []
+
+    def stash(match):
+        codes.append(f"<code>{match.group(1)}</code>")
+        return f"\x00{len(codes) - 1}\x00"
+
+    text = html.escape(text, quote=True)
+    text = _CODE_SPAN.sub(stash, text)
+    text = _IMAGE.sub(lambda m: f'<img src="{m.group(2)}" alt="{m.group(1)}"' + (f' title="{m.group(3)}"' if m.group(3) else "") + ">", text)
+    text = _LINK.sub(lambda m: f'<a href="{m.group(2)}"' + (f' title="{m.group(3)}"' if m.group(3) else "") + f">{m.group(1)}</a>", text)
+    text = _AUTOLINK.sub(r'<a href="\1">\1</a>', text)
+    text = _STRONG.sub(r"<strong>\2</strong>", text)
+    text = _EM.sub(r"<em>\2</em>", text)
+    text = _STRIKE.sub(r"<del>\1</del>", text)
+    text = text.replace("  \n", "<br>\n")
+    return re.sub(r"\x00(\d+)\x00", lambda m: codes[int(m.group(1))], text)
+
+
+def render_markdown(text):
+    lines = (text or "").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    out = []
+    paragraph = []
+    i = 0
+
+    def flush():
+        if paragraph:
+            out.append(f"<p>{render_inline(chr(10).join(paragraph))}</p>")
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+
+        fence = _FENCE.match(line)
+        if fence:
+            flush()
+            marker, language = fence.groups()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            css = f' class="language-{language}"' if language else ""
+            out.append(f"<pre><code{css}>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+            i += 1
+            continue
+
+        if not line.strip():
+            flush()
+            i += 1
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            i += 1
+            continue
+
+        if _HR.match(line):
+            flush()
+            out.append("<hr>")
+            i += 1
+            continue
+
+        if _QUOTE.match(line):
+            flush()
+            quoted = []
+            while i < len(lines) and _QUOTE.match(lines[i]):
+                quoted.append(_QUOTE.match(lines[i]).group(1))
+                i += 1
+            out.append(f"<blockquote>{render_markdown(chr(10).join(quoted))}</blockquote>")
+            continue
+
+        for pattern, tag in ((_UL_ITEM, "ul"), (_OL_ITEM, "ol")):
+            if pattern.match(line):
+                flush()
+                items = []
+                start = None
+                while i < len(lines) and pattern.match(lines[i]):
+                    match = pattern.match(lines[i])
+                    if tag == "ol" and start is None:
+                        start = int(match.group(1))
+                    items.append(match.group(match.lastindex))
+                    i += 1
+                attrs = f' start="{start}"' if start not in (None, 1) else ""
+                out.append(f"<{tag}{attrs}>" + "".join(f"<li>{render_inline(item)}</li>" for item in items) + f"</{tag}>")
+                break
+        else:
+            paragraph.append(line.strip())
+            i += 1
+
+    flush()
+    return "\n".join(out)
+
+
+# ----------------------------- blocks -----------------------------
+
+def _list_items(items, ordered):
+    tag = "ol" if ordered else "ul"
+    rendered = []
+    for item in items or ():
+        if isinstance(item, dict):
+            text = item.get("content") or item.get("text") or ""
+            nested = _list_items(item.get("items"), ordered) if item.get("items") else ""
+        else:
+            text, nested = str(item), ""
+        rendered.append(f"<li>{sanitize_html(text)}{nested}</li>")
+    return f"<{tag}>{''.join(rendered)}</{tag}>" if rendered else ""
+
+
+def _block(block):
+    kind = block.get("type")
+    data = block.get("data") or {}
+    if kind == "paragraph":
+        return f"<p>{sanitize_html(data.get('text', ''))}</p>"
+    if kind in ("header", "heading"):
+        level = min(max(int(data.get("level") or 2), 1), 6)
+        return f"<h{level}>{sanitize_html(data.get('text', ''))}</h{level}>"
+    if kind == "list":
+        return _list_items(data.get("items"), data.get("style") == "ordered")
+    if kind == "checklist":
+        items = "".join(
+            f'<li><input type="checkbox" disabled{" checked" if item.get("checked") else ""}> {sanitize_html(item.get("text", ""))}</li>'
+            for item in data.get("items") or () if isinstance(item, dict)
+        )
+        return f'<ul class="checklist">{items}</ul>'
+    if kind == "quote":
+        caption = f"<figcaption>{sanitize_html(data['caption'])}</figcaption>" if data.get("caption") else ""
+        return f"<figure><blockquote>{sanitize_html(data.get('text', ''))}</blockquote>{caption}</figure>"
+    if kind == "code":
+        return f"<pre><code>{html.escape(data.get('code', ''), quote=False)}</code></pre>"
+    if kind == "delimiter":
+        return "<hr>"
+    if kind == "image":
+        url = (data.get("file") or {}).get("url") or data.get("url")
+        if not url:
+            return ""
+        caption = data.get("caption") or ""
+        img = f'<img src="{html.escape(url, quote=True)}" alt="{html.escape(re.sub("<[^>]+>", "", caption), quote=True)}" loading="lazy">'
+        return f"<figure>{img}" + (f"<figcaption>{sanitize_html(caption)}</figcaption>" if caption else "") + "</figure>"
+    if kind == "table":
+        rows = data.get("content") or []
+        head = rows[:1] if data.get("withHeadings") else []
+        body = rows[1:] if head else rows
+        thead = "".join(f"<thead><tr>{''.join(f'<th>{sanitize_html(str(c))}</th>' for c in r)}</tr></thead>" for r in head)
+        tbody = "".join(f"<tr>{''.join(f'<td>{sanitize_html(str(c))}</td>' for c in r)}</tr>" for r in body)
+        return f"<table>{thead}<tbody>{tbody}</tbody></table>"
+    if kind == "warning":
+        return f'<div class="callout warning"><strong>{sanitize_html(data.get("title", ""))}</strong> {sanitize_html(data.get("message", ""))}</div>'
+    if kind == "embed":
+        url = data.get("source") or data.get("embed")
+        return f'<p><a href="{html.escape(url, quote=True)}" target="_blank">{html.escape(data.get("caption") or url)}</a></p>' if url else ""
+    if kind in ("raw", "html"):
+        return data.get("html", "")
+    if kind == "markdown":
+        return render_markdown(data.get("text", ""))
+    return ""
+
+
+def render_blocks(blocks):
+    if not isinstance(blocks, list):
+        return ""
+    return "\n".join(part for part in (_block(b) for b in blocks if isinstance(b, dict)) if part)
+
+
+# ----------------------------- entry points -----------------------------
+
+def body_hash(content_format, body, blocks):
+    """
+    Content address of a lesson body: same input (and renderer version) -> same rendered row.
+    """
+    payload = json.dumps(
+        [RENDERER_VERSION, content_format or "", body or "", blocks or []],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_body(content_format, body, blocks):
+    """
+    -> sanitized HTML. Everything passes through the sanitizer last, whatever the format.
+    """
+    if content_format == "blocks":
+        rendered = render_blocks(blocks) or render_markdown(body or "")
+    elif content_format == "markdown":
+        rendered = render_markdown(body or "")
+    else:
+        rendered = body or ""
+    return sanitize_html(rendered)
+
+
+def render_job(job):
+    """
+    (hash, format, body, blocks) -> (hash, html); picklable entry point for worker processes.
+    """
+    digest, content_format, body, blocks = job
+    return digest, render_body(content_format, body, blocks)
@@ -0,0 +1,168 @@
+# content/services/media.py
+import base64
+import hashlib
+import hmac
+import math
+import time
+from collections import namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from settings.models import OrganizationSettings
+
+
+MEDIA_SIGNING_KEY = getattr(settings, "MEDIA_SIGNING_KEY", settings.SECRET_KEY)
+# base for storage keys (video_asset_key / storage_key) that are not full URLs yet
+MEDIA_STORAGE_URL = getattr(settings, "MEDIA_STORAGE_URL", "/" + settings.MEDIA_URL.lstrip("/"))
+MEDIA_URL_TTL = getattr(settings, "MEDIA_SIGNED_URL_TTL", 60 * 60)
+# expiries are rounded up to this step: every request inside a step gets the same URL,
+# so the signature can be cached and the browser/CDN cache keeps working
+MEDIA_URL_BUCKET = getattr(settings, "MEDIA_SIGNED_URL_BUCKET", 5 * 60)
+# a cached signature is dropped this long before it expires
+MEDIA_URL_MARGIN = getattr(settings, "MEDIA_SIGNED_URL_MARGIN", 60)
+MEDIA_PROTECTION_CACHE_TIMEOUT = getattr(settings, "MEDIA_PROTECTION_CACHE_TIMEOUT", 5 * 60)
+
+SIGNED_PARAMS = ("exp", "uid", "sig")
+
+SignedUrl = namedtuple("SignedUrl", ["url", "expires"])
+
+
+# ----------------------------- policy -----------------------------
+
+def media_protection(branch_id):
+    """
+    OrganizationSettings.media_protection of the branch's organization, cached per branch.
+    {} when the branch has no organization settings.
+    """
+    key = f"content:media-protection:{branch_id}"
+    policy = cache.get(key)
+    if policy is None:
+        policy = (
+            OrganizationSettings.objects.filter(organization__branches=branch_id)
+            .values_list("media_protection", flat=True)
+            .first()
+        ) or {}
+        cache.set(key, policy, MEDIA_PROTECTION_CACHE_TIMEOUT)
+    return policy
+
+
+# ----------------------------- signing -----------------------------
+
+def _signed_part(url):
+    # host is left out: the verifier usually only sees the request path (X-Original-URI)
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def _signature(url, user_id, expires):
+    message = f"{_signed_part(url)}|{user_id or ''}|{expires}".encode("utf-8")
+    digest = hmac.new(MEDIA_SIGNING_KEY.encode("utf-8"), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:18]).decode("ascii")
+
+
+def bucketed_expiry(ttl=None, now=None):
+    now = time.time() if now is None else now
+    bucket = max(MEDIA_URL_BUCKET, 1)
+    return int(math.ceil((now + (ttl or MEDIA_URL_TTL)) / bucket) * bucket)
+
+
+def sign_urls(urls, user_id=None, ttl=None):
+    """
+    Bulk signing: {url: SignedUrl}. Signatures are cached until shortly before they expire,
+    so a course page listing a hundred assets costs one get_many on a warm cache.
+    """
+    urls = [url for url in dict.fromkeys(urls) if url]
+    if not urls:
+        return {}
+    now = time.time()
+    expires = bucketed_expiry(ttl, now)
+    keys = {
+        url: "content:media-sig:" + hashlib.sha1(f"{url}|{user_id or ''}|{expires}".encode("utf-8")).hexdigest()
+        for url in urls
+    }
+    cached = cache.get_many(keys.values())
+
+    signed, fresh = {}, {}
+    for url, key in keys.items():
+        sig = cached.get(key)
+        if sig is None:
+            sig = fresh[key] = _signature(url, user_id, expires)
+        query = urlencode({"exp": expires, "uid": user_id or "", "sig": sig})
+        signed[url] = SignedUrl(f"{url}{'&' if '?' in url else '?'}{query}", expires)
+    timeout = int(expires - now - MEDIA_URL_MARGIN)
+    if fresh and timeout > 0:
+        cache.set_many(fresh, timeout)
+    return signed
+
+
+def verify_signed_url(url, now=None):
+    """
+    Checks a signed URL (full URL or path + query) with no database access.
+    Returns (ok, reason, user_id).
+    """
+    base, sep, tail = url.rpartition("exp=")
+    if not sep or not base or base[-1] not in "?&":
+        return False, "missing signature", None
+    params = dict(parse_qsl(sep + tail, keep_blank_values=True))
+    if set(params) != set(SIGNED_PARAMS):
+        return False, "missing signature", None
+    try:
+        expires = int(params["exp"])
+    except ValueError:
+        return False, "bad expiry", None
+    if expires < (time.time() if now is None else now):
+        return False, "expired", None
+    if not constant_time_compare(params["sig"], _signature(base[:-1], params["uid"], expires)):
+        return False, "bad signature", None
+    return True, "ok", params["uid"] or None
+
+
+# ----------------------------- assets -----------------------------
+
+def storage_url(key):
+    if not key:
+        return None
+    if "://" in key or key.startswith("/"):
+        return key
+    return f"{MEDIA_STORAGE_URL.rstrip('/')}/{key}"
+
+
+def lesson_media_url(lesson):
+    return lesson.video_url or storage_url(lesson.video_asset_key)
+
+
+def resource_media_url(resource):
+    # link_url / embed_code point at third parties and are never signed
+    return resource.file_url or storage_url(resource.storage_key)
+
+
+def _sign_for_branch(urls, user_id, branch_id):
+    policy = media_protection(branch_id) if branch_id else {}
+    if policy.get("signed_urls", True) is False:
+        return {url: SignedUrl(url, None) for url in urls if url}
+    return sign_urls(urls, user_id, policy.get("ttl_seconds"))
+
+
+def signed_media(lessons=(), resources=(), user_id=None):
+    """
+    ({lesson id: SignedUrl}, {resource id: SignedUrl}), following the media_protection policy
+    of each asset's branch: {"signed_urls": false} hands out the plain URLs, {"ttl_seconds": n}
+    overrides the default lifetime. Resources should come with select_related("lesson").
+    """
+    assets = [("lesson", lesson.pk, lesson.branch_id, lesson_media_url(lesson)) for lesson in lessons]
+    assets += [("resource", resource.pk, resource.lesson.branch_id, resource_media_url(resource)) for resource in resources]
+
+    by_branch = {}
+    for _, _, branch_id, url in assets:
+        if url:
+            by_branch.setdefault(branch_id, []).append(url)
+    signed = {branch_id: _sign_for_branch(urls, user_id, branch_id) for branch_id, urls in by_branch.items()}
+
+    found = {"lesson": {}, "resource": {}}
+    for kind, pk, branch_id, url in assets:
+        if url:
+            found[kind][str(pk)] = signed[branch_id][url]
+    return found["lesson"], found["resource"]
@@ -0,0 +1,157 @@
+# content/services/ordering.py
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from content.models import CourseModule, Lesson
+from content.services.tree import bump_content_version
+
+
+# distance between neighbours after a rebalance: ~10 moves into the same slot before the next one
+SORT_GAP = getattr(settings, "CONTENT_SORT_GAP", 1024)
+
+
+class ReorderError(ValueError):
+    pass
+
+
+def _stable_positions(keys):
+    """
+    Positions of a longest strictly increasing run of `keys` (patience sorting, O(n log n)):
+    the rows that already sit in the right relative order and keep their key.
+    """
+    tails, tail_pos, prev = [], [], [-1] * len(keys)
+    for i, key in enumerate(keys):
+        j = bisect_left(tails, key)
+        if j == len(tails):
+            tails.append(key)
+            tail_pos.append(i)
+        else:
+            tails[j] = key
+            tail_pos[j] = i
+        prev[i] = tail_pos[j - 1] if j else -1
+
+    keep = set()
+    i = tail_pos[-1] if tail_pos else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+def plan_order(current, desired, gap=SORT_GAP):
+    """
+    current: {id: sort_order}, desired: ids in the new order.
+    Returns ({id: new sort_order} for the rows that change, rebalanced).
+
+    Rows on the longest already-ordered run keep their keys; every other row gets a key
+    between its new neighbours, so a single drag usually rewrites one row. When a gap
+    is exhausted the whole list is renumbered gap, 2*gap, ...
+    """
+    keys = [current.get(pk) for pk in desired]
+    keep = _stable_positions([k for k in keys if k is not None])
+    # _stable_positions numbers only rows that have a key, map back to positions in `desired`
+    keyed = [i for i, k in enumerate(keys) if k is not None]
+    keep = {keyed[i] for i in keep}
+
+    planned = {}
+    i = 0
+    lower = 0
+    while i < len(desired):
+        if i in keep:
+            lower = keys[i]
+            i += 1
+            continue
+        j = i
+        while j < len(desired) and j not in keep:
+            j += 1
+        run = j - i
+        upper = keys[j] if j < len(desired) else lower + gap * (run + 1)
+        step = (upper - lower) // (run + 1)
+        if step < 1:
+            return _rebalance(current, desired, gap), True
+        for n, pos in enumerate(range(i, j), start=1):
+            planned[desired[pos]] = lower + step * n
+        lower = planned[desired[j - 1]]
+        i = j
+
+    return {pk: key for pk, key in planned.items() if current.get(pk) != key}, False
+
+
+def _rebalance(current, desired, gap):
+    return {
+        pk: key for pk, key in ((pk, gap * (n + 1)) for n, pk in enumerate(desired))
+        if current.get(pk) != key
+    }
+
+
+def _check_complete(desired, existing, label):
+    if len(set(desired)) != len(desired):
+        raise ReorderError(f"Duplicate {label} ids.")
+    missing = set(existing) - set(desired)
+    if missing:
+        raise ReorderError(f"The new order must list every {label} ({len(missing)} missing).")
+
+
+def reorder_modules(course_id, module_ids, gap=SORT_GAP):
+    """
+    New module order for a course. Returns (rows written, rebalanced).
+    """
+    with transaction.atomic():
+        current = dict(
+            CourseModule.objects.select_for_update()
+            .filter(course_id=course_id)
+            .order_by("sort_order", "created")
+            .values_list("id", "sort_order")
+        )
+        unknown = set(module_ids) - set(current)
+        if unknown:
+            raise ReorderError(f"{len(unknown)} modules do not belong to this course.")
+        _check_complete(module_ids, current, "module")
+
+        planned, rebalanced = plan_order(current, module_ids, gap)
+        now = timezone.now()
+        rows = [CourseModule(pk=pk, sort_order=key, updated=now) for pk, key in planned.items()]
+        CourseModule.objects.bulk_update(rows, ["sort_order", "updated"], batch_size=500)
+        if rows:
+            bump_content_version([course_id])
+    return len(rows), rebalanced
+
+
+def reorder_lessons(module_id, lesson_ids, gap=SORT_GAP):
+    """
+    New lesson order for a module. Lessons of other modules of the same course may be listed:
+    they move into this module. Returns (rows written, rebalanced).
+    """
+    with transaction.atomic():
+        course_id = CourseModule.objects.filter(pk=module_id).values_list("course_id", flat=True).first()
+        if course_id is None:
+            raise ReorderError("Unknown module.")
+
+        # served by the (course, module, sort_order) index
+        rows = (
+            Lesson.objects.select_for_update()
+            .filter(Q(module_id=module_id) | Q(pk__in=lesson_ids), course_id=course_id)
+            .values_list("id", "module_id", "sort_order")
+        )
+        current, moved_in = {}, set()
+        for pk, lesson_module_id, sort_order in rows:
+            if lesson_module_id == module_id:
+                current[pk] = sort_order
+            else:
+                moved_in.add(pk)
+        unknown = set(lesson_ids) - set(current) - moved_in
+        if unknown:
+            raise ReorderError(f"{len(unknown)} lessons do not belong to this course.")
+        _check_complete(lesson_ids, current, "lesson")
+
+        planned, rebalanced = plan_order(current, lesson_ids, gap)
+        now = timezone.now()
+        changed = [Lesson(pk=pk, module_id=module_id, sort_order=key, updated=now) for pk, key in planned.items()]
+        Lesson.objects.bulk_update(changed, ["module", "sort_order", "updated"], batch_size=500)
+        if changed:
+            bump_content_version([course_id])
+    return len(changed), rebalanced
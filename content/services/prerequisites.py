@@ -0,0 +1,252 @@
+# content/services/prerequisites.py
+from collections import deque
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+from content.models import Lesson, LessonStatus, ReleaseType
+from content.services.tree import TREE_CACHE_TIMEOUT, get_content_version
+from enrollments.models import Enrollment
+from enrollments.services.entitlements import is_learner
+from progress.models import LessonProgress, LessonProgressStatus
+
+
+class PrerequisiteGraph:
+    """
+    Lesson -> prerequisite_lesson edges of one course, built once per content version.
+    Every lesson has at most one prerequisite, so the graph is a forest: topological order
+    is a BFS from the roots, and a gate check is a dict lookup. Ids are strings.
+    Lessons caught in a (legacy) cycle are never released and listed in `cyclic`.
+    """
+
+    def __init__(self, rows):
+        # rows: (id, prerequisite_id, release_type, release_at, release_after_days, published+active), in course order
+        self.parent = {}
+        self.children = {}
+        self.release = {}
+        self.visible = set()
+        for pk, prereq_id, release_type, release_at, release_after_days, visible in rows:
+            pk = str(pk)
+            self.parent[pk] = str(prereq_id) if prereq_id else None
+            self.release[pk] = (release_type, release_at, release_after_days)
+            if visible:
+                self.visible.add(pk)
+        for pk, prereq_id in self.parent.items():
+            self.children.setdefault(prereq_id, []).append(pk)
+
+        # prerequisites outside the course count as roots
+        roots = [pk for pk, prereq_id in self.parent.items() if prereq_id is None or prereq_id not in self.parent]
+        self.order = []
+        queue = deque(roots)
+        while queue:
+            pk = queue.popleft()
+            self.order.append(pk)
+            queue.extend(self.children.get(pk, ()))
+        self.position = {pk: i for i, pk in enumerate(self.order)}
+        self.cyclic = set(self.parent) - set(self.position)
+
+    # ----------------------------- structure -----------------------------
+
+    def ancestors(self, lesson_id):
+        """
+        Prerequisite chain of a lesson, nearest first (stops on a cycle).
+        """
+        chain, seen = [], {lesson_id}
+        pk = self.parent.get(lesson_id)
+        while pk is not None and pk not in seen and pk in self.parent:
+            chain.append(pk)
+            seen.add(pk)
+            pk = self.parent.get(pk)
+        return chain
+
+    def would_cycle(self, lesson_id, prerequisite_id):
+        lesson_id, prerequisite_id = str(lesson_id), str(prerequisite_id)
+        return prerequisite_id == lesson_id or lesson_id in self.ancestors(prerequisite_id)
+
+    def dependents(self, lesson_id, transitive=False):
+        """
+        Lessons waiting on `lesson_id` (direct, or the whole subtree in topological order).
+        """
+        lesson_id = str(lesson_id)
+        if not transitive:
+            return list(self.children.get(lesson_id, ()))
+        found, queue = [], deque(self.children.get(lesson_id, ()))
+        while queue:
+            pk = queue.popleft()
+            found.append(pk)
+            queue.extend(self.children.get(pk, ()))
+        return found
+
+    # ----------------------------- gating -----------------------------
+
+    def is_released(self, lesson_id, enrolled_at=None, completed=frozenset(), now=None):
+        """
+        Same rules as Lesson.is_released_for(), without touching the database.
+        completed: set of completed lesson ids (strings).
+        """
+        lesson_id = str(lesson_id)
+        if lesson_id in self.cyclic or lesson_id not in self.release:
+            return False
+        release_type, release_at, release_after_days = self.release[lesson_id]
+        now = now or timezone.now()
+        if release_type == ReleaseType.ON_DATE:
+            return release_at is None or release_at <= now
+        if release_type == ReleaseType.AFTER_ENROLL_DAYS:
+            if not enrolled_at or release_after_days is None:
+                return False
+            return enrolled_at + timezone.timedelta(days=release_after_days) <= now
+        if release_type == ReleaseType.AFTER_LESSON_COMPLETE:
+            prereq_id = self.parent[lesson_id]
+            return prereq_id is None or prereq_id in completed
+        return True
+
+    def next_lessons(self, completed=frozenset(), enrolled_at=None, limit=None):
+        """
+        Visible lessons the learner can open now and has not completed, in dependency order.
+        """
+        now = timezone.now()
+        found = []
+        for pk in self.order:
+            if pk in self.visible and pk not in completed and self.is_released(pk, enrolled_at, completed, now):
+                found.append(pk)
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    def unlocked_by(self, lesson_id, completed=frozenset(), enrolled_at=None):
+        """
+        Lessons that completing `lesson_id` would release right now.
+        """
+        after = set(completed) | {str(lesson_id)}
+        now = timezone.now()
+        return [
+            pk for pk in self.dependents(lesson_id)
+            if pk in self.visible
+            and not self.is_released(pk, enrolled_at, completed, now)
+            and self.is_released(pk, enrolled_at, after, now)
+        ]
+
+
+# ----------------------------- build + cache -----------------------------
+
+def prerequisite_cache_key(course_id, version):
+    return f"content:prereq:{course_id}:{version}"
+
+
+def build_prerequisite_graph(course_id):
+    rows = (
+        Lesson.objects.filter(course_id=course_id)
+        .order_by("module__sort_order", "sort_order", "created")
+        .values_list("id", "prerequisite_lesson_id", "release_type", "release_at", "release_after_days", "status", "active", "module__active")
+    )
+    return PrerequisiteGraph(
+        (pk, prereq_id, release_type, release_at, after_days, status == LessonStatus.PUBLISHED and active and module_active)
+        for pk, prereq_id, release_type, release_at, after_days, status, active, module_active in rows
+    )
+
+
+def get_prerequisite_graph(course_id):
+    """
+    Cached under the course content_version: any lesson save bumps it, so the graph is
+    never older than the lessons it describes.
+    """
+    version = get_content_version(course_id)
+    if version is None:
+        return None
+    key = prerequisite_cache_key(course_id, version)
+    graph = cache.get(key)
+    if graph is None:
+        graph = build_prerequisite_graph(course_id)
+        cache.set(key, graph, TREE_CACHE_TIMEOUT)
+    return graph
+
+
+def validate_prerequisite(lesson):
+    """
+    Write-time check for Lesson.prerequisite_lesson: same course, no cycle.
+    """
+    if not lesson.prerequisite_lesson_id:
+        return
+    graph = get_prerequisite_graph(lesson.course_id)
+    prereq_id = str(lesson.prerequisite_lesson_id)
+    if graph is None or prereq_id not in graph.parent:
+        raise ValidationError({"prerequisite_lesson": "The prerequisite must be a lesson of the same course."})
+    if graph.would_cycle(lesson.pk, prereq_id):
+        raise ValidationError({"prerequisite_lesson": "This prerequisite would create a cycle."})
+
+
+def learner_states(user, course_ids):
+    """
+    learner_state() for several courses in two queries:
+    ({course id: completed lesson ids}, {course id: enrolled_at}), keys and ids as strings.
+    """
+    completed = {}
+    for course_id, lesson_id in LessonProgress.objects.filter(
+        user=user, course_id__in=course_ids, status=LessonProgressStatus.COMPLETED,
+    ).values_list("course_id", "lesson_id"):
+        completed.setdefault(str(course_id), set()).add(str(lesson_id))
+    enrolled_at = {}
+    for course_id, enrolled in (
+        Enrollment.objects.filter(user=user, course_id__in=course_ids)
+        .order_by("course_id", "-enrolled_at")
+        .values_list("course_id", "enrolled_at")
+    ):
+        enrolled_at.setdefault(str(course_id), enrolled)  # latest enrollment first
+    return completed, enrolled_at
+
+
+def learner_state(user, course_id):
+    """
+    (completed lesson ids as strings, enrolled_at of the latest enrollment) for gating: two queries.
+    """
+    completed, enrolled_at = learner_states(user, [course_id])
+    return completed.get(str(course_id), set()), enrolled_at.get(str(course_id))
+
+
+def is_released_for_learner(user, lesson):
+    """
+    Release gate of one lesson for a learner, answered by the cached graph: immediate
+    lessons cost nothing, the others the two learner_state() queries.
+    """
+    if lesson.release_type == ReleaseType.IMMEDIATE:
+        return True
+    graph = get_prerequisite_graph(lesson.course_id)
+    if graph is None:
+        return False
+    completed, enrolled_at = learner_state(user, lesson.course_id)
+    return graph.is_released(lesson.pk, enrolled_at, completed)
+
+
+def filter_released(queryset, user, lesson=""):
+    """
+    List scoping for learners: drops lessons (or rows of lessons, `lesson` being the lookup
+    prefix as in filter_entitled()) not released yet. Courses whose listed lessons are all
+    immediate cost one query; the others one graph lookup each plus two learner_states() queries.
+    Published previews are not gated.
+    """
+    if not is_learner(user):
+        return queryset
+    course_ids = set(
+        queryset.exclude(**{f"{lesson}release_type": ReleaseType.IMMEDIATE})
+        .order_by().values_list(f"{lesson}course_id", flat=True).distinct()
+    )
+    if not course_ids:
+        return queryset
+
+    completed, enrolled_at = learner_states(user, course_ids)
+    now = timezone.now()
+    blocked = []
+    for course_id in map(str, course_ids):
+        graph = get_prerequisite_graph(course_id)
+        if graph is None:
+            continue
+        done = completed.get(course_id, set())
+        blocked += [pk for pk in graph.release if not graph.is_released(pk, enrolled_at.get(course_id), done, now)]
+    if not blocked:
+        return queryset
+    return queryset.exclude(
+        Q(**{f"{lesson}id__in": blocked})
+        & ~Q(**{f"{lesson}is_preview": True, f"{lesson}status": LessonStatus.PUBLISHED})
+    )
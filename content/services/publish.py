@@ -0,0 +1,158 @@
+# content/services/publish.py
+import logging
+import threading
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from content.models import CourseContentStats, Lesson, LessonStatus
+from content.services.tree import (
+    TREE_CACHE_TIMEOUT,
+    build_course_tree,
+    bump_content_version,
+    content_changes,
+    get_content_version,
+    tree_cache_key,
+)
+from progress.models import CourseProgress, CourseProgressStatus
+
+logger = logging.getLogger(__name__)
+
+_stale = threading.local()
+
+
+def stats_from_tree(tree):
+    """
+    Aggregates straight off the (already built) course tree: no extra queries.
+    """
+    lessons_by_type, duration_by_type = Counter(), Counter()
+    modules = []
+    for module in tree["modules"]:
+        duration = 0
+        for lesson in module["lessons"]:
+            lessons_by_type[lesson["lesson_type"]] += 1
+            duration_by_type[lesson["lesson_type"]] += lesson["duration_seconds"] or 0
+            duration += lesson["duration_seconds"] or 0
+        modules.append({
+            "id": str(module["id"]),
+            "title": module["title"],
+            "lesson_count": len(module["lessons"]),
+            "duration_seconds": duration,
+        })
+
+    return {
+        "branch_id": tree["branch"],
+        "content_version": tree["version"],
+        "module_count": len(modules),
+        "lesson_count": tree["lesson_count"],
+        "preview_count": len(tree["preview_lessons"]),
+        "total_duration_seconds": sum(duration_by_type.values()),
+        "lessons_by_type": dict(lessons_by_type),
+        "duration_by_type": dict(duration_by_type),
+        "preview_lesson_ids": [str(pk) for pk in tree["preview_lessons"]],
+        "modules": modules,
+    }
+
+
+def sync_progress_totals(course_id, total_lessons):
+    """
+    One UPDATE for every learner of the course: new total_lessons and the percent that follows.
+    Completed records keep their 100%.
+    """
+    if total_lessons:
+        percent = Case(
+            When(status=CourseProgressStatus.COMPLETED, then=F("progress_percent")),
+            When(completed_lessons__gte=total_lessons, then=Value(100)),
+            default=F("completed_lessons") * 100 / total_lessons,
+            output_field=IntegerField(),
+        )
+    else:
+        percent = Case(
+            When(status=CourseProgressStatus.COMPLETED, then=F("progress_percent")),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return (
+        CourseProgress.objects.filter(course_id=course_id)
+        .exclude(total_lessons=total_lessons)
+        .update(total_lessons=total_lessons, progress_percent=percent, updated=timezone.now())
+    )
+
+
+def refresh_course_aggregates(course_id):
+    """
+    Stats row + learner totals from one tree build, in the caller's transaction.
+    The tree is put in the cache only once the transaction commits, so a rollback
+    can never leave a cached tree for a version that did not happen.
+    """
+    with transaction.atomic():
+        version = get_content_version(course_id)
+        if version is None:
+            return None
+        tree = build_course_tree(course_id, version)
+        stats, _ = CourseContentStats.objects.update_or_create(course_id=course_id, defaults=stats_from_tree(tree))
+        sync_progress_totals(course_id, tree["lesson_count"])
+        transaction.on_commit(lambda: cache.set(tree_cache_key(course_id, version), tree, TREE_CACHE_TIMEOUT))
+    return stats
+
+
+def _refresh_stale():
+    ids = getattr(_stale, "ids", None)
+    if not ids:
+        return  # an earlier callback of the same transaction already did the work
+    _stale.ids = set()
+    # only courses whose stats exist (published once) and were built from an older version
+    stale = (
+        CourseContentStats.objects.filter(course_id__in=ids)
+        .exclude(content_version=F("course__content_version"))
+        .values_list("course_id", flat=True)
+    )
+    for course_id in stale:
+        try:
+            refresh_course_aggregates(course_id)
+        except Exception as e:
+            # the content write already committed, the next publish catches up
+            logger.warning(f"aggregate refresh of course {course_id} failed: {e}")
+
+
+def mark_aggregates_stale(course_ids):
+    """
+    Called with every content version bump: unpublish / archive / delete of a lesson must
+    move the stats row and learner totals too. Refreshed once per course after commit.
+    """
+    course_ids = {pk for pk in course_ids if pk}
+    if not course_ids:
+        return
+    if getattr(_stale, "ids", None) is None:
+        _stale.ids = set()
+    _stale.ids.update(course_ids)
+    transaction.on_commit(_refresh_stale)
+
+
+def publish_course(course, publish_lessons=True):
+    """
+    Publishes the course (and its draft lessons, set-based), then refreshes the aggregates,
+    all in one transaction.
+    """
+    with transaction.atomic():
+        with content_changes():
+            course.publish()
+            if publish_lessons:
+                now = timezone.now()
+                published = (
+                    Lesson.objects.filter(course_id=course.pk, status=LessonStatus.DRAFT, active=True)
+                    .update(status=LessonStatus.PUBLISHED, published_at=Coalesce(F("published_at"), Value(now)), updated=now)
+                )
+                if published:
+                    bump_content_version([course.pk])
+        return refresh_course_aggregates(course.pk)
+
+
+def publish_lesson(lesson):
+    with transaction.atomic():
+        lesson.publish()
+        return refresh_course_aggregates(lesson.course_id)
@@ -0,0 +1,123 @@
+# content/services/rendering.py
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from content.models import Lesson, RenderedLessonBody
+from content.services.markup import RENDERER_VERSION, body_hash, render_body, render_job
+
+logger = logging.getLogger(__name__)
+
+
+RENDER_BATCH_SIZE = getattr(settings, "CONTENT_RENDER_BATCH_SIZE", 200)
+# below this many bodies the pool start-up costs more than it saves
+RENDER_POOL_MIN_JOBS = getattr(settings, "CONTENT_RENDER_POOL_MIN_JOBS", 50)
+
+
+def _store(results):
+    RenderedLessonBody.objects.bulk_create(
+        [RenderedLessonBody(body_hash=digest, html=html, renderer_version=RENDERER_VERSION) for digest, html in results],
+        batch_size=500,
+        ignore_conflicts=True,  # a concurrent render of the same hash wrote the same html
+    )
+
+
+def rendered_bodies(lessons):
+    """
+    {body_hash: html} for a page of lessons: one query, bodies missing from the side table
+    are rendered inline and stored (normally only right after an edit).
+    """
+    lessons = [lesson for lesson in lessons if lesson.body_hash]
+    found = dict(
+        RenderedLessonBody.objects.filter(body_hash__in={lesson.body_hash for lesson in lessons})
+        .values_list("body_hash", "html")
+    )
+    missing = {}
+    for lesson in lessons:
+        if lesson.body_hash not in found and lesson.body_hash not in missing:
+            missing[lesson.body_hash] = render_body(lesson.content_format, lesson.body, lesson.body_blocks)
+    if missing:
+        _store(missing.items())
+        found.update(missing)
+    return found
+
+
+def get_body_html(lesson):
+    return rendered_bodies([lesson]).get(lesson.body_hash, "")
+
+
+def _pending(queryset, batch_size):
+    """
+    Fills stale / empty Lesson.body_hash (bulk_update) and yields one render job per
+    distinct hash that has no rendered row yet.
+    """
+    stale = []
+    jobs = {}
+    rows = queryset.only("pk", "content_format", "body", "body_blocks", "body_hash").order_by()
+    for lesson in rows.iterator(chunk_size=batch_size):
+        digest = body_hash(lesson.content_format, lesson.body, lesson.body_blocks)
+        if digest != lesson.body_hash:
+            lesson.body_hash = digest
+            stale.append(lesson)
+        jobs.setdefault(digest, (digest, lesson.content_format, lesson.body, lesson.body_blocks))
+        if len(stale) >= batch_size:
+            Lesson.objects.bulk_update(stale, ["body_hash"], batch_size=batch_size)
+            stale = []
+    if stale:
+        Lesson.objects.bulk_update(stale, ["body_hash"], batch_size=batch_size)
+
+    done = set()
+    hashes = list(jobs)
+    for start in range(0, len(hashes), 1000):
+        chunk = hashes[start:start + 1000]
+        done.update(RenderedLessonBody.objects.filter(body_hash__in=chunk).values_list("body_hash", flat=True))
+    return [job for digest, job in jobs.items() if digest not in done]
+
+
+def render_pending(queryset=None, workers=None, batch_size=RENDER_BATCH_SIZE):
+    """
+    Bulk stage for imports / clones / renderer upgrades: every body without a rendered row is
+    rendered over a process pool (pure function, no DB in the workers) and stored in batches.
+    Returns the number of bodies rendered.
+    """
+    queryset = Lesson.objects.all() if queryset is None else queryset
+    jobs = _pending(queryset, batch_size)
+    if not jobs:
+        return 0
+
+    if workers == 1 or len(jobs) < RENDER_POOL_MIN_JOBS:
+        results = map(render_job, jobs)
+        pool = None
+    else:
+        connections.close_all()  # forked workers must not share the parent's DB sockets
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(render_job, jobs, chunksize=max(len(jobs) // ((workers or 4) * 4), 1))
+
+    rendered, batch = 0, []
+    try:
+        for result in results:
+            batch.append(result)
+            if len(batch) >= batch_size:
+                _store(batch)
+                rendered += len(batch)
+                batch = []
+        if batch:
+            _store(batch)
+            rendered += len(batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    logger.info("rendered %s lesson bodies", rendered)
+    return rendered
+
+
+def prune_rendered():
+    """
+    Drops rendered rows no lesson points at anymore (edited bodies, renderer upgrades).
+    """
+    deleted, _ = RenderedLessonBody.objects.exclude(
+        body_hash__in=Lesson.objects.exclude(body_hash="").values("body_hash")
+    ).delete()
+    return deleted
@@ -0,0 +1,139 @@
+# content/services/tree.py
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from content.models import CourseModule, Lesson, LessonResource, LessonStatus
+from courses.models import Course
+
+
+TREE_CACHE_TIMEOUT = getattr(settings, "CONTENT_TREE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+_batch = threading.local()
+
+
+# ----------------------------- version counter -----------------------------
+
+def bump_content_version(course_ids):
+    """
+    +1 on Course.content_version inside the caller's transaction, so readers never pair
+    a new version with old rows. Inside `content_changes()` the bump happens once at the end.
+    Stats and learner totals follow after commit.
+    """
+    course_ids = {pk for pk in course_ids if pk}
+    if not course_ids:
+        return
+    pending = getattr(_batch, "ids", None)
+    if pending is not None:
+        pending.update(course_ids)
+        return
+    Course.objects.filter(pk__in=course_ids).update(content_version=F("content_version") + 1)
+
+    from content.services.publish import mark_aggregates_stale
+    mark_aggregates_stale(course_ids)
+
+
+@contextmanager
+def content_changes():
+    """
+    For bulk writers (clone, reorder, imports): many saves, one version bump per course.
+    """
+    if getattr(_batch, "ids", None) is not None:
+        yield
+        return
+    _batch.ids = set()
+    try:
+        yield
+        ids = _batch.ids
+    finally:
+        _batch.ids = None
+    bump_content_version(ids)
+
+
+def get_content_version(course_id):
+    return Course.objects.filter(pk=course_id).values_list("content_version", flat=True).first()
+
+
+# ----------------------------- tree -----------------------------
+
+def tree_cache_key(course_id, version):
+    # "t2": blobs from before file locations were left out must not be served again
+    return f"content:tree:t2:{course_id}:{version}"
+
+
+def build_course_tree(course_id, version=None):
+    """
+    Modules -> lessons -> resources of one course in three queries.
+    Only active rows and published lessons, everything in sort_order.
+    """
+    course = Course.objects.filter(pk=course_id).values("id", "branch_id", "title", "slug", "content_version").first()
+    if course is None:
+        return None
+
+    modules = list(
+        CourseModule.objects.filter(course_id=course_id, active=True)
+        .order_by("sort_order", "created")
+        .values("id", "title", "description", "visibility", "sort_order", "release_type", "release_at", "release_after_days")
+    )
+    lessons = list(
+        Lesson.objects.filter(course_id=course_id, active=True, status=LessonStatus.PUBLISHED, module__active=True)
+        .order_by("sort_order", "created")
+        .values(
+            "id", "module_id", "title", "slug", "lesson_type", "sort_order", "summary",
+            "duration_seconds", "is_preview", "is_downloadable", "require_watch_percent",
+            "release_type", "release_at", "release_after_days", "prerequisite_lesson_id",
+            "quiz_id", "assignment_id", "starts_at", "ends_at",
+        )
+    )
+    resources = (
+        LessonResource.objects.filter(lesson__course_id=course_id, active=True)
+        .order_by("sort_order", "created")
+        .values(
+            "id", "lesson_id", "resource_type", "title", "file_url", "storage_key", "link_url",
+            "original_name", "mime_type", "size_bytes", "is_downloadable", "sort_order",
+        )
+    )
+
+    by_lesson = {}
+    for resource in resources:
+        # file locations never go into the shared blob: the player signs them through the media endpoint
+        file_url, storage_key = resource.pop("file_url"), resource.pop("storage_key")
+        resource["has_file"] = bool(file_url or storage_key)
+        by_lesson.setdefault(resource.pop("lesson_id"), []).append(resource)
+
+    by_module = {}
+    for lesson in lessons:
+        lesson["resources"] = by_lesson.get(lesson["id"], [])
+        by_module.setdefault(lesson.pop("module_id"), []).append(lesson)
+
+    for module in modules:
+        module["lessons"] = by_module.get(module["id"], [])
+
+    return {
+        "course": course["id"],
+        "branch": course["branch_id"],
+        "title": course["title"],
+        "slug": course["slug"],
+        "version": course["content_version"] if version is None else version,
+        "modules": modules,
+        "lesson_count": len(lessons),
+        "preview_lessons": [lesson["id"] for lesson in lessons if lesson["is_preview"]],
+    }
+
+
+def get_course_tree(course_id):
+    """
+    One version lookup + one cache hit. A bump makes the old key unreachable, nothing to delete.
+    """
+    version = get_content_version(course_id)
+    if version is None:
+        return None
+    key = tree_cache_key(course_id, version)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_course_tree(course_id, version)
+        cache.set(key, tree, TREE_CACHE_TIMEOUT)
+    return tree
@@ -0,0 +1,39 @@
+# content/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from content.models import CourseModule, Lesson, LessonInstructorNote, LessonResource
+from content.services.rendering import rendered_bodies
+from content.services.tree import bump_content_version
+
+
+@receiver(post_save, sender=CourseModule, dispatch_uid="content_module_saved")
+@receiver(post_delete, sender=CourseModule, dispatch_uid="content_module_deleted")
+@receiver(post_save, sender=Lesson, dispatch_uid="content_lesson_saved")
+@receiver(post_delete, sender=Lesson, dispatch_uid="content_lesson_deleted")
+def content_course_part_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_content_version([instance.course_id])
+
+
+@receiver(post_save, sender=LessonResource, dispatch_uid="content_resource_saved")
+@receiver(post_delete, sender=LessonResource, dispatch_uid="content_resource_deleted")
+@receiver(post_save, sender=LessonInstructorNote, dispatch_uid="content_note_saved")
+@receiver(post_delete, sender=LessonInstructorNote, dispatch_uid="content_note_deleted")
+def content_lesson_part_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # during a lesson cascade the lesson row may already be gone, its own signal bumps then
+    course_id = Lesson.objects.filter(pk=instance.lesson_id).values_list("course_id", flat=True).first()
+    bump_content_version([course_id])
+
+
+@receiver(post_save, sender=Lesson, dispatch_uid="content_lesson_render")
+def content_lesson_render(sender, instance, raw=False, update_fields=None, **kwargs):
+    # render an edited body once, after commit, so the next read is a plain lookup
+    if raw or not instance.body_hash:
+        return
+    if update_fields is not None and not {"body", "body_blocks", "content_format"} & set(update_fields):
+        return  # reorders, publishes...: the body did not change
+    transaction.on_commit(lambda: rendered_bodies([instance]))
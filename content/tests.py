@@ -1,3 +1,111 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from content.services.markup import render_body, render_markdown, sanitize_html
+
+
+class SanitizeUrlTests(SimpleTestCase):
+    def test_javascript_href_dropped(self):
+        self.assertEqual(sanitize_html('<a href="javascript:alert(1)">x</a>'), "<a>x</a>")
+
+    def test_data_src_dropped(self):
+        self.assertEqual(sanitize_html('<img src="data:image/svg+xml;base64,PHN2Zz4=">'), "<img>")
+
+    def test_entity_obfuscated_schemes_dropped(self):
+        for href in (
+            "jav&#x61;script:alert(1)",
+            "&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)",
+            "java&#x09;script:alert(1)",
+            "java&Tab;script:alert(1)",
+            " JaVaScRiPt:alert(1)",
+            "vbscript:msgbox(1)",
+        ):
+            with self.subTest(href=href):
+                self.assertNotIn("href", sanitize_html(f'<a href="{href}">x</a>'))
+
+    def test_safe_and_relative_urls_kept(self):
+        for href in ("https://example.com/a?b=1&amp;c=2", "mailto:a@example.com", "/lessons/1", "#part-2", "../x"):
+            with self.subTest(href=href):
+                self.assertIn("href=", sanitize_html(f'<a href="{href}">x</a>'))
+
+    def test_event_handlers_and_unknown_attributes_dropped(self):
+        self.assertEqual(sanitize_html('<p onclick="alert(1)" style="x" class="lead">x</p>'), '<p class="lead">x</p>')
+
+    def test_target_blank_gets_rel(self):
+        self.assertEqual(
+            sanitize_html('<a href="https://e.com" target="_blank" rel="opener">x</a>'),
+            '<a href="https://e.com" target="_blank" rel="noopener noreferrer nofollow">x</a>',
+        )
+
+
+class SanitizeContentTests(SimpleTestCase):
+    def test_script_style_svg_content_dropped(self):
+        self.assertEqual(
+            sanitize_html("a<script>alert(1)</script>b<style>p{}</style>c<svg><script>x</script><text>t</text></svg>d"),
+            "abcd",
+        )
+
+    def test_nested_dropped_tags(self):
+        self.assertEqual(sanitize_html("<svg><svg>x</svg>y</svg>z"), "z")
+
+    def test_unknown_tags_unwrapped_text_escaped(self):
+        self.assertEqual(sanitize_html("<custom>1 &lt; 2</custom>"), "1 &lt; 2")
+
+    def test_unclosed_tags_closed(self):
+        self.assertEqual(sanitize_html("<p><strong>x"), "<p><strong>x</strong></p>")
+
+    def test_stray_end_tags_ignored(self):
+        self.assertEqual(sanitize_html("x</p></div>y"), "xy")
+
+    def test_misnested_tags_closed_in_order(self):
+        self.assertEqual(sanitize_html("<b><i>x</b>y</i>"), "<b><i>x</i></b>y")
+
+    def test_only_checkbox_inputs(self):
+        self.assertEqual(sanitize_html('<input type="text" value="x">'), "")
+        self.assertEqual(sanitize_html('<input type="checkbox" checked>'), '<input type="checkbox" checked>')
+
+
+class RenderBodyTests(SimpleTestCase):
+    def test_raw_and_html_blocks_sanitized(self):
+        for kind in ("raw", "html"):
+            with self.subTest(kind=kind):
+                blocks = [{"type": kind, "data": {"html": '<p>ok</p><script>alert(1)</script><img src="javascript:x" onerror="y">'}}]
+                self.assertEqual(render_body("blocks", "", blocks), "<p>ok</p><img>")
+
+    def test_markdown_raw_html_escaped(self):
+        self.assertEqual(render_body("markdown", "<script>alert(1)</script>", None), "<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>")
+
+    def test_html_format_sanitized(self):
+        self.assertEqual(render_body("html", "<p>x</p><iframe src='https://e.com'></iframe>", None), "<p>x</p>")
+
+
+class MarkdownTests(SimpleTestCase):
+    def test_link(self):
+        self.assertEqual(render_markdown("[docs](https://e.com/a)"), '<p><a href="https://e.com/a">docs</a></p>')
+
+    def test_link_with_title(self):
+        self.assertEqual(
+            render_markdown('[docs](https://e.com "The docs")'),
+            '<p><a href="https://e.com" title="The docs">docs</a></p>',
+        )
+
+    def test_image(self):
+        self.assertEqual(render_markdown("![a cat](/media/cat.png)"), '<p><img src="/media/cat.png" alt="a cat"></p>')
+
+    def test_javascript_link_dropped_after_sanitizing(self):
+        self.assertEqual(render_body("markdown", "[x](javascript:alert`1`)", None), "<p><a>x</a></p>")
+        self.assertEqual(render_body("markdown", "![x](data:text/html;base64,PHNjcmlwdD4=)", None), '<p><img alt="x"></p>')
+
+    def test_attribute_breakout_escaped(self):
+        self.assertEqual(
+            render_body("markdown", '![x" onerror="alert(1)](/a.png)', None),
+            '<p><img src="/a.png" alt="x&quot; onerror=&quot;alert(1)"></p>',
+        )
+
+    def test_code_span_not_formatted(self):
+        self.assertEqual(render_markdown("`**x**` **y**"), "<p><code>**x**</code> <strong>y</strong></p>")
+
+    def test_blocks(self):
+        self.assertEqual(
+            render_markdown("# Title\n\n- a\n- b\n\n```py\nx < 1\n```"),
+            '<h1>Title</h1>\n<ul><li>a</li><li>b</li></ul>\n<pre><code class="language-py">x &lt; 1</code></pre>',
+        )
@@ -6,6 +6,8 @@ from content.views import (
     LessonViewSet,
     LessonResourceViewSet,
     LessonInstructorNoteViewSet,
+    CourseContentStatsViewSet,
+    MediaVerifyView,
 )
 
 router = BulkRouter()
@@ -13,7 +15,9 @@ router.register(r"course-modules", CourseModuleViewSet, basename="course-module"
 router.register(r"lessons", LessonViewSet, basename="lesson")
 router.register(r"lesson-resources", LessonResourceViewSet, basename="lesson-resource")
 router.register(r"lesson-instructor-notes", LessonInstructorNoteViewSet, basename="lesson-instructor-note")
+router.register(r"course-content-stats", CourseContentStatsViewSet, basename="course-content-stats")
 
 urlpatterns = [
+    path("media/verify/", MediaVerifyView.as_view(), name="media-verify"),
     path("", include(router.urls)),
 ]
@@ -1,22 +1,49 @@
-from core.utils.BulkModelViewSet import BaseModelViewSet
+from django.http import Http404, StreamingHttpResponse
+from django.utils.text import slugify
+from rest_framework import permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.utils.BulkModelViewSet import BaseModelViewSet, BaseReadOnlyModelViewSet
+from core.utils.branchScope import get_branch_scope
 from content.models import (
     CourseModule,
     Lesson,
     LessonResource,
     LessonInstructorNote,
+    CourseContentStats,
 )
 from content.serializers import (
     CourseModuleSerializer,
     LessonSerializer,
     LessonResourceSerializer,
     LessonInstructorNoteSerializer,
+    CourseContentStatsSerializer,
+    CourseTreeQuerySerializer,
+    NextLessonsQuerySerializer,
+    ModuleReorderSerializer,
+    LessonReorderSerializer,
+    MediaSignSerializer,
 )
 from content.filters import (
     CourseModuleFilter,
     LessonFilter,
     LessonResourceFilter,
     LessonInstructorNoteFilter,
+    CourseContentStatsFilter,
 )
+from courses.models import Course
+from enrollments.permissions import HasCourseEntitlement, LessonReleased
+from enrollments.services.entitlements import filter_entitled
+from content.services.archive import module_resource_entries, stream_zip
+from content.services.media import signed_media, verify_signed_url
+from content.services.ordering import ReorderError, reorder_lessons, reorder_modules
+from content.services.prerequisites import filter_released, get_prerequisite_graph, learner_state
+from content.services.publish import publish_lesson
+from content.services.rendering import rendered_bodies
+from content.services.tree import get_course_tree
 
 
 class CourseModuleViewSet(BaseModelViewSet):
@@ -25,6 +52,61 @@ class CourseModuleViewSet(BaseModelViewSet):
     filterset_class = CourseModuleFilter
     search_fields = ["title", "description"]
     ordering_fields = "__all__"
+    permission_classes = [*BaseModelViewSet.permission_classes, HasCourseEntitlement]
+
+    def get_queryset(self):
+        return filter_entitled(super().get_queryset(), self.request.user)
+
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        """
+        Course player outline (?course=<id>): modules -> lessons -> resources,
+        served from the cache keyed by (course, content_version).
+        """
+        params = CourseTreeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        tree = get_course_tree(params.validated_data["course"])
+        scope = get_branch_scope(request.user)
+        if tree is None or (scope != "all" and str(tree["branch"]) != scope):
+            raise Http404
+
+        etag = f'"{tree["course"]}:{tree["version"]}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(tree, headers={"ETag": etag})
+
+    @action(detail=True, methods=["get"], url_path="download-resources")
+    def download_resources(self, request, pk=None):
+        """
+        Every downloadable resource of the module as one zip, streamed while the files are read:
+        constant memory, no temp file, no size limit.
+        """
+        module = self.get_object()
+        entries = list(module_resource_entries(module.pk, request.user))
+        if not entries:
+            raise Http404
+        response = StreamingHttpResponse(stream_zip(entries), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="{slugify(module.title) or "module"}-resources.zip"'
+        return response
+
+    @action(detail=False, methods=["post"])
+    def reorder(self, request):
+        """
+        {"course": <id>, "modules": [<id>, ...]} -> full new module order of the course.
+        Only rows whose gapped sort_order has to change are written (one bulk_update).
+        """
+        params = ModuleReorderSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        scope = get_branch_scope(request.user)
+        if scope != "all" and not Course.objects.filter(pk=data["course"], branch_id=scope).exists():
+            raise Http404
+        try:
+            updated, rebalanced = reorder_modules(data["course"], data["modules"])
+        except ReorderError as e:
+            raise ValidationError({"modules": str(e)})
+        return Response({"updated": updated, "rebalanced": rebalanced})
 
 
 class LessonViewSet(BaseModelViewSet):
@@ -33,6 +115,125 @@ class LessonViewSet(BaseModelViewSet):
     filterset_class = LessonFilter
     search_fields = ["title", "slug", "summary"]
     ordering_fields = "__all__"
+    permission_classes = [*BaseModelViewSet.permission_classes, HasCourseEntitlement, LessonReleased]
+
+    def get_queryset(self):
+        queryset = filter_entitled(super().get_queryset(), self.request.user, lesson="")
+        # retrieve is gated by LessonReleased (403), lists simply leave locked lessons out
+        return filter_released(queryset, self.request.user) if self.action == "list" else queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # pre-rendered bodies for the whole page in one query
+        self._rendered_bodies = rendered_bodies(page if page is not None else queryset)
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["rendered_bodies"] = getattr(self, "_rendered_bodies", None)
+        return context
+
+    @action(detail=False, methods=["post"])
+    def reorder(self, request):
+        """
+        {"module": <id>, "lessons": [<id>, ...]} -> full new lesson order of the module.
+        Lessons from other modules of the course may be listed to move them here.
+        """
+        params = LessonReorderSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        scope = get_branch_scope(request.user)
+        if scope != "all" and not CourseModule.objects.filter(pk=data["module"], branch_id=scope).exists():
+            raise Http404
+        try:
+            updated, rebalanced = reorder_lessons(data["module"], data["lessons"])
+        except ReorderError as e:
+            raise ValidationError({"lessons": str(e)})
+        return Response({"updated": updated, "rebalanced": rebalanced})
+
+    @action(detail=False, methods=["post"])
+    def media(self, request):
+        """
+        {"course": <id>} or {"lessons": [...], "resources": [...]} -> signed, expiring URLs for
+        every video / file asset in one go: {"lessons": {id: {url, expires}}, "resources": {...}}.
+        """
+        params = MediaSignSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        lessons = Lesson.objects.only("id", "branch_id", "video_url", "video_asset_key")
+        resources = LessonResource.objects.select_related("lesson").only(
+            "id", "file_url", "storage_key", "lesson__id", "lesson__branch_id",
+        )
+        scope = get_branch_scope(request.user)
+        if scope != "all":
+            lessons = lessons.filter(branch_id=scope)
+            resources = resources.filter(lesson__branch_id=scope)
+        if data.get("course"):
+            lessons = lessons.filter(course_id=data["course"])
+            resources = resources.filter(lesson__course_id=data["course"])
+        else:
+            lessons = lessons.filter(pk__in=data.get("lessons") or [])
+            resources = resources.filter(pk__in=data.get("resources") or [])
+        # learners only get assets of lessons they may open now: lesson rules, then the release gate
+        lessons = filter_released(filter_entitled(lessons, request.user, lesson=""), request.user)
+        resources = filter_released(
+            filter_entitled(resources, request.user, "lesson__course_id", lesson="lesson__"), request.user, lesson="lesson__",
+        )
+
+        signed_lessons, signed_resources = signed_media(lessons, resources, user_id=request.user.pk)
+        return Response({
+            "lessons": {pk: signed._asdict() for pk, signed in signed_lessons.items()},
+            "resources": {pk: signed._asdict() for pk, signed in signed_resources.items()},
+        })
+
+    @action(detail=True, methods=["get"])
+    def unlocks(self, request, pk=None):
+        """
+        Lessons that depend on this one: direct, transitive (dependency order), and the ones
+        completing it would release now for the requesting learner.
+        """
+        lesson = self.get_object()
+        graph = get_prerequisite_graph(lesson.course_id)
+        completed, enrolled_at = learner_state(request.user, lesson.course_id)
+        return Response({
+            "lesson": str(lesson.pk),
+            "direct": graph.dependents(lesson.pk),
+            "all": graph.dependents(lesson.pk, transitive=True),
+            "unlocks_now": graph.unlocked_by(lesson.pk, completed, enrolled_at),
+        })
+
+    @action(detail=False, methods=["get"])
+    def next(self, request):
+        """
+        ?course=<id>: lessons the requesting learner can open now and hasn't completed, in dependency order.
+        """
+        params = NextLessonsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        graph = get_prerequisite_graph(data["course"])
+        if graph is None:
+            raise Http404
+        completed, enrolled_at = learner_state(request.user, data["course"])
+        ids = graph.next_lessons(completed, enrolled_at, limit=data["limit"])
+        rows = {
+            str(row["id"]): row
+            for row in Lesson.objects.filter(pk__in=ids).values("id", "module_id", "title", "slug", "lesson_type", "duration_seconds")
+        }
+        return Response({"course": str(data["course"]), "completed": len(completed), "results": [rows[pk] for pk in ids if pk in rows]})
+
+    @action(detail=True, methods=["post"])
+    def publish(self, request, pk=None):
+        """
+        Publishes the lesson and refreshes the course aggregates (stats, learner totals, tree cache).
+        """
+        lesson = self.get_object()
+        stats = publish_lesson(lesson)
+        return Response({
+            "lesson": self.get_serializer(lesson).data,
+            "stats": CourseContentStatsSerializer(stats).data if stats else None,
+        })
 
 
 class LessonResourceViewSet(BaseModelViewSet):
@@ -41,6 +242,28 @@ class LessonResourceViewSet(BaseModelViewSet):
     filterset_class = LessonResourceFilter
     search_fields = ["title", "description"]
     ordering_fields = "__all__"
+    permission_classes = [*BaseModelViewSet.permission_classes, HasCourseEntitlement, LessonReleased]
+
+    def get_queryset(self):
+        queryset = filter_entitled(super().get_queryset(), self.request.user, "lesson__course_id", lesson="lesson__")
+        return filter_released(queryset, self.request.user, lesson="lesson__") if self.action == "list" else queryset
+
+
+class MediaVerifyView(APIView):
+    """
+    Token check for signed media URLs (nginx auth_request / CDN edge): no auth, no database.
+    The URL comes from ?url= or the X-Original-URI header. 204 when valid, 403 otherwise.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        url = request.query_params.get("url") or request.headers.get("X-Original-URI") or ""
+        ok, reason, _ = verify_signed_url(url)
+        if not ok:
+            return Response({"detail": reason}, status=status.HTTP_403_FORBIDDEN)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class LessonInstructorNoteViewSet(BaseModelViewSet):
@@ -49,3 +272,11 @@ class LessonInstructorNoteViewSet(BaseModelViewSet):
     filterset_class = LessonInstructorNoteFilter
     search_fields = ["note"]
     ordering_fields = "__all__"
+
+
+class CourseContentStatsViewSet(BaseReadOnlyModelViewSet):
+    queryset = CourseContentStats.objects.all()
+    serializer_class = CourseContentStatsSerializer
+    filterset_class = CourseContentStatsFilter
+    search_fields = ["course__title"]
+    ordering_fields = "__all__"
@@ -0,0 +1,35 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.geoLookup import GEOIP_DATABASE_PATH, build_geoip_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile an IP-range CSV (start_ip,end_ip,country_code,city) into the mmap'ed "
+        "geoip lookup file. IPs may be dotted or integers, a header row is skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--output", default=str(GEOIP_DATABASE_PATH))
+        parser.add_argument("--delimiter", default=",")
+
+    def handle(self, *args, **options):
+        try:
+            fh = open(options["csv_path"], newline="", encoding="utf-8")
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['csv_path']}: {e}")
+
+        with fh:
+            rows = (
+                (row + ["", ""])[:4]
+                for row in csv.reader(fh, delimiter=options["delimiter"])
+                if len(row) >= 3
+            )
+            ranges, locations = build_geoip_file(rows, options["output"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {options['output']}: {ranges} ranges, {locations} locations"
+        ))
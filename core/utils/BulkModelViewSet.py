@@ -1,5 +1,5 @@
 
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import viewsets, mixins, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
@@ -81,3 +81,16 @@ class BaseModelViewSet(BranchScopedMixin, BulkModelViewSet):
             extra["branch"] = branch
         serializer.save(**extra)
 
+
+
+class BaseReadOnlyModelViewSet(BranchScopedMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    List / retrieve only, same branch scoping and filters as BaseModelViewSet.
+    For derived tables rebuilt by services: client writes would be taken as truth by the next rebuild.
+    """
+    permission_classes = [IsAuthenticated, IsMainBranchOrOwnBranch]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    http_method_names = ["get", "head", "options"]
+    ordering_fields = "__all__"
+    search_fields = []
+    filterset_class = None
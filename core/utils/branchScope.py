@@ -0,0 +1,10 @@
+def get_branch_scope(user):
+    """
+    Returns a cache-friendly token describing what the user can see.
+    Mirrors BranchScopedMixin: main-branch users (or users without a branch) see everything,
+    everyone else only sees their own branch.
+    """
+    branch = getattr(user, "branch", None)
+    if not branch or getattr(branch, "is_main_branch", False):
+        return "all"
+    return str(branch.pk)
@@ -68,4 +68,21 @@ class TransactionBasedBranchScopedStampedOwnedActive(StampedOwnedActive, BranchS
     total = models.DecimalField(max_digits=18, decimal_places=6, default=0)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+def update_fields_without(instance, excluded, update_fields=None):
+    """
+    update_fields for a save() of an existing row that must never write `excluded`
+    (counters only ever bumped with F() UPDATEs): a full save lists every loaded field but
+    those, so an in-memory copy loaded before a bump cannot roll it back.
+    None for inserts, which write every column.
+    """
+    if instance._state.adding:
+        return update_fields
+    if update_fields is None:
+        deferred = instance.get_deferred_fields()
+        update_fields = [
+            field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.attname not in deferred
+        ]
+    return [name for name in update_fields if name not in excluded]
@@ -0,0 +1,183 @@
+"""
+Offline IP -> (country, city) lookups.
+
+The `load_geoip` command compiles an IP-range CSV into one binary file:
+
+    header   "<4sII"  magic b"VGEO", ranges n, locations m
+    starts   uint32[n]   sorted range starts
+    ends     uint32[n]   inclusive range ends
+    loc      uint32[n]   index into the location table
+    table    utf-8 "CC\\tCity\\n" * m
+
+The file is mmap'ed read-only, so every worker on a host shares the same pages,
+and lookups are a bisect over the `starts` array (no DB, no network).
+IPv4 only (IPv4-mapped IPv6 addresses are unwrapped).
+"""
+import array
+import ipaddress
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"VGEO"
+HEADER = struct.Struct("<4sII")
+
+GEOIP_DATABASE_PATH = getattr(settings, "GEOIP_DATABASE_PATH", os.path.join(settings.BASE_DIR, "geoip.bin"))
+GEOIP_RELOAD_SECONDS = getattr(settings, "GEOIP_RELOAD_SECONDS", 60)
+
+GeoLocation = namedtuple("GeoLocation", ["country_code", "city"])
+
+
+def ip_to_int(ip):
+    """
+    Dotted / integer IPv4 (or IPv4-mapped IPv6) -> int, None for anything else.
+    """
+    if ip is None:
+        return None
+    ip = str(ip).strip()
+    if ip.isdigit():
+        value = int(ip)
+        return value if value < 2 ** 32 else None
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    if addr.version == 6:
+        addr = addr.ipv4_mapped
+        if addr is None:
+            return None
+    return int(addr)
+
+
+# ----------------------------- build -----------------------------
+
+def build_geoip_file(rows, path):
+    """
+    rows: iterable of (start_ip, end_ip, country_code, city).
+    Writes to a temp file and swaps it in, workers with the old file mapped keep reading it.
+    Returns (ranges, locations).
+    """
+    ranges = []
+    locations = {}
+    for start_ip, end_ip, country_code, city in rows:
+        start, end = ip_to_int(start_ip), ip_to_int(end_ip)
+        if start is None or end is None or end < start:
+            continue
+        key = ((country_code or "").strip().upper()[:2], (city or "").strip().replace("\t", " ").replace("\n", " "))
+        loc = locations.setdefault(key, len(locations))
+        ranges.append((start, end, loc))
+
+    ranges.sort()
+    starts = array.array("I", (r[0] for r in ranges))
+    ends = array.array("I", (r[1] for r in ranges))
+    locs = array.array("I", (r[2] for r in ranges))
+    table = "".join(f"{cc}\t{city}\n" for (cc, city), _ in sorted(locations.items(), key=lambda kv: kv[1]))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, len(ranges), len(locations)))
+        starts.tofile(fh)
+        ends.tofile(fh)
+        locs.tofile(fh)
+        fh.write(table.encode("utf-8"))
+    os.replace(tmp, path)
+    return len(ranges), len(locations)
+
+
+# ----------------------------- lookup -----------------------------
+
+class GeoIPDatabase:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n, m = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a geoip database")
+
+        view = memoryview(self._mm)
+        offset = HEADER.size
+        size = 4 * n
+        self.starts = view[offset:offset + size].cast("I")
+        self.ends = view[offset + size:offset + 2 * size].cast("I")
+        self.locs = view[offset + 2 * size:offset + 3 * size].cast("I")
+
+        # the location table is tiny compared to the ranges, decode it once
+        table = bytes(view[offset + 3 * size:]).decode("utf-8").split("\n")[:m]
+        self.locations = [GeoLocation(*(line.split("\t", 1) + [""])[:2]) for line in table]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def lookup(self, ip):
+        value = ip_to_int(ip)
+        if value is None:
+            return None
+        i = bisect_right(self.starts, value) - 1
+        if i < 0 or value > self.ends[i]:
+            return None
+        return self.locations[self.locs[i]]
+
+
+_lock = threading.Lock()
+_state = {"db": None, "mtime": None, "checked": None}
+
+
+def get_geoip_database():
+    """
+    Process-wide instance, re-opened when the file changes (checked every GEOIP_RELOAD_SECONDS).
+    """
+    now = time.monotonic()
+    if _state["checked"] is not None and now - _state["checked"] < GEOIP_RELOAD_SECONDS:
+        return _state["db"]
+
+    with _lock:
+        _state["checked"] = now
+        try:
+            mtime = os.stat(GEOIP_DATABASE_PATH).st_mtime
+        except OSError:
+            _state["db"], _state["mtime"] = None, None
+            return None
+        if mtime != _state["mtime"]:
+            try:
+                _state["db"] = GeoIPDatabase(GEOIP_DATABASE_PATH)
+                _state["mtime"] = mtime
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"geoip database not loaded: {e}")
+                _state["db"] = None
+    return _state["db"]
+
+
+def lookup_ip(ip):
+    """
+    GeoLocation(country_code, city) or None (unknown ip / no database installed).
+    """
+    if not ip:
+        return None
+    db = get_geoip_database()
+    return db.lookup(ip) if db is not None else None
+
+
+def apply_geo(obj, force=False):
+    """
+    Fills obj.country_code / obj.city from obj.ip_address (sessions, login audits).
+    """
+    if not obj.ip_address or (obj.country_code and not force):
+        return False
+    location = lookup_ip(obj.ip_address)
+    if location is None:
+        return False
+    obj.country_code = location.country_code or None
+    obj.city = location.city or None
+    return True
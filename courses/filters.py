@@ -12,6 +12,7 @@ from courses.models import (
     CourseTargetAudience,
     CourseFAQ,
     CourseReview,
+    CatalogEntry,
 )
 
 
@@ -40,7 +41,9 @@ class CourseTagFilter(django_filters.FilterSet):
 
 class CourseFilter(django_filters.FilterSet):
     branch = django_filters.UUIDFilter(field_name="branch_id")
-    category = django_filters.UUIDFilter(field_name="category_id")
+    category = django_filters.UUIDFilter(method="filter_category")
+    # ?category=<id>&include_descendants=true -> the whole subtree, one prefix query on the category path
+    include_descendants = django_filters.BooleanFilter(method="filter_include_descendants")
     status = django_filters.CharFilter(lookup_expr="iexact")
     visibility = django_filters.CharFilter(lookup_expr="iexact")
     slug = django_filters.CharFilter(lookup_expr="iexact")
@@ -50,7 +53,19 @@ class CourseFilter(django_filters.FilterSet):
 
     class Meta:
         model = Course
-        fields = ["branch", "category", "status", "visibility", "slug", "level", "is_featured", "active"]
+        fields = ["branch", "category", "include_descendants", "status", "visibility", "slug", "level", "is_featured", "active"]
+
+    def filter_category(self, queryset, name, value):
+        if not self.form.cleaned_data.get("include_descendants"):
+            return queryset.filter(category_id=value)
+        # the path is fetched first: a literal LIKE 'path%' can use the path index, a subquery cannot
+        path = CourseCategory.objects.filter(pk=value).values_list("path", flat=True).first()
+        if not path:
+            return queryset.filter(category_id=value)
+        return queryset.filter(category__path__startswith=path)
+
+    def filter_include_descendants(self, queryset, name, value):
+        return queryset  # applied by filter_category
 
 
 class CourseTaggingFilter(django_filters.FilterSet):
@@ -124,3 +139,36 @@ class CourseReviewFilter(django_filters.FilterSet):
     class Meta:
         model = CourseReview
         fields = ["course", "status", "requested_by", "reviewed_by"]
+
+
+class CatalogEntryFilter(django_filters.FilterSet):
+    branch = django_filters.UUIDFilter(field_name="branch_id")
+    category = django_filters.UUIDFilter(field_name="category_id")
+    category_slug = django_filters.CharFilter(lookup_expr="iexact")
+    slug = django_filters.CharFilter(lookup_expr="iexact")
+    level = django_filters.CharFilter(lookup_expr="iexact")
+    language = django_filters.CharFilter(lookup_expr="iexact")
+    pricing_type = django_filters.CharFilter(lookup_expr="iexact")
+    is_featured = django_filters.BooleanFilter()
+    instructor = django_filters.UUIDFilter(field_name="instructor_id")
+    min_rating = django_filters.NumberFilter(field_name="rating_avg", lookup_expr="gte")
+    # current_price is annotated by the catalog viewset (sale windows applied)
+    price_min = django_filters.NumberFilter(field_name="current_price", lookup_expr="gte")
+    price_max = django_filters.NumberFilter(field_name="current_price", lookup_expr="lte")
+
+    class Meta:
+        model = CatalogEntry
+        fields = [
+            "branch",
+            "category",
+            "category_slug",
+            "slug",
+            "level",
+            "language",
+            "pricing_type",
+            "is_featured",
+            "instructor",
+            "min_rating",
+            "price_min",
+            "price_max",
+        ]
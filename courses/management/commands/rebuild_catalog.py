@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from courses.services.catalog import CATALOG_BATCH_SIZE, rebuild_catalog
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized course catalog (CatalogEntry) for every course, or only --course ids."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", action="append", dest="courses", help="Course id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=CATALOG_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        written = rebuild_catalog(options["courses"], batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} catalog entries"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from courses.services.categories import rebuild_category_paths
+
+
+class Command(BaseCommand):
+    help = "Recompute CourseCategory.path / depth for every category from the parent links."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated, unreachable = rebuild_category_paths(batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} category paths"))
+        if unreachable:
+            self.stdout.write(self.style.WARNING(f"{unreachable} categories are part of a parent cycle and were skipped"))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogEntry',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='catalog_entry', serialize=False, to='courses.course')),
+                ('is_listed', models.BooleanField(db_index=True, default=False)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=220)),
+                ('subtitle', models.CharField(blank=True, max_length=255, null=True)),
+                ('short_description', models.CharField(blank=True, max_length=500, null=True)),
+                ('thumbnail_url', models.URLField(blank=True, null=True)),
+                ('language', models.CharField(db_index=True, default='en', max_length=10)),
+                ('level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced'), ('all', 'All Levels')], db_index=True, default='all', max_length=20)),
+                ('estimated_duration_minutes', models.PositiveIntegerField(default=0)),
+                ('is_featured', models.BooleanField(db_index=True, default=False)),
+                ('published_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('category_name', models.CharField(blank=True, max_length=120, null=True)),
+                ('category_slug', models.SlugField(blank=True, max_length=140, null=True)),
+                ('pricing_type', models.CharField(choices=[('free', 'Free'), ('paid', 'Paid')], db_index=True, default='free', max_length=10)),
+                ('currency_code', models.CharField(default='NPR', max_length=3)),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sale_price', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('sale_start_at', models.DateTimeField(blank=True, null=True)),
+                ('sale_end_at', models.DateTimeField(blank=True, null=True)),
+                ('rating_avg', models.DecimalField(decimal_places=2, default=0, max_digits=4)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('enrollment_count', models.PositiveIntegerField(default=0)),
+                ('instructor_id', models.UUIDField(blank=True, null=True)),
+                ('instructor_name', models.CharField(blank=True, max_length=150, null=True)),
+                ('instructor_headline', models.CharField(blank=True, max_length=200, null=True)),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('rebuilt_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='%(app_label)s_%(class)s_branch', to='settings.branch')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='catalog_entries', to='courses.coursecategory')),
+            ],
+            options={
+                'db_table': 'course_catalog_entries',
+                'ordering': ['-published_at'],
+                'indexes': [models.Index(fields=['is_listed', 'branch', 'published_at'], name='course_cata_is_list_23eb0a_idx'), models.Index(fields=['is_listed', 'category'], name='course_cata_is_list_c9e11d_idx'), models.Index(fields=['is_listed', 'rating_avg'], name='course_cata_is_list_47d4f9_idx'), models.Index(fields=['is_listed', 'enrollment_count'], name='course_cata_is_list_e0cb86_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_catalogentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='historicalcourse',
+            name='content_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.11 on 2026-10-19 05:35
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_category_paths(apps, schema_editor):
+    CourseCategory = apps.get_model("courses", "CourseCategory")
+    children = defaultdict(list)
+    for pk, parent_id in CourseCategory.objects.values_list("id", "parent_id"):
+        children[parent_id].append(pk)
+
+    rows = []
+    stack = [(pk, "", 0) for pk in children[None]]
+    while stack:
+        pk, parent_path, depth = stack.pop()
+        path = f"{parent_path}{pk.hex}/"
+        rows.append(CourseCategory(pk=pk, path=path, depth=depth))
+        stack.extend((child, path, depth + 1) for child in children.get(pk, ()))
+    CourseCategory.objects.bulk_update(rows, ["path", "depth"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecategory',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='coursecategory',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=660),
+        ),
+        migrations.AddField(
+            model_name='historicalcoursecategory',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='historicalcoursecategory',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=660),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
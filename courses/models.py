@@ -1,12 +1,14 @@
 # courses/models.py
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 from core.utils.coreModels import (
     StampedOwnedActive,
+    BranchScoped,
     BranchScopedStampedOwnedActive,
+    update_fields_without,
 )
 
 
@@ -66,6 +68,10 @@ class CourseCategory(BranchScopedStampedOwnedActive):
     icon = models.CharField(max_length=80, blank=True, null=True)  # optional: icon name
     sort_order = models.PositiveIntegerField(default=0)
 
+    # materialized path "<root id>/<child id>/.../<own id>/" (hex ids), kept in sync on save / move
+    path = models.CharField(max_length=660, editable=False, default="", db_index=True)
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
+
     class Meta:
         db_table = "course_categories"
         ordering = ["sort_order", "name"]
@@ -81,6 +87,21 @@ class CourseCategory(BranchScopedStampedOwnedActive):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        from courses.services.categories import assign_path, move_subtree
+
+        with transaction.atomic():
+            moved = assign_path(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "path", "depth"}
+            super().save(*args, **kwargs)
+            if moved:
+                move_subtree(*moved, self.path, self.depth)
+
 
 class CourseTag(BranchScopedStampedOwnedActive):
     name = models.CharField(max_length=80, db_index=True)
@@ -168,6 +189,9 @@ class Course(BranchScopedStampedOwnedActive):
     rating_avg = models.DecimalField(max_digits=4, decimal_places=2, default=0)   # 0.00 - 5.00
     rating_count = models.PositiveIntegerField(default=0)
 
+    # bumped (UPDATE ... + 1, no signals) on every content change, keys the cached course tree
+    content_version = models.PositiveBigIntegerField(default=0, editable=False)
+
     class Meta:
         db_table = "courses"
         ordering = ["-published_at", "-created"]
@@ -184,6 +208,12 @@ class Course(BranchScopedStampedOwnedActive):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # content_version is only written by bump_content_version()'s UPDATE
+        if not kwargs.get("force_insert"):
+            kwargs["update_fields"] = update_fields_without(self, {"content_version"}, kwargs.get("update_fields"))
+        super().save(*args, **kwargs)
+
     def publish(self):
         self.status = CourseStatus.PUBLISHED
         if not self.published_at:
@@ -276,16 +306,17 @@ class CoursePricing(StampedOwnedActive):
     def __str__(self):
         return f"Pricing({self.course_id})"
 
-    def effective_price(self):
+    def effective_price(self, at=None):
         """
-        Returns sale_price if within sale window; else price.
+        Returns sale_price if within sale window (at `at`, default now); else price.
+        For many courses at once use courses.services.pricing (one query, priced in SQL).
         """
         if self.pricing_type == PricingType.FREE:
             return 0
 
-        now = timezone.now()
+        at = at or timezone.now()
         if self.sale_price is not None:
-            if (self.sale_start_at is None or self.sale_start_at <= now) and (self.sale_end_at is None or now <= self.sale_end_at):
+            if (self.sale_start_at is None or self.sale_start_at <= at) and (self.sale_end_at is None or at <= self.sale_end_at):
                 return self.sale_price
         return self.price
 
@@ -400,3 +431,79 @@ class CourseReview(StampedOwnedActive):
 
     def __str__(self):
         return f"Review({self.course_id}, {self.status})"
+
+
+# ----------------------------- catalog read model -----------------------------
+
+class CatalogEntry(BranchScoped):
+    """
+    Denormalized, public-facing row per course (course + pricing + rating + primary
+    instructor + tags + enrollments). Rebuilt by courses.services.catalog, never edited by hand.
+    Unlisted courses keep their row with is_listed=False so the catalog watermark moves.
+    """
+
+    course = models.OneToOneField(Course, on_delete=models.CASCADE, primary_key=True, related_name="catalog_entry")
+    is_listed = models.BooleanField(default=False, db_index=True)  # published + public + active
+
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=220, db_index=True)
+    subtitle = models.CharField(max_length=255, blank=True, null=True)
+    short_description = models.CharField(max_length=500, blank=True, null=True)
+    thumbnail_url = models.URLField(blank=True, null=True)
+    language = models.CharField(max_length=10, default="en", db_index=True)
+    level = models.CharField(max_length=20, choices=CourseLevel.choices, default=CourseLevel.ALL, db_index=True)
+    estimated_duration_minutes = models.PositiveIntegerField(default=0)
+    is_featured = models.BooleanField(default=False, db_index=True)
+    published_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    category = models.ForeignKey(
+        CourseCategory,
+        on_delete=models.SET_NULL,
+        related_name="catalog_entries",
+        blank=True,
+        null=True,
+    )
+    category_name = models.CharField(max_length=120, blank=True, null=True)
+    category_slug = models.SlugField(max_length=140, blank=True, null=True)
+
+    # pricing snapshot, the effective price is derived from the sale window when serving
+    pricing_type = models.CharField(max_length=10, choices=PricingType.choices, default=PricingType.FREE, db_index=True)
+    currency_code = models.CharField(max_length=3, default="NPR")
+    price = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sale_price = models.DecimalField(max_digits=18, decimal_places=2, blank=True, null=True)
+    sale_start_at = models.DateTimeField(blank=True, null=True)
+    sale_end_at = models.DateTimeField(blank=True, null=True)
+
+    rating_avg = models.DecimalField(max_digits=4, decimal_places=2, default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    enrollment_count = models.PositiveIntegerField(default=0)
+
+    instructor_id = models.UUIDField(blank=True, null=True)
+    instructor_name = models.CharField(max_length=150, blank=True, null=True)
+    instructor_headline = models.CharField(max_length=200, blank=True, null=True)
+
+    tags = models.JSONField(default=list, blank=True)  # [{"id", "name", "slug"}]
+
+    rebuilt_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        db_table = "course_catalog_entries"
+        ordering = ["-published_at"]
+        indexes = [
+            models.Index(fields=["is_listed", "branch", "published_at"]),
+            models.Index(fields=["is_listed", "category"]),
+            models.Index(fields=["is_listed", "rating_avg"]),
+            models.Index(fields=["is_listed", "enrollment_count"]),
+        ]
+
+    def __str__(self):
+        return f"Catalog({self.title})"
+
+    def effective_price(self, at=None):
+        if self.pricing_type == PricingType.FREE:
+            return 0
+        at = at or timezone.now()
+        if self.sale_price is not None:
+            if (self.sale_start_at is None or self.sale_start_at <= at) and (self.sale_end_at is None or at <= self.sale_end_at):
+                return self.sale_price
+        return self.price
@@ -1,3 +1,6 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
 from core.utils.AdaptedBulkSerializer import BulkModelSerializer
 from courses.models import (
     CourseCategory,
@@ -11,14 +14,38 @@ from courses.models import (
     CourseTargetAudience,
     CourseFAQ,
     CourseReview,
+    CatalogEntry,
+    CourseLevel,
+    PricingType,
 )
+from courses.services.categories import validate_parent
+from settings.models import Branch
 
 
 class CourseCategorySerializer(BulkModelSerializer):
+    # depth=2 makes FKs read-only: this is the writable side of parent
+    parent_id = serializers.PrimaryKeyRelatedField(
+        source="parent",
+        queryset=CourseCategory.objects.all(),
+        write_only=True,
+        required=False,
+        allow_null=True,
+    )
+
     class Meta(BulkModelSerializer.Meta):
         model = CourseCategory
         fields = "__all__"
 
+    def validate(self, attrs):
+        # same cycle / depth checks as CourseCategory.save(), surfaced as a 400 instead of a 500
+        if "parent" in attrs:
+            parent = attrs["parent"]
+            try:
+                validate_parent(getattr(self.instance, "pk", None), parent.pk if parent else None)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError({"parent_id": exc.message_dict["parent"]})
+        return attrs
+
 
 class CourseTagSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
@@ -78,3 +105,90 @@ class CourseReviewSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
         model = CourseReview
         fields = "__all__"
+
+
+# ----------------------------- public catalog (read model, flat) -----------------------------
+
+class CatalogEntrySerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source="course_id", read_only=True)
+    effective_price = serializers.SerializerMethodField()
+    on_sale = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CatalogEntry
+        exclude = ["course", "is_listed", "rebuilt_at"]
+
+    def _price(self, obj):
+        # annotated by the catalog queryset when available, else evaluated per row
+        price = getattr(obj, "current_price", None)
+        return obj.effective_price() if price is None else price
+
+    def get_effective_price(self, obj):
+        return str(self._price(obj))
+
+    def get_on_sale(self, obj):
+        return obj.sale_price is not None and self._price(obj) == obj.sale_price
+
+
+# ----------------------------- query params (non-model) -----------------------------
+
+class CommaListField(serializers.CharField):
+    """
+    "a,b,c" -> ["a", "b", "c"]
+    """
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        return [v.strip() for v in value.split(",") if v.strip()]
+
+
+class CatalogSearchQuerySerializer(serializers.Serializer):
+    level = CommaListField(required=False)
+    category = CommaListField(required=False)
+    pricing_type = CommaListField(required=False)
+    language = CommaListField(required=False)
+    tag = CommaListField(required=False)
+    branch = CommaListField(required=False)
+    price_min = serializers.DecimalField(max_digits=18, decimal_places=2, min_value=0, required=False)
+    price_max = serializers.DecimalField(max_digits=18, decimal_places=2, min_value=0, required=False)
+    min_rating = serializers.DecimalField(max_digits=3, decimal_places=1, min_value=0, max_value=5, required=False)
+    ordering = serializers.ChoiceField(
+        choices=["newest", "rating", "popular", "price", "-price", "title"], default="newest",
+    )
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_level(self, value):
+        invalid = [v for v in value if v not in CourseLevel.values]
+        if invalid:
+            raise serializers.ValidationError(f"Unknown levels: {', '.join(invalid)}")
+        return value
+
+    def validate_pricing_type(self, value):
+        invalid = [v for v in value if v not in PricingType.values]
+        if invalid:
+            raise serializers.ValidationError(f"Unknown pricing types: {', '.join(invalid)}")
+        return value
+
+    def validate(self, attrs):
+        if attrs.get("price_min") is not None and attrs.get("price_max") is not None and attrs["price_min"] > attrs["price_max"]:
+            raise serializers.ValidationError({"price_max": "Must not be below price_min."})
+        return attrs
+
+
+# ----------------------------- action payloads (non-model) -----------------------------
+
+class CourseCloneSerializer(serializers.Serializer):
+    branch = serializers.UUIDField(required=False, allow_null=True, help_text="Target branch (default: the source course's branch).")
+    title = serializers.CharField(max_length=200, required=False)
+    slug = serializers.SlugField(max_length=200, required=False, help_text="Suffixed with -copy if taken in the target branch.")
+    include_instructors = serializers.BooleanField(default=False)
+
+    def validate_branch(self, value):
+        if value is not None and not Branch.objects.filter(pk=value).exists():
+            raise serializers.ValidationError("Unknown branch.")
+        return value
+
+
+class CoursePublishSerializer(serializers.Serializer):
+    publish_lessons = serializers.BooleanField(default=True, help_text="Also publish every active draft lesson.")
@@ -0,0 +1,248 @@
+# courses/services/catalog.py
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from courses.models import (
+    CatalogEntry,
+    Course,
+    CourseInstructor,
+    CourseStatus,
+    CourseTagging,
+    CourseVisibility,
+)
+from enrollments.models import Enrollment, EnrollmentStatus
+
+logger = logging.getLogger(__name__)
+
+
+# sale windows are evaluated when a page is built, keep this short
+CATALOG_CACHE_TIMEOUT = getattr(settings, "CATALOG_CACHE_TIMEOUT", 60 * 5)
+CATALOG_BROWSER_MAX_AGE = getattr(settings, "CATALOG_BROWSER_MAX_AGE", 60)
+CATALOG_BATCH_SIZE = getattr(settings, "CATALOG_BATCH_SIZE", 500)
+
+# enrollments that count towards "N students"
+COUNTED_ENROLLMENT_STATUSES = [EnrollmentStatus.ACTIVE, EnrollmentStatus.COMPLETED, EnrollmentStatus.EXPIRED]
+
+ENTRY_FIELDS = [
+    f.name for f in CatalogEntry._meta.concrete_fields
+    if f.name not in ("course", "rebuilt_at")
+] + ["rebuilt_at"]
+
+
+# ----------------------------- build -----------------------------
+
+def _primary_instructors(course_ids):
+    """
+    {course_id: CourseInstructor} one query, primary first then sort_order.
+    """
+    rows = (
+        CourseInstructor.objects.filter(course_id__in=course_ids, active=True)
+        .select_related("user", "user__instructor_profile")
+        .order_by("course_id", "-is_primary", "sort_order")
+    )
+    found = {}
+    for row in rows:
+        found.setdefault(row.course_id, row)
+    return found
+
+
+def _tags(course_ids):
+    rows = (
+        CourseTagging.objects.filter(course_id__in=course_ids, active=True, tag__active=True)
+        .order_by("tag__name")
+        .values_list("course_id", "tag_id", "tag__name", "tag__slug")
+    )
+    tags = {}
+    for course_id, tag_id, name, slug in rows:
+        tags.setdefault(course_id, []).append({"id": str(tag_id), "name": name, "slug": slug})
+    return tags
+
+
+def _enrollment_counts(course_ids):
+    rows = (
+        Enrollment.objects.filter(course_id__in=course_ids, status__in=COUNTED_ENROLLMENT_STATUSES)
+        .order_by()
+        .values_list("course_id")
+        .annotate(n=Count("id"))
+    )
+    return dict(rows)
+
+
+def _instructor_display(link):
+    if link is None:
+        return None, None, None
+    profile = getattr(link.user, "instructor_profile", None)
+    return (
+        link.user_id,
+        link.display_name or link.user.full_name,
+        link.headline or getattr(profile, "headline", None),
+    )
+
+
+def build_entries(course_ids):
+    """
+    CatalogEntry objects (unsaved) for the given courses in a fixed number of queries,
+    whatever the number of tags / instructors / enrollments per course.
+    """
+    courses = list(
+        Course.objects.filter(pk__in=course_ids).select_related("category", "pricing", "rating_summary")
+    )
+    ids = [c.pk for c in courses]
+    instructors = _primary_instructors(ids)
+    tags = _tags(ids)
+    enrollments = _enrollment_counts(ids)
+
+    entries = []
+    for course in courses:
+        pricing = getattr(course, "pricing", None)
+        summary = getattr(course, "rating_summary", None)
+        instructor_id, instructor_name, instructor_headline = _instructor_display(instructors.get(course.pk))
+
+        entries.append(CatalogEntry(
+            course=course,
+            branch_id=course.branch_id,
+            is_listed=(
+                course.active
+                and course.status == CourseStatus.PUBLISHED
+                and course.visibility == CourseVisibility.PUBLIC
+            ),
+            title=course.title,
+            slug=course.slug,
+            subtitle=course.subtitle,
+            short_description=course.short_description,
+            thumbnail_url=course.thumbnail_url,
+            language=course.language,
+            level=course.level,
+            estimated_duration_minutes=course.estimated_duration_minutes,
+            is_featured=course.is_featured,
+            published_at=course.published_at,
+            category_id=course.category_id,
+            category_name=course.category.name if course.category_id else None,
+            category_slug=course.category.slug if course.category_id else None,
+            pricing_type=pricing.pricing_type if pricing else CatalogEntry._meta.get_field("pricing_type").default,
+            currency_code=pricing.currency_code if pricing else CatalogEntry._meta.get_field("currency_code").default,
+            price=pricing.price if pricing else 0,
+            sale_price=pricing.sale_price if pricing else None,
+            sale_start_at=pricing.sale_start_at if pricing else None,
+            sale_end_at=pricing.sale_end_at if pricing else None,
+            rating_avg=summary.average_rating if summary else course.rating_avg,
+            rating_count=summary.total_reviews if summary else course.rating_count,
+            enrollment_count=enrollments.get(course.pk, 0),
+            instructor_id=instructor_id,
+            instructor_name=instructor_name,
+            instructor_headline=instructor_headline,
+            tags=tags.get(course.pk, []),
+        ))
+    return entries
+
+
+def rebuild_catalog(course_ids=None, batch_size=CATALOG_BATCH_SIZE) -> int:
+    """
+    Upserts the catalog rows of `course_ids` (None = every course) in batches.
+    """
+    if course_ids is None:
+        course_ids = Course.objects.order_by().values_list("pk", flat=True).iterator(chunk_size=batch_size)
+
+    written = 0
+    chunk = []
+
+    def flush():
+        nonlocal written
+        entries = build_entries(chunk)
+        with transaction.atomic():
+            CatalogEntry.objects.bulk_create(
+                entries,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["course"],
+                update_fields=ENTRY_FIELDS,
+            )
+        written += len(entries)
+        chunk.clear()
+
+    for course_id in course_ids:
+        chunk.append(course_id)
+        if len(chunk) >= batch_size:
+            flush()
+    if chunk:
+        flush()
+    return written
+
+
+# ----------------------------- incremental refresh -----------------------------
+
+_pending = threading.local()
+
+
+def _flush_pending():
+    ids = getattr(_pending, "ids", None)
+    if not ids:
+        return  # an earlier callback of the same transaction already did the work
+    _pending.ids = set()
+    try:
+        rebuild_catalog(ids)
+    except Exception as e:
+        # the source write already committed, `rebuild_catalog` command catches up
+        logger.warning(f"catalog refresh of {len(ids)} courses failed: {e}")
+
+
+def mark_courses_dirty(course_ids):
+    """
+    Collects changed courses and rebuilds them once, after the surrounding transaction commits
+    (immediately outside a transaction). Ids left over by a rolled back transaction are
+    simply rebuilt with the next commit.
+    """
+    course_ids = {pk for pk in course_ids if pk}
+    if not course_ids:
+        return
+    if getattr(_pending, "ids", None) is None:
+        _pending.ids = set()
+    _pending.ids.update(course_ids)
+    transaction.on_commit(_flush_pending)
+
+
+# ----------------------------- serving -----------------------------
+
+CATALOG_GENERATION_KEY = "courses:catalog:generation"
+
+
+def bump_catalog_generation():
+    """
+    Deleted courses take their entries with them and leave MAX(rebuilt_at) where it was:
+    this counter moves the watermark for them.
+    """
+    cache.add(CATALOG_GENERATION_KEY, 0, None)
+    try:
+        cache.incr(CATALOG_GENERATION_KEY)
+    except ValueError:  # evicted in between
+        cache.set(CATALOG_GENERATION_KEY, 1, None)
+
+
+def catalog_watermark():
+    """
+    Latest rebuild time (indexed MAX) + deletion counter. Every refresh or course delete
+    moves it, so cached pages retire themselves.
+    """
+    latest = CatalogEntry.objects.aggregate(latest=Max("rebuilt_at"))["latest"]
+    generation = cache.get(CATALOG_GENERATION_KEY, 0)
+    return f"{generation}:{latest.isoformat() if latest else '0'}"
+
+
+def catalog_cache_key(query_string):
+    digest = hashlib.md5(query_string.encode()).hexdigest()
+    return f"courses:catalog:{catalog_watermark()}:{digest}"
+
+
+def get_cached_catalog(query_string, build):
+    key = catalog_cache_key(query_string)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, CATALOG_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,146 @@
+# courses/services/categories.py
+import logging
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Length, Substr
+
+from courses.models import CourseCategory
+
+logger = logging.getLogger(__name__)
+
+
+# path = "<root id hex>/<child id hex>/.../<own id hex>/", every segment has the same width
+SEGMENT_LENGTH = 33
+PATH_MAX_LENGTH = CourseCategory._meta.get_field("path").max_length
+MAX_DEPTH = PATH_MAX_LENGTH // SEGMENT_LENGTH - 1
+
+
+def path_segment(pk):
+    return f"{pk.hex}/"
+
+
+def ancestor_ids(path):
+    """
+    Ids (hex) on a path, root first, the category itself last.
+    """
+    return [segment for segment in path.split("/") if segment]
+
+
+def descendants_q(path, prefix=""):
+    """
+    Lookup kwargs for the subtree under `path` (the category itself included):
+    a LIKE 'path%' on an indexed column, no recursion.
+    """
+    return {f"{prefix}path__startswith": path}
+
+
+def assign_path(category):
+    """
+    Sets category.path / depth from its parent (one query) and guards against cycles.
+    Returns the previous (path, depth) when the category moved, else None.
+    """
+    parent_path = ""
+    if category.parent_id:
+        parent_path = (
+            CourseCategory.objects.filter(pk=category.parent_id).values_list("path", flat=True).first()
+        ) or ""
+        if category.parent_id == category.pk or category.pk.hex in ancestor_ids(parent_path):
+            raise ValidationError({"parent": "A category cannot be moved under itself or one of its descendants."})
+
+    previous = None
+    if not category._state.adding:
+        previous = CourseCategory.objects.filter(pk=category.pk).values_list("path", "depth").first()
+
+    category.path = parent_path + path_segment(category.pk)
+    category.depth = len(ancestor_ids(category.path)) - 1
+    if category.depth > MAX_DEPTH:
+        raise ValidationError({"parent": f"Categories can be nested at most {MAX_DEPTH + 1} levels deep."})
+
+    if previous and previous[0] and previous[0] != category.path:
+        return previous
+    return None
+
+
+def validate_parent(category_pk, parent_id):
+    """
+    Checks a (re)parenting before anything is written: no cycle, and the category's whole
+    subtree still fits MAX_DEPTH under the new parent. Raises ValidationError like assign_path().
+    """
+    parent_path = ""
+    if parent_id:
+        parent_path = CourseCategory.objects.filter(pk=parent_id).values_list("path", flat=True).first() or ""
+        if category_pk and (parent_id == category_pk or category_pk.hex in ancestor_ids(parent_path)):
+            raise ValidationError({"parent": "A category cannot be moved under itself or one of its descendants."})
+
+    depth, height = len(ancestor_ids(parent_path)), 0
+    current = category_pk and CourseCategory.objects.filter(pk=category_pk).values_list("path", "depth").first()
+    if current and current[0]:
+        deepest = (
+            CourseCategory.objects.filter(**descendants_q(current[0]))
+            .order_by("-depth")
+            .values_list("depth", flat=True)
+            .first()
+        )
+        height = (deepest or current[1]) - current[1]
+    if depth + height > MAX_DEPTH:
+        raise ValidationError({"parent": f"Categories can be nested at most {MAX_DEPTH + 1} levels deep."})
+
+
+def move_subtree(old_path, old_depth, new_path, new_depth):
+    """
+    Re-prefixes every descendant of a moved category with one UPDATE.
+    """
+    deepest = (
+        CourseCategory.objects.filter(**descendants_q(old_path))
+        .order_by("-depth")
+        .values_list("depth", flat=True)
+        .first()
+    )
+    if deepest is not None and deepest - old_depth + new_depth > MAX_DEPTH:
+        raise ValidationError({"parent": f"Categories can be nested at most {MAX_DEPTH + 1} levels deep."})
+
+    return (
+        CourseCategory.objects.filter(**descendants_q(old_path))
+        .exclude(path=old_path)
+        .update(
+            path=Concat(Value(new_path), Substr("path", len(old_path) + 1, Length("path"))),
+            depth=F("depth") + (new_depth - old_depth),
+        )
+    )
+
+
+def rebuild_category_paths(batch_size=1000):
+    """
+    Recomputes every path / depth from the parent links (one read, bulk_update of the changed rows).
+    Returns (updated, unreachable); unreachable = categories stuck in a parent cycle, left untouched.
+    """
+    rows = list(CourseCategory.objects.values_list("id", "parent_id", "path", "depth"))
+    children = defaultdict(list)
+    current = {}
+    for pk, parent_id, path, depth in rows:
+        children[parent_id].append(pk)
+        current[pk] = (path, depth)
+
+    computed = {}
+    stack = [(pk, "", 0) for pk in children[None]]
+    while stack:
+        pk, parent_path, depth = stack.pop()
+        path = parent_path + path_segment(pk)
+        computed[pk] = (path, depth)
+        stack.extend((child, path, depth + 1) for child in children.get(pk, ()))
+
+    changed = [
+        CourseCategory(pk=pk, path=path, depth=depth)
+        for pk, (path, depth) in computed.items()
+        if current[pk] != (path, depth)
+    ]
+    with transaction.atomic():
+        CourseCategory.objects.bulk_update(changed, ["path", "depth"], batch_size=batch_size)
+
+    unreachable = len(rows) - len(computed)
+    if unreachable:
+        logger.warning("category paths: %s categories are part of a parent cycle", unreachable)
+    return len(changed), unreachable
@@ -0,0 +1,239 @@
+# courses/services/clone.py
+import logging
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from assessments.models import Assignment, Question, QuestionOption, Quiz, QuizQuestion
+from content.models import CourseModule, Lesson, LessonInstructorNote, LessonResource
+from content.services.tree import content_changes
+from courses.models import (
+    Course,
+    CourseCategory,
+    CourseFAQ,
+    CourseInstructor,
+    CourseOutcome,
+    CoursePricing,
+    CourseRequirement,
+    CourseStatus,
+    CourseTag,
+    CourseTagging,
+    CourseTargetAudience,
+)
+
+logger = logging.getLogger(__name__)
+
+
+CLONE_BATCH_SIZE = getattr(settings, "COURSE_CLONE_BATCH_SIZE", 500)
+
+
+def _copy(obj, **changes):
+    """
+    Turns a loaded row into a new unsaved one (fresh uuid) in place, FKs are set through *_id.
+    """
+    obj.id = uuid.uuid4()
+    obj._state.adding = True
+    obj._state.db = None
+    for name, value in changes.items():
+        setattr(obj, name, value)
+    return obj
+
+
+def _unique_slug(branch_id, slug):
+    taken = set(Course.objects.filter(branch_id=branch_id, slug__startswith=slug).values_list("slug", flat=True))
+    if slug not in taken:
+        return slug
+    n = 1
+    while True:
+        candidate = f"{slug}-copy" if n == 1 else f"{slug}-copy-{n}"
+        if candidate not in taken:
+            return candidate
+        n += 1
+
+
+def _branch_twin(model, obj_id, branch_id):
+    """
+    The row to use in the target branch for a branch-scoped lookup row (category, tag):
+    itself if shared / same branch, else the row with the same slug in the target branch.
+    """
+    if obj_id is None:
+        return None
+    row = model.objects.filter(pk=obj_id).values("branch_id", "slug").first()
+    if row is None or row["branch_id"] in (None, branch_id):
+        return obj_id
+    return model.objects.filter(branch_id=branch_id, slug=row["slug"]).values_list("id", flat=True).first()
+
+
+class CourseCloner:
+    """
+    Copies a course graph (catalog extras, assessments, modules, lessons, resources) into a
+    branch: every table is read once and written with one bulk_create, FKs are remapped
+    through in-memory {old id: new id} maps. No per-row signals or history rows.
+    """
+
+    def __init__(self, source, branch_id, user=None, title=None, slug=None, include_instructors=False,
+                 batch_size=CLONE_BATCH_SIZE):
+        self.source = source
+        self.branch_id = branch_id
+        self.cross_branch = source.branch_id != branch_id
+        self.user_id = getattr(user, "pk", None)
+        self.title = title
+        self.slug = slug
+        self.include_instructors = include_instructors
+        self.batch_size = batch_size
+        self.maps = {}
+        self.counts = Counter()
+
+    # ----------------------------- helpers -----------------------------
+
+    def remap(self, name, old_id):
+        """
+        New id for a copied row. References that point outside the course are kept
+        within the same branch and dropped across branches.
+        """
+        if old_id is None:
+            return None
+        mapping = self.maps.get(name, {})
+        if old_id in mapping:
+            return mapping[old_id]
+        return None if self.cross_branch else old_id
+
+    def bulk(self, model, rows, name=None, **changes):
+        """
+        Copies `rows` (changes may be callables of the row), stores the id map under `name`.
+        """
+        mapping = self.maps.setdefault(name, {}) if name else None
+        copies = []
+        for row in rows:
+            old_id = row.id
+            values = {k: (v(row) if callable(v) else v) for k, v in changes.items()}
+            copies.append(_copy(row, user_add_id=self.user_id, **values))
+            if mapping is not None:
+                mapping[old_id] = row.id
+        model.objects.bulk_create(copies, batch_size=self.batch_size)
+        self.counts[model._meta.model_name] += len(copies)
+        return copies
+
+    # ----------------------------- steps -----------------------------
+
+    def clone_course(self):
+        src = self.source
+        course = Course.objects.get(pk=src.pk)
+        _copy(
+            course,
+            branch_id=self.branch_id,
+            title=self.title or course.title,
+            slug=_unique_slug(self.branch_id, self.slug or course.slug),
+            category_id=_branch_twin(CourseCategory, course.category_id, self.branch_id),
+            status=CourseStatus.DRAFT,
+            published_at=None,
+            archived_at=None,
+            is_featured=False,
+            enrollment_count=0,
+            rating_avg=0,
+            rating_count=0,
+            content_version=0,
+            user_add_id=self.user_id,
+        )
+        course.save(force_insert=True)  # one row: keeps history + catalog signals
+        self.maps["course"] = {src.pk: course.pk}
+        self.course = course
+        return course
+
+    def clone_catalog_extras(self):
+        src_id, course_id = self.source.pk, self.course.pk
+        self.bulk(CoursePricing, CoursePricing.objects.filter(course_id=src_id), course_id=course_id)
+        for model in (CourseOutcome, CourseRequirement, CourseTargetAudience, CourseFAQ):
+            self.bulk(model, model.objects.filter(course_id=src_id), course_id=course_id)
+
+        taggings = []
+        for tagging in CourseTagging.objects.filter(course_id=src_id):
+            tag_id = _branch_twin(CourseTag, tagging.tag_id, self.branch_id)
+            if tag_id:
+                tagging.tag_id = tag_id
+                taggings.append(tagging)
+        self.bulk(CourseTagging, taggings, course_id=course_id)
+
+        if self.include_instructors:
+            self.bulk(CourseInstructor, CourseInstructor.objects.filter(course_id=src_id), course_id=course_id)
+
+    def clone_assessments(self):
+        src_id, course_id = self.source.pk, self.course.pk
+
+        # bank questions are shared inside a branch; only copied when they would cross branches
+        questions = Question.objects.filter(used_in_quizzes__quiz__course_id=src_id).distinct()
+        if self.cross_branch:
+            questions = [q for q in questions if q.branch_id is not None]
+            self.bulk(Question, questions, "question", branch_id=self.branch_id, bank_id=None, category_id=None)
+            self.bulk(
+                QuestionOption,
+                QuestionOption.objects.filter(question_id__in=list(self.maps["question"])),
+                question_id=lambda o: self.maps["question"][o.question_id],
+            )
+        self.maps.setdefault("question", {})
+
+        self.bulk(Quiz, Quiz.objects.filter(course_id=src_id), "quiz", course_id=course_id, branch_id=self.branch_id)
+        self.bulk(
+            QuizQuestion,
+            QuizQuestion.objects.filter(quiz__course_id=src_id),
+            quiz_id=lambda qq: self.maps["quiz"][qq.quiz_id],
+            question_id=lambda qq: self.maps["question"].get(qq.question_id, qq.question_id),
+        )
+        self.bulk(Assignment, Assignment.objects.filter(course_id=src_id), "assignment", course_id=course_id, branch_id=self.branch_id)
+
+    def clone_content(self):
+        src_id, course_id = self.source.pk, self.course.pk
+        self.bulk(CourseModule, CourseModule.objects.filter(course_id=src_id), "module", course_id=course_id, branch_id=self.branch_id)
+
+        lessons = list(Lesson.objects.filter(course_id=src_id))
+        # ids are assigned up front so prerequisite_lesson can point at a lesson of the same batch;
+        # body_hash is copied as-is, so the clone shares the source's rendered bodies
+        self.maps["lesson"] = {lesson.id: uuid.uuid4() for lesson in lessons}
+        copies = []
+        for lesson in lessons:
+            new_id = self.maps["lesson"][lesson.id]
+            _copy(
+                lesson,
+                course_id=course_id,
+                branch_id=self.branch_id,
+                module_id=self.maps["module"][lesson.module_id],
+                quiz_id=self.remap("quiz", lesson.quiz_id),
+                assignment_id=self.remap("assignment", lesson.assignment_id),
+                prerequisite_lesson_id=self.remap("lesson", lesson.prerequisite_lesson_id),
+                user_add_id=self.user_id,
+            )
+            lesson.id = new_id
+            copies.append(lesson)
+        Lesson.objects.bulk_create(copies, batch_size=self.batch_size)
+        self.counts["lesson"] += len(copies)
+
+        self.bulk(
+            LessonResource,
+            LessonResource.objects.filter(lesson__course_id=src_id),
+            lesson_id=lambda r: self.maps["lesson"][r.lesson_id],
+        )
+        self.bulk(
+            LessonInstructorNote,
+            LessonInstructorNote.objects.filter(lesson__course_id=src_id),
+            lesson_id=lambda n: self.maps["lesson"][n.lesson_id],
+        )
+
+    def run(self):
+        with transaction.atomic(), content_changes():
+            self.clone_course()
+            self.clone_catalog_extras()
+            self.clone_assessments()
+            self.clone_content()
+        logger.info("cloned course %s -> %s: %s", self.source.pk, self.course.pk, dict(self.counts))
+        return self.course
+
+
+def clone_course(source, branch_id, user=None, **options):
+    """
+    Deep copy of `source` into `branch_id` in one transaction. Returns (new course, {model: rows}).
+    """
+    cloner = CourseCloner(source, branch_id, user=user, **options)
+    course = cloner.run()
+    return course, {name: n for name, n in cloner.counts.items() if n}
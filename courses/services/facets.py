@@ -0,0 +1,218 @@
+# courses/services/facets.py
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+
+from django.conf import settings
+
+from courses.models import CatalogEntry, CourseCategory
+from courses.services.catalog import catalog_watermark
+from courses.services.categories import ancestor_ids
+from courses.services.pricing import annotate_effective_price
+
+
+# effective prices depend on sale windows, so the index also expires by age
+FACET_INDEX_MAX_AGE = getattr(settings, "CATALOG_FACET_INDEX_MAX_AGE", 60 * 5)
+
+# price facet buckets: [lower, upper) ; None = open
+PRICE_BUCKETS = getattr(settings, "CATALOG_PRICE_BUCKETS", [
+    (None, Decimal("0.01")),
+    (Decimal("0.01"), Decimal("1000")),
+    (Decimal("1000"), Decimal("5000")),
+    (Decimal("5000"), Decimal("10000")),
+    (Decimal("10000"), None),
+])
+RATING_THRESHOLDS = [Decimal("4.5"), Decimal("4"), Decimal("3.5"), Decimal("3")]
+
+# facets combined with OR inside, AND across
+SET_FACETS = ["level", "category", "pricing_type", "language", "tag", "branch"]
+
+ORDERINGS = {
+    "newest": lambda e: (e.published_at is None, -(e.published_at.timestamp() if e.published_at else 0)),
+    "rating": lambda e: (-e.rating_avg, -e.rating_count),
+    "popular": lambda e: -e.enrollment_count,
+    "price": lambda e: _price(e),
+    "-price": lambda e: -_price(e),
+    "title": lambda e: e.title.lower(),
+}
+
+
+def _price(entry):
+    # annotated by build_facet_index (priced in SQL), per row otherwise
+    price = getattr(entry, "current_price", None)
+    return Decimal(entry.effective_price() if price is None else price)
+
+
+def _price_bucket_label(lower, upper):
+    if lower is None:
+        return "free"
+    if upper is None:
+        return f"{lower}+"
+    return f"{lower}-{upper}"
+
+
+class FacetIndex:
+    """
+    Listed catalog entries numbered 0..n-1, one int bitset per facet value.
+    Filtering = AND/OR of ints, counting = int.bit_count(): no query per facet.
+    """
+
+    def __init__(self, entries, categories):
+        self.built_at = time.monotonic()
+        self.ids = [e.course_id for e in entries]
+        self.all = (1 << len(entries)) - 1
+        self.facets = {name: {} for name in SET_FACETS}
+
+        def add(facet, value, pos):
+            if value is not None:
+                key = str(value)
+                self.facets[facet][key] = self.facets[facet].get(key, 0) | (1 << pos)
+
+        prices = []
+        for pos, e in enumerate(entries):
+            add("level", e.level, pos)
+            add("pricing_type", e.pricing_type, pos)
+            add("language", e.language, pos)
+            add("branch", e.branch_id, pos)
+            add("category", e.category_id, pos)
+            for tag in e.tags or ():
+                add("tag", tag.get("slug"), pos)
+            prices.append((_price(e), pos))
+
+        # a category matches its whole subtree: own bits are OR'ed into every ancestor on the path
+        self.category_names = {str(pk): name for pk, name, _ in categories}
+        own = dict(self.facets["category"])
+        subtree = {}
+        for pk, _, path in categories:
+            bits = own.get(str(pk), 0)
+            if not bits:
+                continue
+            for segment in ancestor_ids(path) or [pk.hex]:
+                key = str(uuid.UUID(segment))
+                subtree[key] = subtree.get(key, 0) | bits
+        self.facets["category"] = {pk: bits for pk, bits in subtree.items() if pk in self.category_names}
+
+        prices.sort()
+        self.price_values = [p for p, _ in prices]
+        self.price_positions = [pos for _, pos in prices]
+        self.price_buckets = {
+            _price_bucket_label(lower, upper): self.price_range(lower, upper, inclusive_upper=False)
+            for lower, upper in PRICE_BUCKETS
+        }
+        self.ratings = [e.rating_avg for e in entries]
+        self.rating = {str(t): self.min_rating(t) for t in RATING_THRESHOLDS}
+
+        self.orderings = {
+            name: [pos for pos, _ in sorted(enumerate(entries), key=lambda pe: key(pe[1]))]
+            for name, key in ORDERINGS.items()
+        }
+
+    @staticmethod
+    def _bits(positions):
+        bits = 0
+        for pos in positions:
+            bits |= 1 << pos
+        return bits
+
+    def min_rating(self, threshold):
+        return self._bits(pos for pos, value in enumerate(self.ratings) if value >= threshold)
+
+    def price_range(self, lower=None, upper=None, inclusive_upper=True):
+        lo = 0 if lower is None else bisect_left(self.price_values, lower)
+        if upper is None:
+            hi = len(self.price_values)
+        elif inclusive_upper:
+            hi = bisect_right(self.price_values, upper)
+        else:
+            hi = bisect_left(self.price_values, upper)
+        return self._bits(self.price_positions[lo:hi])
+
+    # ----------------------------- querying -----------------------------
+
+    def _set_filter(self, facet, values):
+        bits = 0
+        for value in values:
+            bits |= self.facets[facet].get(str(value), 0)
+        return bits
+
+    def search(self, selected, price_min=None, price_max=None, min_rating=None):
+        """
+        selected: {facet: [values]} for SET_FACETS.
+        Returns (matching bits, facet counts). Facet counts are disjunctive: each facet
+        is counted against every *other* active filter, so multi-select keeps working.
+        """
+        filters = {facet: self._set_filter(facet, values) for facet, values in selected.items() if values}
+        if price_min is not None or price_max is not None:
+            filters["price"] = self.price_range(price_min, price_max)
+        if min_rating is not None:
+            filters["rating"] = self.rating.get(str(min_rating)) or self.min_rating(min_rating)
+
+        def combined(skip=None):
+            bits = self.all
+            for name, mask in filters.items():
+                if name != skip:
+                    bits &= mask
+            return bits
+
+        matched = combined()
+        counts = {}
+        for facet in SET_FACETS:
+            base = combined(skip=facet)
+            counts[facet] = {
+                value: c for value, bits in self.facets[facet].items() if (c := (bits & base).bit_count())
+            }
+        base = combined(skip="price")
+        counts["price"] = {label: (bits & base).bit_count() for label, bits in self.price_buckets.items()}
+        base = combined(skip="rating")
+        counts["rating"] = {threshold: (bits & base).bit_count() for threshold, bits in self.rating.items()}
+        return matched, counts
+
+    def page(self, bits, ordering="newest", offset=0, limit=20):
+        order = self.orderings.get(ordering) or self.orderings["newest"]
+        ids = []
+        skipped = 0
+        for pos in order:
+            if bits >> pos & 1:
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                ids.append(self.ids[pos])
+                if len(ids) >= limit:
+                    break
+        return ids
+
+
+# ----------------------------- process-wide index -----------------------------
+
+_lock = threading.Lock()
+_index = {"watermark": None, "index": None}
+
+
+def build_facet_index():
+    entries = list(
+        annotate_effective_price(CatalogEntry.objects.filter(is_listed=True)).only(
+            "course", "branch", "level", "pricing_type", "language", "category", "tags",
+            "price", "sale_price", "sale_start_at", "sale_end_at", "rating_avg", "rating_count",
+            "enrollment_count", "published_at", "title",
+        )
+    )
+    categories = list(CourseCategory.objects.filter(active=True).values_list("id", "name", "path"))
+    return FacetIndex(entries, categories)
+
+
+def get_facet_index():
+    """
+    Rebuilt when the catalog watermark moves (any CatalogEntry refresh) or the index gets old.
+    """
+    watermark = catalog_watermark()
+    current = _index["index"]
+    if current is not None and _index["watermark"] == watermark and time.monotonic() - current.built_at < FACET_INDEX_MAX_AGE:
+        return current
+    with _lock:
+        current = _index["index"]
+        if current is None or _index["watermark"] != watermark or time.monotonic() - current.built_at >= FACET_INDEX_MAX_AGE:
+            _index["index"] = current = build_facet_index()
+            _index["watermark"] = watermark
+    return current
@@ -0,0 +1,68 @@
+# courses/services/pricing.py
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, Q, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from courses.models import CoursePricing, PricingType
+
+
+EffectivePrice = namedtuple("EffectivePrice", ["amount", "currency_code", "on_sale"])
+
+DEFAULT_CURRENCY = CoursePricing._meta.get_field("currency_code").default
+PRICE_FIELD = DecimalField(max_digits=18, decimal_places=2)
+
+
+def sale_active_q(prefix="", at=None):
+    """
+    Q for "the sale price applies at `at`", same rule as CoursePricing.effective_price().
+    prefix: path to the pricing fields ("" on CoursePricing / CatalogEntry, "pricing__" on Course, ...).
+    """
+    at = at or timezone.now()
+    return (
+        Q(**{f"{prefix}sale_price__isnull": False})
+        & (Q(**{f"{prefix}sale_start_at__isnull": True}) | Q(**{f"{prefix}sale_start_at__lte": at}))
+        & (Q(**{f"{prefix}sale_end_at__isnull": True}) | Q(**{f"{prefix}sale_end_at__gte": at}))
+    )
+
+
+def effective_price_expression(prefix="", at=None):
+    """
+    The effective price as one SQL CASE, so a whole listing / cart is priced by the database.
+    A missing pricing row (LEFT JOIN) prices as 0, like a free course.
+    """
+    return Coalesce(
+        Case(
+            When(**{f"{prefix}pricing_type": PricingType.FREE}, then=Value(Decimal(0))),
+            When(sale_active_q(prefix, at), then=F(f"{prefix}sale_price")),
+            default=F(f"{prefix}price"),
+            output_field=PRICE_FIELD,
+        ),
+        Value(Decimal(0)),
+        output_field=PRICE_FIELD,
+    )
+
+
+def annotate_effective_price(queryset, prefix="", at=None, name="current_price"):
+    return queryset.annotate(**{name: effective_price_expression(prefix, at)})
+
+
+def effective_prices(course_ids, at=None):
+    """
+    {course_id: EffectivePrice} for a set of courses, one query. Courses without pricing are free.
+    """
+    course_ids = set(course_ids)
+    rows = (
+        annotate_effective_price(CoursePricing.objects.filter(course_id__in=course_ids), at=at)
+        .annotate(on_sale=Case(
+            When(Q(pricing_type=PricingType.FREE), then=Value(False)),
+            When(sale_active_q(at=at), then=Value(True)),
+            default=Value(False),
+        ))
+        .values_list("course_id", "current_price", "currency_code", "on_sale")
+    )
+    prices = {course_id: EffectivePrice(amount, currency, bool(on_sale)) for course_id, amount, currency, on_sale in rows}
+    free = EffectivePrice(Decimal(0), DEFAULT_CURRENCY, False)
+    return {course_id: prices.get(course_id, free) for course_id in course_ids}
@@ -0,0 +1,64 @@
+# courses/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import InstructorProfile
+from courses.models import (
+    Course,
+    CourseCategory,
+    CourseInstructor,
+    CoursePricing,
+    CourseTag,
+    CourseTagging,
+)
+from courses.services.catalog import bump_catalog_generation, mark_courses_dirty
+from enrollments.models import Enrollment
+from reviews.models import CourseRatingSummary
+
+
+# ----------------------------- catalog read model -----------------------------
+
+@receiver(post_save, sender=Course, dispatch_uid="catalog_course_saved")
+def catalog_course_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_courses_dirty([instance.pk])
+
+
+@receiver(post_delete, sender=Course, dispatch_uid="catalog_course_deleted")
+def catalog_course_deleted(sender, instance, **kwargs):
+    # the entry cascades away: nothing to rebuild, but cached pages / facets still list it
+    transaction.on_commit(bump_catalog_generation)
+
+
+@receiver(post_save, sender=CoursePricing, dispatch_uid="catalog_pricing_saved")
+@receiver(post_delete, sender=CoursePricing, dispatch_uid="catalog_pricing_deleted")
+@receiver(post_save, sender=CourseRatingSummary, dispatch_uid="catalog_rating_saved")
+@receiver(post_delete, sender=CourseRatingSummary, dispatch_uid="catalog_rating_deleted")
+@receiver(post_save, sender=CourseInstructor, dispatch_uid="catalog_instructor_saved")
+@receiver(post_delete, sender=CourseInstructor, dispatch_uid="catalog_instructor_deleted")
+@receiver(post_save, sender=CourseTagging, dispatch_uid="catalog_tagging_saved")
+@receiver(post_delete, sender=CourseTagging, dispatch_uid="catalog_tagging_deleted")
+@receiver(post_save, sender=Enrollment, dispatch_uid="catalog_enrollment_saved")
+@receiver(post_delete, sender=Enrollment, dispatch_uid="catalog_enrollment_deleted")
+def catalog_course_part_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_courses_dirty([instance.course_id])
+
+
+@receiver(post_save, sender=CourseTag, dispatch_uid="catalog_tag_saved")
+def catalog_tag_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_courses_dirty(CourseTagging.objects.filter(tag=instance).values_list("course_id", flat=True))
+
+
+@receiver(post_save, sender=CourseCategory, dispatch_uid="catalog_category_saved")
+def catalog_category_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_courses_dirty(Course.objects.filter(category=instance).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=InstructorProfile, dispatch_uid="catalog_instructor_profile_saved")
+def catalog_instructor_profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_courses_dirty(CourseInstructor.objects.filter(user_id=instance.user_id).values_list("course_id", flat=True))
@@ -13,6 +13,7 @@ from courses.views import (
     CourseTargetAudienceViewSet,
     CourseFAQViewSet,
     CourseReviewViewSet,
+    CatalogViewSet,
 )
 
 router = BulkRouter()
@@ -27,6 +28,7 @@ router.register(r"course-requirements", CourseRequirementViewSet, basename="cour
 router.register(r"course-target-audiences", CourseTargetAudienceViewSet, basename="course-target-audience")
 router.register(r"course-faqs", CourseFAQViewSet, basename="course-faq")
 router.register(r"course-reviews", CourseReviewViewSet, basename="course-review")
+router.register(r"catalog", CatalogViewSet, basename="catalog")
 
 urlpatterns = [
     path("", include(router.urls)),
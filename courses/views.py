@@ -1,4 +1,12 @@
+from django.utils.cache import patch_cache_control
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+
 from core.utils.BulkModelViewSet import BaseModelViewSet
+from core.utils.branchScope import get_branch_scope
 from courses.models import (
     CourseCategory,
     CourseTag,
@@ -11,6 +19,7 @@ from courses.models import (
     CourseTargetAudience,
     CourseFAQ,
     CourseReview,
+    CatalogEntry,
 )
 from courses.serializers import (
     CourseCategorySerializer,
@@ -24,6 +33,10 @@ from courses.serializers import (
     CourseTargetAudienceSerializer,
     CourseFAQSerializer,
     CourseReviewSerializer,
+    CatalogEntrySerializer,
+    CatalogSearchQuerySerializer,
+    CourseCloneSerializer,
+    CoursePublishSerializer,
 )
 from courses.filters import (
     CourseCategoryFilter,
@@ -37,7 +50,14 @@ from courses.filters import (
     CourseTargetAudienceFilter,
     CourseFAQFilter,
     CourseReviewFilter,
+    CatalogEntryFilter,
 )
+from content.serializers import CourseContentStatsSerializer
+from content.services.publish import publish_course
+from courses.services.catalog import CATALOG_BROWSER_MAX_AGE, get_cached_catalog
+from courses.services.clone import clone_course
+from courses.services.facets import SET_FACETS, get_facet_index
+from courses.services.pricing import annotate_effective_price
 
 
 class CourseCategoryViewSet(BaseModelViewSet):
@@ -63,6 +83,50 @@ class CourseViewSet(BaseModelViewSet):
     search_fields = ["title", "slug", "subtitle", "short_description"]
     ordering_fields = "__all__"
 
+    @action(detail=True, methods=["post"])
+    def clone(self, request, pk=None):
+        """
+        Deep copy of the course (modules, lessons, resources, quizzes, assignments, catalog extras)
+        into the requested branch (default: same branch) as a new draft, in one transaction.
+        """
+        source = self.get_object()
+        params = CourseCloneSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        branch_id = data.get("branch") or source.branch_id
+        scope = get_branch_scope(request.user)
+        if scope != "all" and str(branch_id) != scope:
+            raise PermissionDenied("You can only clone into your own branch.")
+
+        course, counts = clone_course(
+            source,
+            branch_id,
+            user=request.user,
+            title=data.get("title"),
+            slug=data.get("slug"),
+            include_instructors=data["include_instructors"],
+        )
+        return Response(
+            {"course": self.get_serializer(course).data, "copied": counts},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=True, methods=["post"])
+    def publish(self, request, pk=None):
+        """
+        Publish pipeline, one transaction: course (+ draft lessons) published, content stats
+        stored, CourseProgress.total_lessons synced, course tree warmed after commit.
+        """
+        course = self.get_object()
+        params = CoursePublishSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        stats = publish_course(course, publish_lessons=params.validated_data["publish_lessons"])
+        return Response({
+            "course": self.get_serializer(course).data,
+            "stats": CourseContentStatsSerializer(stats).data if stats else None,
+        })
+
 
 class CourseTaggingViewSet(BaseModelViewSet):
     queryset = CourseTagging.objects.all()
@@ -126,3 +190,74 @@ class CourseReviewViewSet(BaseModelViewSet):
     filterset_class = CourseReviewFilter
     search_fields = ["status", "note"]
     ordering_fields = "__all__"
+
+
+# ----------------------------- public catalog -----------------------------
+
+class CatalogViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Public, anonymous catalog served from the CatalogEntry read model (one flat row per course).
+    Responses are cached per query string under the catalog watermark.
+    """
+
+    queryset = CatalogEntry.objects.filter(is_listed=True)
+    serializer_class = CatalogEntrySerializer
+    filterset_class = CatalogEntryFilter
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ["title", "subtitle", "short_description", "instructor_name", "category_name"]
+    ordering_fields = ["published_at", "rating_avg", "rating_count", "enrollment_count", "price", "current_price", "title"]
+
+    def get_queryset(self):
+        # sale windows are evaluated by the database for the whole page
+        return annotate_effective_price(super().get_queryset())
+
+    def _cached(self, request, build):
+        data = get_cached_catalog(request.get_full_path(), build)
+        response = Response(data)
+        patch_cache_control(response, public=True, max_age=CATALOG_BROWSER_MAX_AGE)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, lambda: super(CatalogViewSet, self).list(request, *args, **kwargs).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, lambda: super(CatalogViewSet, self).retrieve(request, *args, **kwargs).data)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Faceted search over the in-memory facet index: filtered page + every facet count in one go.
+        ?level=beginner,advanced&category=<id>&tag=python&price_min=0&price_max=5000&min_rating=4&ordering=popular
+        """
+        params = CatalogSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        def build():
+            index = get_facet_index()
+            selected = {facet: data.get(facet) for facet in SET_FACETS}
+            bits, counts = index.search(
+                selected,
+                price_min=data.get("price_min"),
+                price_max=data.get("price_max"),
+                min_rating=data.get("min_rating"),
+            )
+            offset = (data["page"] - 1) * data["page_size"]
+            ids = index.page(bits, data["ordering"], offset=offset, limit=data["page_size"])
+
+            entries = CatalogEntry.objects.in_bulk(ids)
+            counts["category"] = [
+                {"id": pk, "name": index.category_names.get(pk), "count": n}
+                for pk, n in counts["category"].items()
+            ]
+            return {
+                "count": bits.bit_count(),
+                "page": data["page"],
+                "page_size": data["page_size"],
+                "results": CatalogEntrySerializer([entries[pk] for pk in ids if pk in entries], many=True).data,
+                "facets": counts,
+            }
+
+        return self._cached(request, build)
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from enrollments.services.expiry import EXPIRY_CHUNK_SIZE, expire_enrollments, overdue_count
+
+
+class Command(BaseCommand):
+    help = "Expire every enrollment past access_ends_at in bounded, set-based chunks (cron, or --every for a long-running sweeper)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=EXPIRY_CHUNK_SIZE)
+        parser.add_argument("--max-chunks", type=int, default=None, help="Stop after this many chunks (the rest waits for the next run).")
+        parser.add_argument("--every", type=int, default=0, help="Keep running, sweeping every N seconds.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the overdue enrollments.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            self.stdout.write(f"{overdue_count()} enrollments are overdue")
+            return
+
+        while True:
+            expired = expire_enrollments(chunk_size=max(options["chunk_size"], 1), max_chunks=options["max_chunks"])
+            self.stdout.write(self.style.SUCCESS(f"Expired {expired} enrollments"))
+            if options["every"] <= 0:
+                return
+            time.sleep(options["every"])
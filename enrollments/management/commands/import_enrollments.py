@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from enrollments.models import CourseCohort
+from enrollments.services.imports import IMPORT_CHUNK_SIZE, EnrollmentImportError, import_cohort_enrollments
+
+
+class Command(BaseCommand):
+    help = "Enroll a CSV of learners (email[, first_name, last_name, phone]) into a cohort, streamed in bulk chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("cohort", help="CourseCohort id")
+        parser.add_argument("csv_path")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument("--no-create-users", action="store_true", help="Report unknown emails instead of creating users.")
+
+    def handle(self, *args, **options):
+        cohort = CourseCohort.objects.filter(pk=options["cohort"]).first()
+        if cohort is None:
+            raise CommandError(f"Unknown cohort {options['cohort']}")
+
+        try:
+            with open(options["csv_path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_cohort_enrollments(
+                    cohort, stream, create_users=not options["no_create_users"], chunk_size=options["chunk_size"],
+                )
+        except (OSError, EnrollmentImportError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Enrolled {report.enrolled} of {report.rows} rows ({report.users_created} new users)"
+        ))
+        for error in report.errors:
+            self.stdout.write(self.style.WARNING(f"line {error['line']} {error['email']}: {error['error']}"))
+        if report.error_count > len(report.errors):
+            self.stdout.write(self.style.WARNING(f"... {report.error_count - len(report.errors)} more errors"))
@@ -0,0 +1,52 @@
+# enrollments/permissions.py
+from rest_framework.permissions import BasePermission
+
+from content.models import LessonStatus
+
+from content.services.prerequisites import is_released_for_learner
+from enrollments.services.entitlements import can_view_lesson, has_course_access, is_learner
+
+
+class HasCourseEntitlement(BasePermission):
+    """
+    Content gate for learners, answered from the cached entitlement map.
+    Requests naming a course (?course= or {"course": ...}) are checked up front,
+    objects through their course (lessons also honour previews / unpublished overrides).
+    Staff and instructors are not gated here.
+    """
+
+    message = "You do not have access to this course."
+
+    def has_permission(self, request, view):
+        if not is_learner(request.user):
+            return True
+        course_id = request.query_params.get("course")
+        if course_id is None and isinstance(request.data, dict):
+            course_id = request.data.get("course")
+        return course_id is None or has_course_access(request.user, course_id)
+
+    def has_object_permission(self, request, view, obj):
+        if not is_learner(request.user):
+            return True
+        lesson = obj if hasattr(obj, "is_preview") else getattr(obj, "lesson", None)
+        if lesson is not None:
+            return can_view_lesson(request.user, lesson)
+        return has_course_access(request.user, obj.course_id)
+
+
+class LessonReleased(BasePermission):
+    """
+    Release gate (release date, days after enrollment, prerequisite completed) on opening a
+    lesson or one of its resources, through the cached prerequisite graph.
+    Published previews and staff / instructors are not gated.
+    """
+
+    message = "This lesson is not released yet."
+
+    def has_object_permission(self, request, view, obj):
+        if view.action != "retrieve" or not is_learner(request.user):
+            return True
+        lesson = obj if hasattr(obj, "is_preview") else getattr(obj, "lesson", None)
+        if lesson is None or (lesson.is_preview and lesson.status == LessonStatus.PUBLISHED):
+            return True
+        return is_released_for_learner(request.user, lesson)
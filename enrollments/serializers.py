@@ -1,3 +1,5 @@
+from rest_framework import serializers
+
 from core.utils.AdaptedBulkSerializer import BulkModelSerializer
 from enrollments.models import (
     CourseCohort,
@@ -36,3 +38,11 @@ class EnrollmentEventSerializer(BulkModelSerializer):
     class Meta(BulkModelSerializer.Meta):
         model = EnrollmentEvent
         fields = "__all__"
+
+
+# ----------------------------- action payloads (non-model) -----------------------------
+
+class CohortImportSerializer(serializers.Serializer):
+    # CSV with an "email" column, optional first_name / last_name / phone
+    file = serializers.FileField()
+    create_users = serializers.BooleanField(default=True)
@@ -0,0 +1,225 @@
+# enrollments/services/calendar.py
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from assessments.models import Assignment, AssignmentStatus, Quiz, QuizStatus
+from content.models import Lesson, LessonStatus
+from enrollments.models import Enrollment, EnrollmentStatus
+
+
+CALENDAR_TOKEN_SALT = "enrollments.calendar"
+CALENDAR_CACHE_TIMEOUT = getattr(settings, "CALENDAR_CACHE_TIMEOUT", 6 * 60 * 60)
+# how long calendar clients may reuse a feed before polling again
+CALENDAR_FEED_MAX_AGE = getattr(settings, "CALENDAR_FEED_MAX_AGE", 15 * 60)
+# events that ended longer ago than this are left out of the feed
+CALENDAR_PAST_DAYS = getattr(settings, "CALENDAR_PAST_DAYS", 30)
+CALENDAR_PRODID = getattr(settings, "CALENDAR_PRODID", "-//LMS//Course calendar//EN")
+CALENDAR_UID_DOMAIN = getattr(settings, "CALENDAR_UID_DOMAIN", "lms.local")
+LIVE_SESSION_DEFAULT_MINUTES = 60
+
+
+# ----------------------------- feed tokens -----------------------------
+
+def calendar_token(user):
+    # the per-user version makes the URL revocable: rotate_calendar_token() retires every older one
+    return signing.dumps([str(user.pk), user.calendar_token_version], salt=CALENDAR_TOKEN_SALT)
+
+
+def rotate_calendar_token(user):
+    get_user_model().objects.filter(pk=user.pk).update(calendar_token_version=F("calendar_token_version") + 1)
+    user.refresh_from_db(fields=["calendar_token_version"])
+    return calendar_token(user)
+
+
+def user_id_from_token(token):
+    """
+    User id of a valid token whose version is still current, else None.
+    """
+    try:
+        payload = signing.loads(token, salt=CALENDAR_TOKEN_SALT)
+    except signing.BadSignature:
+        return None
+    if isinstance(payload, str):
+        payload = [payload, 0]  # issued before tokens carried a version
+    try:
+        user_id, version = payload
+    except (TypeError, ValueError):
+        return None
+    if not get_user_model().objects.filter(pk=user_id, calendar_token_version=version).exists():
+        return None
+    return user_id
+
+
+# ----------------------------- schedule fingerprint -----------------------------
+
+def active_enrollment_q(now=None):
+    now = now or timezone.now()
+    return (
+        Q(status=EnrollmentStatus.ACTIVE, active=True)
+        & (Q(access_starts_at__isnull=True) | Q(access_starts_at__lte=now))
+        & (Q(access_ends_at__isnull=True) | Q(access_ends_at__gt=now))
+    )
+
+
+def schedule_fingerprint(user_id):
+    """
+    One query: the learner's active courses with their content_version (bumped by lesson,
+    quiz and assignment writes). ([course ids], etag) - the etag changes whenever the feed would.
+    """
+    rows = sorted(
+        Enrollment.objects.filter(active_enrollment_q(), user_id=user_id, user__is_active=True)
+        .values_list("course_id", "course__content_version")
+        .distinct()
+    )
+    digest = hashlib.sha1(repr((str(user_id), [(str(pk), version) for pk, version in rows])).encode("utf-8")).hexdigest()
+    return [pk for pk, _ in rows], digest
+
+
+# ----------------------------- events -----------------------------
+
+def collect_events(course_ids, now=None):
+    """
+    Live sessions, assignment deadlines and quiz closing times of every course at once:
+    three queries whatever the number of courses.
+    """
+    now = now or timezone.now()
+    since = now - timedelta(days=CALENDAR_PAST_DAYS)
+    events = []
+
+    lessons = (
+        Lesson.objects.filter(
+            course_id__in=course_ids, status=LessonStatus.PUBLISHED, active=True, module__active=True,
+            starts_at__isnull=False, starts_at__gte=since,
+        )
+        .values("id", "title", "summary", "meeting_url", "starts_at", "ends_at", "duration_seconds", "updated", "course__title")
+    )
+    for row in lessons:
+        ends_at = row["ends_at"] or row["starts_at"] + (
+            timedelta(seconds=row["duration_seconds"]) if row["duration_seconds"] else timedelta(minutes=LIVE_SESSION_DEFAULT_MINUTES)
+        )
+        events.append({
+            "uid": f"lesson-{row['id']}",
+            "summary": f"{row['course__title']}: {row['title']}",
+            "description": row["summary"] or "",
+            "url": row["meeting_url"],
+            "start": row["starts_at"],
+            "end": ends_at,
+            "updated": row["updated"],
+        })
+
+    assignments = (
+        Assignment.objects.filter(
+            course_id__in=course_ids, status=AssignmentStatus.PUBLISHED, active=True, due_at__gte=since,
+        )
+        .values("id", "title", "due_at", "updated", "course__title")
+    )
+    for row in assignments:
+        events.append({
+            "uid": f"assignment-{row['id']}",
+            "summary": f"Due: {row['title']} ({row['course__title']})",
+            "start": row["due_at"],
+            "end": row["due_at"],
+            "updated": row["updated"],
+        })
+
+    quizzes = (
+        Quiz.objects.filter(
+            course_id__in=course_ids, status=QuizStatus.PUBLISHED, active=True, available_until__gte=since,
+        )
+        .values("id", "title", "available_until", "updated", "course__title")
+    )
+    for row in quizzes:
+        events.append({
+            "uid": f"quiz-{row['id']}",
+            "summary": f"Quiz closes: {row['title']} ({row['course__title']})",
+            "start": row["available_until"],
+            "end": row["available_until"],
+            "updated": row["updated"],
+        })
+
+    events.sort(key=lambda event: (event["start"], event["uid"]))
+    return events
+
+
+# ----------------------------- iCalendar (RFC 5545) -----------------------------
+
+def _escape(text):
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line):
+    # content lines are limited to 75 octets, continuation lines start with a space
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:  # never split a utf-8 sequence
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts)
+
+
+def render_ics(events, name="Course schedule", now=None):
+    now = now or timezone.now()
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{CALENDAR_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for event in events:
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{event['uid']}@{CALENDAR_UID_DOMAIN}",
+            f"DTSTAMP:{_stamp(now)}",
+            f"LAST-MODIFIED:{_stamp(event['updated'])}",
+            f"DTSTART:{_stamp(event['start'])}",
+            f"DTEND:{_stamp(event['end'])}",
+            f"SUMMARY:{_escape(event['summary'])}",
+        ]
+        if event.get("description"):
+            lines.append(f"DESCRIPTION:{_escape(event['description'])}")
+        if event.get("url"):
+            lines += [f"URL:{event['url']}", f"LOCATION:{_escape(event['url'])}"]
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+# ----------------------------- cached feed -----------------------------
+
+def calendar_cache_key(etag):
+    return f"enrollments:ics:{etag}"
+
+
+def get_calendar_feed(course_ids, etag):
+    """
+    ICS text for a schedule_fingerprint() result. The cache key is the fingerprint, so any
+    enrollment or schedule change produces a new key and stale feeds simply age out:
+    a poll costs the fingerprint query plus a cache hit.
+    """
+    key = calendar_cache_key(etag)
+    feed = cache.get(key)
+    if feed is None:
+        feed = render_ics(collect_events(course_ids))
+        cache.set(key, feed, CALENDAR_CACHE_TIMEOUT)
+    return feed
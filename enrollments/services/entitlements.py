@@ -0,0 +1,163 @@
+# enrollments/services/entitlements.py
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+
+from accounts.models import UserType
+from content.models import LessonStatus
+from enrollments.models import Enrollment, EnrollmentStatus
+
+
+ENTITLEMENTS_CACHE_TIMEOUT = getattr(settings, "ENTITLEMENTS_CACHE_TIMEOUT", 60 * 60)
+GRANTING_STATUSES = (EnrollmentStatus.ACTIVE, EnrollmentStatus.COMPLETED)
+
+# access window (None = unbounded) + override flags of one course, times are timestamps
+Entitlement = namedtuple("Entitlement", ["starts_at", "ends_at", "access_type", "can_download", "can_view_unpublished"])
+
+
+def is_learner(user):
+    """
+    Only students are gated by entitlements; staff and instructors see content through branch scope.
+    """
+    return (
+        getattr(user, "user_type", None) == UserType.STUDENT
+        and not user.is_staff
+        and not user.is_superuser
+    )
+
+
+def is_open(entitlement, now=None):
+    now = (now or timezone.now()).timestamp()
+    return (
+        (entitlement.starts_at is None or entitlement.starts_at <= now)
+        and (entitlement.ends_at is None or now <= entitlement.ends_at)
+    )
+
+
+# ----------------------------- build + cache -----------------------------
+
+def _ts(value):
+    return value.timestamp() if value else None
+
+
+def _merge(a, b):
+    # several granting enrollments for a course (re-purchase, completed + active): widest window wins
+    return Entitlement(
+        None if a.starts_at is None or b.starts_at is None else min(a.starts_at, b.starts_at),
+        None if a.ends_at is None or b.ends_at is None else max(a.ends_at, b.ends_at),
+        a.access_type if a.ends_at is None else b.access_type,
+        a.can_download or b.can_download,
+        a.can_view_unpublished or b.can_view_unpublished,
+    )
+
+
+def build_entitlements(user_id):
+    """
+    {course_id (str): Entitlement} in one query. The window combines the enrollment's
+    access_starts_at / access_ends_at with the cohort window (content opens with the batch
+    and closes when it ends); the override's override_access_ends_at replaces the end date.
+    """
+    rows = (
+        Enrollment.objects.filter(user_id=user_id, status__in=GRANTING_STATUSES, active=True)
+        .values_list(
+            "course_id", "access_type", "access_starts_at", "access_ends_at", "cohort__start_at", "cohort__end_at",
+            "override__override_access_ends_at", "override__can_download_resources",
+            "override__can_view_even_if_unpublished", "override__active",
+        )
+    )
+    found = {}
+    for (
+        course_id, access_type, starts_at, ends_at, cohort_start, cohort_end,
+        override_ends, can_download, can_view, override_active,
+    ) in rows:
+        if not override_active:
+            override_ends, can_download, can_view = None, False, False
+        starts = max((value for value in (starts_at, cohort_start) if value), default=None)
+        ends = override_ends or min((value for value in (ends_at, cohort_end) if value), default=None)
+        entitlement = Entitlement(_ts(starts), _ts(ends), access_type, bool(can_download), bool(can_view))
+        key = str(course_id)
+        found[key] = _merge(found[key], entitlement) if key in found else entitlement
+    return found
+
+
+def entitlements_cache_key(user_id, version):
+    return f"enrollments:entitlements:{user_id}:{version}"
+
+
+def get_entitlements(user):
+    """
+    Cached under User.entitlements_version, which the authenticated request already
+    carries: a warm check costs no query at all.
+    """
+    key = entitlements_cache_key(user.pk, getattr(user, "entitlements_version", 0))
+    entitlements = cache.get(key)
+    if entitlements is None:
+        entitlements = build_entitlements(user.pk)
+        cache.set(key, entitlements, ENTITLEMENTS_CACHE_TIMEOUT)
+    return entitlements
+
+
+def bump_entitlements(user_ids):
+    user_ids = {pk for pk in user_ids if pk}
+    if user_ids:
+        get_user_model().objects.filter(pk__in=user_ids).update(entitlements_version=F("entitlements_version") + 1)
+
+
+# ----------------------------- checks -----------------------------
+
+def course_entitlement(user, course_id, now=None):
+    """
+    The open Entitlement of `user` for a course, else None.
+    """
+    entitlement = get_entitlements(user).get(str(course_id))
+    return entitlement if entitlement is not None and is_open(entitlement, now) else None
+
+
+def has_course_access(user, course_id, now=None):
+    if not is_learner(user):
+        return True
+    return course_entitlement(user, course_id, now) is not None
+
+
+def entitled_course_ids(user, now=None):
+    now = now or timezone.now()
+    return [course_id for course_id, entitlement in get_entitlements(user).items() if is_open(entitlement, now)]
+
+
+def can_view_lesson(user, lesson, now=None):
+    """
+    Published preview lessons are open to everyone; the rest need an open entitlement,
+    and unpublished ones the can_view_even_if_unpublished override as well.
+    """
+    if not is_learner(user):
+        return True
+    published = lesson.status == LessonStatus.PUBLISHED
+    if lesson.is_preview and published:
+        return True
+    entitlement = course_entitlement(user, lesson.course_id, now)
+    return entitlement is not None and (published or entitlement.can_view_unpublished)
+
+
+def filter_entitled(queryset, user, course_field="course_id", lesson=None):
+    """
+    List scoping for learners: rows of entitled courses. With `lesson` (the lookup prefix of
+    the lesson, "" for Lesson itself) the same rules as can_view_lesson() apply: published
+    lessons, unpublished ones only with the override, published previews for everyone.
+    """
+    if not is_learner(user):
+        return queryset
+    now = timezone.now()
+    open_ = {course_id: entitlement for course_id, entitlement in get_entitlements(user).items() if is_open(entitlement, now)}
+    if lesson is None:
+        return queryset.filter(**{f"{course_field}__in": list(open_)})
+
+    published = {f"{lesson}status": LessonStatus.PUBLISHED}
+    return queryset.filter(
+        Q(**{f"{course_field}__in": list(open_)}, **published)
+        | Q(**{f"{course_field}__in": [pk for pk, entitlement in open_.items() if entitlement.can_view_unpublished]})
+        | Q(**{f"{lesson}is_preview": True}, **published)
+    )
@@ -0,0 +1,86 @@
+# enrollments/services/expiry.py
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from enrollments.models import Enrollment, EnrollmentEvent, EnrollmentEventType, EnrollmentStatus
+from enrollments.services.entitlements import bump_entitlements
+
+logger = logging.getLogger(__name__)
+
+
+# rows per transaction: keeps every UPDATE (and its row locks) short
+EXPIRY_CHUNK_SIZE = getattr(settings, "ENROLLMENT_EXPIRY_CHUNK_SIZE", 500)
+# same statuses Enrollment.expire_if_needed() leaves alone, plus the already expired ones
+FINAL_STATUSES = (EnrollmentStatus.CANCELLED, EnrollmentStatus.REFUNDED, EnrollmentStatus.EXPIRED)
+
+
+def overdue_q(now):
+    """
+    Enrollments past access_ends_at (served by the access_ends_at index), except those an
+    active override extends beyond now.
+    """
+    return (
+        Q(access_ends_at__lt=now)
+        & ~Q(status__in=FINAL_STATUSES)
+        & ~Q(override__active=True, override__override_access_ends_at__gte=now)
+    )
+
+
+def overdue_count(now=None):
+    return Enrollment.objects.filter(overdue_q(now or timezone.now())).count()
+
+
+def _expire_chunk(now, chunk_size):
+    with transaction.atomic():
+        rows = list(
+            Enrollment.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(overdue_q(now))
+            .order_by("access_ends_at")
+            .values_list("id", "user_id", "status", "access_ends_at")[:chunk_size]
+        )
+        if not rows:
+            return 0, 0
+        # condition repeated in the UPDATE: a row extended meanwhile is left alone
+        updated = (
+            Enrollment.objects.filter(overdue_q(now), pk__in=[pk for pk, _, _, _ in rows])
+            .update(status=EnrollmentStatus.EXPIRED, updated=now)
+        )
+        EnrollmentEvent.objects.bulk_create(
+            [
+                EnrollmentEvent(
+                    enrollment_id=pk,
+                    event_type=EnrollmentEventType.EXPIRED,
+                    message="Access period ended.",
+                    data={"previous_status": status, "access_ends_at": ends_at.isoformat()},
+                    is_system_generated=True,
+                )
+                for pk, _, status, ends_at in rows
+            ],
+            batch_size=chunk_size,
+        )
+        bump_entitlements(user_id for _, user_id, _, _ in rows)
+    return len(rows), updated
+
+
+def expire_enrollments(now=None, chunk_size=EXPIRY_CHUNK_SIZE, max_chunks=None):
+    """
+    Set-based Enrollment.expire_if_needed(): overdue rows are expired in chunks of
+    `chunk_size`, each chunk one transaction with one UPDATE, its EXPIRED events
+    (bulk_create) and one entitlement bump for the affected learners.
+    Returns the number of enrollments expired.
+    """
+    now = now or timezone.now()
+    total, chunks = 0, 0
+    while max_chunks is None or chunks < max_chunks:
+        selected, updated = _expire_chunk(now, chunk_size)
+        total += updated
+        chunks += 1
+        if selected < chunk_size:
+            break
+    if total:
+        logger.info("expired %s enrollments in %s chunks", total, chunks)
+    return total
@@ -0,0 +1,246 @@
+# enrollments/services/imports.py
+import csv
+import logging
+from collections import namedtuple
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.models import UserType
+from content.models import CourseContentStats, Lesson, LessonStatus
+from courses.services.catalog import mark_courses_dirty
+from enrollments.models import (
+    Enrollment,
+    EnrollmentEvent,
+    EnrollmentEventType,
+    EnrollmentSource,
+    EnrollmentStatus,
+)
+from enrollments.services.entitlements import bump_entitlements
+from progress.models import CourseProgress
+
+logger = logging.getLogger(__name__)
+
+
+IMPORT_CHUNK_SIZE = getattr(settings, "ENROLLMENT_IMPORT_CHUNK_SIZE", 500)
+# the report keeps the first errors only, the count stays exact
+IMPORT_MAX_ERRORS = getattr(settings, "ENROLLMENT_IMPORT_MAX_ERRORS", 1000)
+ONGOING_STATUSES = (EnrollmentStatus.PENDING, EnrollmentStatus.ACTIVE, EnrollmentStatus.SUSPENDED)
+USER_COLUMNS = ("first_name", "last_name", "phone")
+
+
+class EnrollmentImportError(ValueError):
+    pass
+
+
+Row = namedtuple("Row", ["line", "email", "fields"])
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.enrolled = 0
+        self.users_created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, line, email, message):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "email": email, "error": message})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "enrolled": self.enrolled,
+            "users_created": self.users_created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+# ----------------------------- parsing -----------------------------
+
+def read_rows(stream):
+    """
+    Lazily yields Row(line, email, {first_name, last_name, phone}) from a CSV text stream
+    with an `email` column (header names are case-insensitive).
+    """
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or "email" not in [name.strip().lower() for name in reader.fieldnames]:
+        raise EnrollmentImportError("The CSV needs a header row with an 'email' column.")
+    for record in reader:
+        record = {(key or "").strip().lower(): (value or "").strip() for key, value in record.items() if isinstance(value, str)}
+        yield Row(reader.line_num, record.get("email", "").lower(), {k: record[k] for k in USER_COLUMNS if record.get(k)})
+
+
+# ----------------------------- import -----------------------------
+
+class CohortImporter:
+    """
+    CSV -> enrollments of one cohort, chunk by chunk: users resolved with one query per chunk,
+    missing ones created with bulk_create, enrollments / initial progress / CREATED events
+    bulk-created (no history rows, no per-row signals). Bad rows are reported, never fatal.
+    """
+
+    def __init__(self, cohort, user=None, create_users=True, chunk_size=IMPORT_CHUNK_SIZE):
+        self.cohort = cohort
+        self.course_id = cohort.course_id
+        self.branch_id = cohort.branch_id
+        self.user_id = getattr(user, "pk", None)
+        self.create_users = create_users
+        self.chunk_size = max(chunk_size, 1)
+        self.report = ImportReport()
+        self.seen = set()
+
+        # capacity is checked once: seats left now, then counted down locally
+        if cohort.capacity is None:
+            self.seats = None
+        else:
+            taken = Enrollment.objects.filter(cohort_id=cohort.pk, status__in=ONGOING_STATUSES).count()
+            self.seats = max(cohort.capacity - taken, 0)
+
+        stats_total = CourseContentStats.objects.filter(course_id=self.course_id).values_list("lesson_count", flat=True).first()
+        self.total_lessons = stats_total if stats_total is not None else Lesson.objects.filter(
+            course_id=self.course_id, status=LessonStatus.PUBLISHED, active=True, module__active=True,
+        ).count()
+
+    # ----------------------------- per chunk -----------------------------
+
+    def _valid(self, rows):
+        valid = []
+        for row in rows:
+            self.report.rows += 1
+            try:
+                validate_email(row.email)
+            except ValidationError:
+                self.report.error(row.line, row.email, "Invalid email address.")
+                continue
+            if row.email in self.seen:
+                self.report.error(row.line, row.email, "Duplicate email in this file.")
+                continue
+            self.seen.add(row.email)
+            valid.append(row)
+        return valid
+
+    def _existing_users(self, rows):
+        User = get_user_model()
+        return dict(User.objects.filter(email__in=[row.email for row in rows]).values_list("email", "id"))
+
+    def _create_users(self, rows, found):
+        User = get_user_model()
+        missing = [row for row in rows if row.email not in found]
+        if not missing:
+            return found
+        unusable = make_password(None)
+        User.objects.bulk_create(
+            [
+                User(email=row.email, password=unusable, user_type=UserType.STUDENT, **row.fields)
+                for row in missing
+            ],
+            batch_size=self.chunk_size,
+            ignore_conflicts=True,  # a user created meanwhile is picked up below
+        )
+        known = len(found)
+        found.update(User.objects.filter(email__in=[row.email for row in missing]).values_list("email", "id"))
+        self.report.users_created += len(found) - known
+        return found
+
+    def _enroll(self, rows, users):
+        now = timezone.now()
+        enrollments, progress, events = [], [], []
+        for row in rows:
+            enrollment = Enrollment(
+                user_id=users[row.email], course_id=self.course_id, cohort_id=self.cohort.pk,
+                branch_id=self.branch_id, status=EnrollmentStatus.ACTIVE, source=EnrollmentSource.IMPORT,
+                enrolled_at=now, user_add_id=self.user_id,
+            )
+            enrollments.append(enrollment)
+            progress.append(CourseProgress(
+                user_id=enrollment.user_id, course_id=self.course_id, enrollment=enrollment,
+                branch_id=self.branch_id, total_lessons=self.total_lessons,
+            ))
+            events.append(EnrollmentEvent(
+                enrollment=enrollment, event_type=EnrollmentEventType.CREATED, message="Imported from CSV.",
+                data={"cohort": str(self.cohort.pk), "line": row.line}, user_add_id=self.user_id,
+                is_system_generated=True,
+            ))
+        with transaction.atomic():
+            Enrollment.objects.bulk_create(enrollments, batch_size=self.chunk_size)
+            # a learner coming back keeps the progress of the earlier enrollment
+            CourseProgress.objects.bulk_create(progress, batch_size=self.chunk_size, ignore_conflicts=True)
+            EnrollmentEvent.objects.bulk_create(events, batch_size=self.chunk_size)
+
+    def import_chunk(self, rows):
+        rows = self._valid(rows)
+        if not rows:
+            return
+        users = self._existing_users(rows)
+        enrolled = set(
+            Enrollment.objects.filter(
+                course_id=self.course_id, status__in=ONGOING_STATUSES, user_id__in=users.values(),
+            ).values_list("user_id", flat=True)
+        )
+
+        ready = []
+        for row in rows:
+            if row.email not in users and not self.create_users:
+                self.report.error(row.line, row.email, "No user with this email.")
+            elif row.email in users and users[row.email] in enrolled:
+                self.report.error(row.line, row.email, "Already enrolled in this course.")
+            else:
+                ready.append(row)
+        if self.seats is not None:
+            # cut before users are created: nobody gets an account for a seat that does not exist
+            for row in ready[self.seats:]:
+                self.report.error(row.line, row.email, "The cohort is full.")
+            ready = ready[:self.seats]
+        if not ready:
+            return
+        if self.create_users:
+            users = self._create_users(ready, users)
+
+        try:
+            self._enroll(ready, users)
+            done = ready
+        except IntegrityError:
+            # a concurrent enrollment won a race: settle this chunk row by row
+            done = []
+            for row in ready:
+                try:
+                    self._enroll([row], users)
+                    done.append(row)
+                except IntegrityError:
+                    self.report.error(row.line, row.email, "Already enrolled in this course.")
+
+        if self.seats is not None:
+            self.seats -= len(done)
+        self.report.enrolled += len(done)
+        bump_entitlements(users[row.email] for row in done)
+
+    def run(self, rows):
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+        if self.report.enrolled:
+            mark_courses_dirty([self.course_id])
+        logger.info("cohort %s import: %s", self.cohort.pk, {k: v for k, v in self.report.as_dict().items() if k != "errors"})
+        return self.report
+
+
+def import_cohort_enrollments(cohort, stream, user=None, create_users=True, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Streams a CSV (text file object) into `cohort`. Returns an ImportReport.
+    Raises EnrollmentImportError only when the file itself is unusable (no email column).
+    """
+    importer = CohortImporter(cohort, user=user, create_users=create_users, chunk_size=chunk_size)
+    return importer.run(read_rows(stream))
@@ -0,0 +1,36 @@
+# enrollments/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from enrollments.models import CourseCohort, Enrollment, EnrollmentAccessOverride
+from enrollments.services.entitlements import bump_entitlements
+
+
+@receiver(post_save, sender=Enrollment, dispatch_uid="enrollments_enrollment_saved")
+@receiver(post_delete, sender=Enrollment, dispatch_uid="enrollments_enrollment_deleted")
+def enrollments_enrollment_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_entitlements([instance.user_id])
+
+
+@receiver(post_save, sender=EnrollmentAccessOverride, dispatch_uid="enrollments_override_saved")
+@receiver(post_delete, sender=EnrollmentAccessOverride, dispatch_uid="enrollments_override_deleted")
+def enrollments_override_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # during an enrollment cascade the row may already be gone, its own signal bumps then
+    user_id = Enrollment.objects.filter(pk=instance.enrollment_id).values_list("user_id", flat=True).first()
+    bump_entitlements([user_id])
+
+
+@receiver(post_save, sender=CourseCohort, dispatch_uid="enrollments_cohort_saved")
+def enrollments_cohort_changed(sender, instance, raw=False, created=False, **kwargs):
+    # the cohort start is part of every member's access window
+    if not raw and not created:
+        bump_entitlements(Enrollment.objects.filter(cohort_id=instance.pk).values_list("user_id", flat=True))
+
+
+@receiver(post_save, sender="billing.Refund", dispatch_uid="enrollments_refund_saved")
+def enrollments_refund_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_entitlements([instance.order.user_id])
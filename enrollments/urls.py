@@ -7,6 +7,7 @@ from enrollments.views import (
     EnrollmentAccessOverrideViewSet,
     CourseAccessInviteViewSet,
     EnrollmentEventViewSet,
+    CalendarFeedView,
 )
 
 router = BulkRouter()
@@ -17,5 +18,6 @@ router.register(r"course-access-invites", CourseAccessInviteViewSet, basename="c
 router.register(r"enrollment-events", EnrollmentEventViewSet, basename="enrollment-event")
 
 urlpatterns = [
+    path("calendar/<str:token>.ics", CalendarFeedView.as_view(), name="enrollment-calendar-feed"),
     path("", include(router.urls)),
 ]
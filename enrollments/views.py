@@ -1,3 +1,15 @@
+import io
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
 from core.utils.BulkModelViewSet import BaseModelViewSet
 from enrollments.models import (
     CourseCohort,
@@ -12,6 +24,7 @@ from enrollments.serializers import (
     EnrollmentAccessOverrideSerializer,
     CourseAccessInviteSerializer,
     EnrollmentEventSerializer,
+    CohortImportSerializer,
 )
 from enrollments.filters import (
     CourseCohortFilter,
@@ -20,6 +33,15 @@ from enrollments.filters import (
     CourseAccessInviteFilter,
     EnrollmentEventFilter,
 )
+from enrollments.services.calendar import (
+    CALENDAR_FEED_MAX_AGE,
+    calendar_token,
+    get_calendar_feed,
+    rotate_calendar_token,
+    schedule_fingerprint,
+    user_id_from_token,
+)
+from enrollments.services.imports import EnrollmentImportError, import_cohort_enrollments
 
 
 class CourseCohortViewSet(BaseModelViewSet):
@@ -29,6 +51,24 @@ class CourseCohortViewSet(BaseModelViewSet):
     search_fields = ["name", "code", "notes"]
     ordering_fields = "__all__"
 
+    @action(detail=True, methods=["post"], url_path="import-enrollments", parser_classes=[MultiPartParser, FormParser])
+    def import_enrollments(self, request, pk=None):
+        """
+        Multipart upload of a CSV (email[, first_name, last_name, phone]) enrolling every row
+        into this cohort. The file is streamed in chunks; bad rows are listed in the report.
+        """
+        cohort = self.get_object()
+        params = CohortImportSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        stream = io.TextIOWrapper(data["file"].file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_cohort_enrollments(cohort, stream, user=request.user, create_users=data["create_users"])
+        except (EnrollmentImportError, UnicodeDecodeError) as e:
+            raise ValidationError({"file": str(e)})
+        return Response(report.as_dict())
+
 
 class EnrollmentViewSet(BaseModelViewSet):
     queryset = Enrollment.objects.all()
@@ -37,6 +77,22 @@ class EnrollmentViewSet(BaseModelViewSet):
     search_fields = ["billing_order_ref", "cancel_reason", "suspended_reason"]
     ordering_fields = "__all__"
 
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        Subscription URL of the requesting learner's ICS feed (live sessions + deadlines).
+        """
+        path = reverse("enrollment-calendar-feed", args=[calendar_token(request.user)])
+        return Response({"url": request.build_absolute_uri(path)})
+
+    @action(detail=False, methods=["post"], url_path="calendar/regenerate")
+    def regenerate_calendar(self, request):
+        """
+        New subscription URL for the requesting learner; every URL handed out before stops working.
+        """
+        path = reverse("enrollment-calendar-feed", args=[rotate_calendar_token(request.user)])
+        return Response({"url": request.build_absolute_uri(path)})
+
 
 class EnrollmentAccessOverrideViewSet(BaseModelViewSet):
     queryset = EnrollmentAccessOverride.objects.all()
@@ -60,3 +116,29 @@ class EnrollmentEventViewSet(BaseModelViewSet):
     filterset_class = EnrollmentEventFilter
     search_fields = ["event_type", "message"]
     ordering_fields = "__all__"
+
+
+class CalendarFeedView(APIView):
+    """
+    Per-learner ICS feed for calendar apps, authenticated by the signed, revocable token in the URL.
+    Cached per schedule fingerprint; If-None-Match answers 304 after the token and fingerprint queries.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request, token):
+        user_id = user_id_from_token(token)
+        if user_id is None:
+            raise Http404
+
+        course_ids, fingerprint = schedule_fingerprint(user_id)
+        etag = f'"{fingerprint}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(get_calendar_feed(course_ids, fingerprint), content_type="text/calendar; charset=utf-8")
+            response["Content-Disposition"] = 'inline; filename="calendar.ics"'
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, max_age=CALENDAR_FEED_MAX_AGE)
+        return response
@@ -275,6 +275,10 @@ class LessonProgress(ProgressStamped, BranchBound):
         self.status = self.status if self.status != LessonProgressStatus.NOT_STARTED else LessonProgressStatus.IN_PROGRESS
         self.save(update_fields=["last_accessed_at", "last_position_seconds", "watched_seconds", "status", "updated"])
 
+        from analytics.services.realtime import record_activity
+
+        record_activity(self.user_id, branch_id=self.branch_id, course_id=self.course_id, at=now)
+
     def mark_completed(self, by_user=None, note=None):
         now = timezone.now()
         self.status = LessonProgressStatus.COMPLETED